@@ -1,5 +1,7 @@
 """JSON API router class."""
+import inspect
 from enum import Enum, auto
+from functools import partial
 from inspect import Parameter, Signature, signature
 from typing import (
     TYPE_CHECKING,
@@ -7,24 +9,38 @@ from typing import (
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
     Iterable,
     List,
     Literal,
     Optional,
+    Tuple,
     Type,
     TypeVar,
     Union,
 )
 
-from fastapi import APIRouter, Body, Path, Query, Request, status
+from fastapi import APIRouter, Body, Path, Query, Request, Response, status
+from fastapi.dependencies.models import Dependant
+from fastapi.dependencies.utils import get_dependant
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel as PydanticBaseModel
 
 from fastapi_jsonapi.data_typing import TypeModel
 from fastapi_jsonapi.exceptions import ExceptionResponseSchema
+from fastapi_jsonapi.filter_limits import FilterLimits
+from fastapi_jsonapi.request_timings import (
+    RequestPhase,
+    RequestTimings,
+    RequestTimingsCallback,
+    disabled_request_timings,
+)
+from fastapi_jsonapi.response_cache import ResponseCacheConfig
 from fastapi_jsonapi.schema_base import BaseModel
 from fastapi_jsonapi.schema_builder import SchemaBuilder
 from fastapi_jsonapi.signature import create_additional_query_params
-from fastapi_jsonapi.utils.dependency_helper import DependencyHelper
+from fastapi_jsonapi.utils.dependency_helper import DependencyHelper, RequestDependencyCache
 from fastapi_jsonapi.views.utils import (
     HTTPMethod,
     HTTPMethodConfig,
@@ -79,6 +95,15 @@ class RoutersJSONAPI:
         pagination_default_limit: Optional[int] = None,
         methods: Iterable[str] = (),
         max_cache_size: int = 0,
+        use_compiled_serializer: bool = False,
+        stream_list_response: bool = False,
+        stream_yield_per: int = 100,
+        timings_callback: Optional[RequestTimingsCallback] = None,
+        server_timing_header: bool = False,
+        bulk_create: bool = False,
+        filter_limits: Optional[FilterLimits] = None,
+        response_cache: Optional[ResponseCacheConfig] = None,
+        load_only_requested_fields: bool = False,
     ) -> None:
         """
         Initialize router items.
@@ -103,6 +128,31 @@ class RoutersJSONAPI:
                 default swagger param. limit/offset pagination, used with `page[limit]`
         :param pagination_default_limit: `page[limit]`
                 default swagger param. limit/offset pagination, used with `page[offset]`
+        :param max_cache_size: size of SchemaBuilder LRU caches (including response schemas
+                built for each includes combination), `0` disables caching
+        :param use_compiled_serializer: render GET responses with compiled serializer,
+                which writes JSON:API document as bytes straight from ORM objects
+                (skips pydantic response models, attributes validators are not called)
+        :param stream_list_response: stream GET list responses: objects are fetched by partitions
+                with server side cursor and written with compiled serializer as soon as fetched,
+                `included` and `meta` are written at the end of the document. FastAPI >= 0.106 closes
+                dependencies with `yield` (e.g. the session) before the body is sent: pass `stream_session_maker`
+                to the data layer to stream the objects, otherwise the page is fetched before the response
+        :param stream_yield_per: number of objects fetched at once when streaming list responses
+        :param timings_callback: called with request and its phases timings after each request,
+                can be a coroutine function
+        :param server_timing_header: add `Server-Timing` header with phases timings to responses
+        :param bulk_create: POST also accepts a list of objects as `data`,
+                all of them are created at once and returned as list response
+        :param filter_limits: limits of `filter` parameter complexity (number of conditions, nesting,
+                values lists length and relationships to join), oversized filters are rejected
+                before any query is built
+        :param response_cache: cache of GET list and detail responses, entries are invalidated
+                when objects of their resource types are created, updated or deleted by data layers
+        :param load_only_requested_fields: GET responses rendered with pydantic schemas select only the columns
+                of attributes requested by sparse fieldsets too (compiled serializer always does),
+                enable it only if schemas don't read other attributes (e.g. in properties or validators),
+                they aren't loaded and can't be lazy loaded in async session
         """
         self._router: APIRouter = router
         self._path: Union[str, List[str]] = path
@@ -118,6 +168,17 @@ class RoutersJSONAPI:
         self.schema_detail = schema
         # tuple and not set, so ordering is persisted
         self.methods = tuple(methods) or self.DEFAULT_METHODS
+        self.use_compiled_serializer: bool = use_compiled_serializer
+        self.stream_list_response: bool = stream_list_response
+        self.stream_yield_per: int = stream_yield_per
+        self.timings_callback: Optional[RequestTimingsCallback] = timings_callback
+        self.server_timing_header: bool = server_timing_header
+        self.bulk_create: bool = bulk_create
+        self.filter_limits: Optional[FilterLimits] = filter_limits
+        self.response_cache: Optional[ResponseCacheConfig] = response_cache
+        self.load_only_requested_fields: bool = load_only_requested_fields
+        # dependants of method dependencies handlers are introspected once per view and method
+        self._view_dependants: Dict[Tuple[Type["ViewBase"], HTTPMethod], Dependant] = {}
 
         if self.type_ in self.all_jsonapi_routers:
             msg = f"Resource type {self.type_!r} already registered"
@@ -197,8 +258,11 @@ class RoutersJSONAPI:
         )
 
     def _register_post_resource_list(self, path: str):
+        response_schema = self.detail_response_schema
+        if self.bulk_create:
+            response_schema = Union[self.detail_response_schema, self.list_response_schema]
         create_resource_response_example = {
-            status.HTTP_201_CREATED: {"model": self.detail_response_schema},
+            status.HTTP_201_CREATED: {"model": response_schema},
         }
         self._router.add_api_route(
             path=path,
@@ -432,6 +496,7 @@ class RoutersJSONAPI:
         method: HTTPMethod,
     ) -> List[Parameter]:
         method_config = self._update_method_config(view, method)
+        self._view_dependants[view, method] = self._build_view_dependant(method_config)
 
         if method_config.dependencies is None:
             return []
@@ -460,6 +525,7 @@ class RoutersJSONAPI:
         request: Request,
         view_cls: Type["ViewBase"],
         method: HTTPMethod,
+        dependency_cache: Optional[RequestDependencyCache] = None,
     ) -> Dict[str, Any]:
         """
         Combines all dependencies (prepared) and returns them as list
@@ -470,10 +536,16 @@ class RoutersJSONAPI:
         :param request:
         :param view_cls:
         :param method:
+        :param dependency_cache: dependencies solved for the request (shared by atomic operations)
         :return:
         """
-        method_config: HTTPMethodConfig = view_cls.method_dependencies[method]
+        dep_helper = DependencyHelper(request=request, dependency_cache=dependency_cache)
+        dependencies_result: Dict[str, Any] = await dep_helper.solve_dependencies_and_run(
+            self.get_view_dependant(view_cls, method),
+        )
+        return dependencies_result
 
+    def _build_view_dependant(self, method_config: HTTPMethodConfig) -> Dependant:
         def handle_dependencies(**dep_kwargs):
             return dep_kwargs
 
@@ -482,9 +554,126 @@ class RoutersJSONAPI:
             method_config=method_config,
         )
 
-        dep_helper = DependencyHelper(request=request)
-        dependencies_result: Dict[str, Any] = await dep_helper.run(handle_dependencies)
-        return dependencies_result
+        # handler has no path params
+        return get_dependant(path="", call=handle_dependencies)
+
+    def get_view_dependant(self, view_cls: Type["ViewBase"], method: HTTPMethod) -> Dependant:
+        """
+        Dependant of the method dependencies handler
+
+        Dependants are built on views registration, so dependencies aren't introspected for each operation
+
+        :param view_cls:
+        :param method:
+        :return:
+        """
+        if (dependant := self._view_dependants.get((view_cls, method))) is None:
+            method_config: HTTPMethodConfig = view_cls.method_dependencies[method]
+            dependant = self._view_dependants[view_cls, method] = self._build_view_dependant(method_config)
+
+        return dependant
+
+    @classmethod
+    async def invalidate_cached_responses(cls, resource_types: Iterable[str]) -> None:
+        """
+        Invalidate cached responses containing objects of these resource types
+
+        Responses are invalidated in caches of all the routers, since they may include other resources.
+        All the resource types registered for models of the modified ones are invalidated too,
+        since their responses contain the same objects
+
+        :param resource_types: modified resource types
+        :return:
+        """
+        resource_types = cls.get_resource_types_of_same_models(resource_types)
+        if not resource_types:
+            return
+
+        # routers may share the same backend
+        backends = {
+            id(router.response_cache.backend): router.response_cache.backend
+            for router in cls.all_jsonapi_routers.values()
+            if router.response_cache is not None
+        }
+        for backend in backends.values():
+            await backend.invalidate(resource_types)
+
+    @classmethod
+    def get_resource_types_of_same_models(cls, resource_types: Iterable[str]) -> FrozenSet[str]:
+        """
+        Resource types registered for the same models as these resource types (including themselves)
+
+        :param resource_types: resource types
+        :return:
+        """
+        resource_types = frozenset(resource_types)
+        models = {cls.all_jsonapi_routers[type_].model for type_ in resource_types if type_ in cls.all_jsonapi_routers}
+        return resource_types | {type_ for type_, router in cls.all_jsonapi_routers.items() if router.model in models}
+
+    def create_request_timings(self) -> RequestTimings:
+        """
+        Timings of request phases, nothing is measured if there's no timings consumer
+        """
+        if self.timings_callback is None and not self.server_timing_header:
+            return disabled_request_timings
+
+        return RequestTimings()
+
+    def render_response(
+        self,
+        view: "ViewBase",
+        response: Response,
+        result: Any,
+        status_code: int = status.HTTP_200_OK,
+    ) -> Any:
+        """
+        Render result schema to JSON response, so the rendering is measured as serialization phase
+
+        FastAPI renders the result the same way (the routes have no response model to validate against),
+        the result is returned as is when timings are disabled.
+
+        :param view: view that handled the request
+        :param response: response param of the endpoint, its status code and headers are copied to the response
+        :param result: result returned by the view
+        :param status_code: default status code of the route
+        :return: rendered response or the result as is
+        """
+        if not view.timings.enabled or result is None or isinstance(result, Response):
+            return result
+
+        with view.timings.measure(RequestPhase.SERIALIZATION):
+            rendered = JSONResponse(jsonable_encoder(result), status_code=response.status_code or status_code)
+
+        rendered.headers.raw.extend(response.headers.raw)
+        return rendered
+
+    async def handle_request_timings(
+        self,
+        view: "ViewBase",
+        response: Response,
+        result: Any,
+    ) -> None:
+        """
+        Pass request timings to the callback and add `Server-Timing` header
+
+        :param view: view that handled the request
+        :param response: response param of the endpoint, its headers are copied to the response
+        :param result: result returned by the view
+        :return:
+        """
+        timings = view.timings
+        if not timings.enabled:
+            return
+
+        if self.server_timing_header:
+            # FastAPI sends Response objects returned by endpoint as is
+            target_response = result if isinstance(result, Response) else response
+            target_response.headers["Server-Timing"] = timings.as_server_timing()
+
+        if self.timings_callback is not None:
+            callback_result = self.timings_callback(view.request, timings)
+            if inspect.isawaitable(callback_result):
+                await callback_result
 
     def _create_get_resource_list_view(self):
         """
@@ -493,14 +682,19 @@ class RoutersJSONAPI:
         :return:
         """
 
-        async def wrapper(request: Request, **extra_view_deps):
+        async def wrapper(request: Request, response: Response, **extra_view_deps):
             resource = self.list_view_resource(
                 request=request,
                 jsonapi=self,
             )
 
-            response = await resource.handle_get_resource_list(**extra_view_deps)
-            return response
+            result = await resource.handle_cached_response(
+                partial(resource.handle_get_resource_list, **extra_view_deps),
+                extra_view_deps,
+            )
+            result = self.render_response(resource, response, result)
+            await self.handle_request_timings(resource, response, result)
+            return result
 
         additional_dependency_params = self._update_method_config_and_get_dependency_params(
             self.list_view_resource,
@@ -520,9 +714,12 @@ class RoutersJSONAPI:
         """
         # `data` as embed Body param
         schema_in = self.schema_in_post_data
+        if self.bulk_create:
+            schema_in = Union[List[schema_in], schema_in]
 
         async def wrapper(
             request: Request,
+            response: Response,
             data: schema_in = Body(embed=True),
             **extra_view_deps,
         ):
@@ -531,11 +728,19 @@ class RoutersJSONAPI:
                 jsonapi=self,
             )
 
-            response = await resource.handle_post_resource_list(
-                data_create=data,
-                **extra_view_deps,
-            )
-            return response
+            if isinstance(data, list):
+                result = await resource.handle_post_resource_list_bulk(
+                    data_create_list=data,
+                    **extra_view_deps,
+                )
+            else:
+                result = await resource.handle_post_resource_list(
+                    data_create=data,
+                    **extra_view_deps,
+                )
+            result = self.render_response(resource, response, result, status_code=status.HTTP_201_CREATED)
+            await self.handle_request_timings(resource, response, result)
+            return result
 
         additional_dependency_params = self._update_method_config_and_get_dependency_params(
             self.list_view_resource,
@@ -556,14 +761,16 @@ class RoutersJSONAPI:
         :return:
         """
 
-        async def wrapper(request: Request, **extra_view_deps):
+        async def wrapper(request: Request, response: Response, **extra_view_deps):
             resource = self.list_view_resource(
                 request=request,
                 jsonapi=self,
             )
 
-            response = await resource.handle_delete_resource_list(**extra_view_deps)
-            return response
+            result = await resource.handle_delete_resource_list(**extra_view_deps)
+            result = self.render_response(resource, response, result)
+            await self.handle_request_timings(resource, response, result)
+            return result
 
         additional_dependency_params = self._update_method_config_and_get_dependency_params(
             self.list_view_resource,
@@ -586,15 +793,21 @@ class RoutersJSONAPI:
         # TODO:
         #  - custom path param name (set default name on DetailView class)
         #  - custom type for obj id (get type from DetailView class)
-        async def wrapper(request: Request, obj_id: str = Path(...), **extra_view_deps):
+        async def wrapper(request: Request, response: Response, obj_id: str = Path(...), **extra_view_deps):
             resource = self.detail_view_resource(
                 request=request,
                 jsonapi=self,
             )
 
             # TODO: pass obj_id as kwarg (get name from DetailView class)
-            response = await resource.handle_get_resource_detail(obj_id, **extra_view_deps)
-            return response
+            result = await resource.handle_cached_response(
+                partial(resource.handle_get_resource_detail, obj_id, **extra_view_deps),
+                extra_view_deps,
+                obj_id=obj_id,
+            )
+            result = self.render_response(resource, response, result)
+            await self.handle_request_timings(resource, response, result)
+            return result
 
         additional_dependency_params = self._update_method_config_and_get_dependency_params(
             self.detail_view_resource,
@@ -618,6 +831,7 @@ class RoutersJSONAPI:
 
         async def wrapper(
             request: Request,
+            response: Response,
             data: schema_in = Body(embed=True),
             obj_id: str = Path(...),
             **extra_view_deps,
@@ -628,12 +842,14 @@ class RoutersJSONAPI:
             )
 
             # TODO: pass obj_id as kwarg (get name from DetailView class)
-            response = await resource.handle_update_resource(
+            result = await resource.handle_update_resource(
                 obj_id=obj_id,
                 data_update=data,
                 **extra_view_deps,
             )
-            return response
+            result = self.render_response(resource, response, result)
+            await self.handle_request_timings(resource, response, result)
+            return result
 
         additional_dependency_params = self._update_method_config_and_get_dependency_params(
             self.detail_view_resource,
@@ -655,6 +871,7 @@ class RoutersJSONAPI:
 
         async def wrapper(
             request: Request,
+            response: Response,
             obj_id: str = Path(...),
             **extra_view_deps,
         ):
@@ -664,8 +881,10 @@ class RoutersJSONAPI:
             )
 
             # TODO: pass obj_id as kwarg (get name from DetailView class)
-            response = await resource.handle_delete_resource(obj_id=obj_id, **extra_view_deps)
-            return response
+            result = await resource.handle_delete_resource(obj_id=obj_id, **extra_view_deps)
+            result = self.render_response(resource, response, result)
+            await self.handle_request_timings(resource, response, result)
+            return result
 
         additional_dependency_params = self._update_method_config_and_get_dependency_params(
             self.detail_view_resource,
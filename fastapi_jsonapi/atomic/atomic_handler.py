@@ -11,6 +11,8 @@ from typing import (
     Callable,
     List,
     Optional,
+    Set,
+    Tuple,
     Type,
     TypedDict,
     Union,
@@ -21,11 +23,13 @@ from pydantic import ValidationError
 from starlette.requests import Request
 
 from fastapi_jsonapi import RoutersJSONAPI
-from fastapi_jsonapi.atomic.prepared_atomic_operation import LocalIdsType, OperationBase
+from fastapi_jsonapi.atomic.prepared_atomic_operation import LocalIdsType, OperationAdd, OperationBase
 from fastapi_jsonapi.atomic.schemas import AtomicOperation, AtomicOperationRequest, AtomicResultResponse
+from fastapi_jsonapi.utils.dependency_helper import RequestDependencyCache
 
 if TYPE_CHECKING:
     from fastapi_jsonapi.data_layers.base import BaseDataLayer
+    from fastapi_jsonapi.schema import BaseJSONAPIItemInSchema
 
 log = logging.getLogger(__name__)
 AtomicResponseDict = TypedDict("AtomicResponseDict", {"atomic:results": List[Any]})
@@ -75,6 +79,8 @@ class AtomicViewHandler:
         self.request = request
         self.operations_request = operations_request
         self.local_ids_cache: LocalIdsType = defaultdict(dict)
+        # dependencies not reading the body are solved once for all operations
+        self.dependency_cache = RequestDependencyCache()
 
     async def prepare_one_operation(self, operation: AtomicOperation):
         """
@@ -96,6 +102,7 @@ class AtomicViewHandler:
             jsonapi=jsonapi,
             ref=operation.ref,
             data=operation.data,
+            dependency_cache=self.dependency_cache,
         )
         return one_operation
 
@@ -108,6 +115,37 @@ class AtomicViewHandler:
 
         return prepared_operations
 
+    @classmethod
+    def group_operations(cls, operations: List[OperationBase]) -> List[List[OperationBase]]:
+        """
+        Group consecutive `add` operations of the same resource type to create them at once
+
+        An operation referring to a lid defined in the current group starts a new group,
+        because the lid is resolved only after the group is created.
+
+        :param operations:
+        :return: groups of operations in the original order
+        """
+        groups: List[List[OperationBase]] = []
+        group_local_ids: Set[Tuple[str, str]] = set()
+        for operation in operations:
+            previous = groups[-1][-1] if groups else None
+            can_join = (
+                isinstance(operation, OperationAdd)
+                and isinstance(previous, OperationAdd)
+                and operation.jsonapi is previous.jsonapi
+                and group_local_ids.isdisjoint(operation.get_referenced_local_ids())
+            )
+            if not can_join:
+                groups.append([])
+                group_local_ids = set()
+
+            groups[-1].append(operation)
+            if operation.data and operation.data.lid:
+                group_local_ids.add((operation.data.type, operation.data.lid))
+
+        return groups
+
     @catch_exc_on_operation_handle
     async def process_one_operation(
         self,
@@ -117,38 +155,98 @@ class AtomicViewHandler:
         operation.update_relationships_with_lid(local_ids=self.local_ids_cache)
         return await operation.handle(dl=dl)
 
+    @catch_exc_on_operation_handle
+    async def prepare_batched_operation(
+        self,
+        operation: OperationAdd,
+    ) -> BaseJSONAPIItemInSchema:
+        operation.update_relationships_with_lid(local_ids=self.local_ids_cache)
+        return operation.prepare_data_create()
+
+    async def process_operations_group(
+        self,
+        operations: List[OperationBase],
+        previous_dl: Optional[BaseDataLayer],
+    ) -> Tuple[list, BaseDataLayer]:
+        """
+        Process a group of operations, several `add` operations are created at once with `create_objects`
+
+        Dependencies are resolved for each operation (with the operation set as current),
+        all of them share the session of the first data layer. Consecutive operations
+        with the same data layer kwargs are created at once, so each object is created
+        with the kwargs resolved for its own operation.
+
+        :param operations:
+        :param previous_dl: data layer of the previous operation
+        :return: responses of the operations and the last data layer
+        """
+        if len(operations) == 1:
+            (operation,) = operations
+            ctx_var_token = current_atomic_operation.set(operation)
+            try:
+                dl: BaseDataLayer = await operation.get_data_layer()
+                await dl.atomic_start(previous_dl=previous_dl)
+                response = await self.process_one_operation(
+                    dl=dl,
+                    operation=operation,
+                )
+            finally:
+                current_atomic_operation.reset(ctx_var_token)
+            return [response], dl
+
+        # batches of operations with the same data layer kwargs: (operations, prepared data, data layer)
+        batches: List[Tuple[List[OperationAdd], list, BaseDataLayer]] = []
+        for operation in operations:
+            ctx_var_token = current_atomic_operation.set(operation)
+            try:
+                dl = await operation.get_data_layer()
+                await dl.atomic_start(previous_dl=previous_dl)
+                previous_dl = dl
+                data_create = await self.prepare_batched_operation(operation=operation)
+            finally:
+                current_atomic_operation.reset(ctx_var_token)
+
+            if batches and batches[-1][0][-1].view.data_layer_kwargs == operation.view.data_layer_kwargs:
+                batches[-1][0].append(operation)
+                batches[-1][1].append(data_create)
+            else:
+                batches.append(([operation], [data_create], dl))
+
+        responses = []
+        for batch_operations, data_create_list, batch_dl in batches:
+            responses.extend(
+                await OperationAdd.handle_batch(
+                    dl=batch_dl,
+                    operations=batch_operations,
+                    data_create_list=data_create_list,
+                ),
+            )
+        return responses, dl
+
     async def handle(self) -> Union[AtomicResponseDict, AtomicResultResponse, None]:
         prepared_operations = await self.prepare_operations()
         results = []
         only_empty_responses = True
         success = True
         previous_dl: Optional[BaseDataLayer] = None
-        for operation in prepared_operations:
-            # set context var
-            ctx_var_token = current_atomic_operation.set(operation)
-
-            dl: BaseDataLayer = await operation.get_data_layer()
-            await dl.atomic_start(previous_dl=previous_dl)
-            response = await self.process_one_operation(
-                dl=dl,
-                operation=operation,
+        for operations in self.group_operations(prepared_operations):
+            responses, previous_dl = await self.process_operations_group(
+                operations=operations,
+                previous_dl=previous_dl,
             )
-            previous_dl = dl
-
-            # response.data.id
-            if not response:
-                # https://jsonapi.org/ext/atomic/#result-objects
-                # An empty result object ({}) is acceptable
-                # for operations that are not required to return data.
-                results.append({})
-                continue
-            only_empty_responses = False
-            results.append({"data": response.data})
-            if operation.data.lid and response.data:
-                self.local_ids_cache[operation.data.type][operation.data.lid] = response.data.id
-
-            # reset context var
-            current_atomic_operation.reset(ctx_var_token)
+
+            for operation, response in zip(operations, responses):
+                # response.data.id
+                if not response:
+                    # https://jsonapi.org/ext/atomic/#result-objects
+                    # An empty result object ({}) is acceptable
+                    # for operations that are not required to return data.
+                    results.append({})
+                    continue
+                only_empty_responses = False
+                results.append({"data": response.data})
+                if operation.data.lid and response.data:
+                    self.local_ids_cache[operation.data.type][operation.data.lid] = response.data.id
 
         if previous_dl:
             await previous_dl.atomic_end(success=success)
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Dict, Optional, Type
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Type
 
 from fastapi import Request
 
 from fastapi_jsonapi import RoutersJSONAPI
 from fastapi_jsonapi.atomic.schemas import AtomicOperationAction, AtomicOperationRef, OperationDataType
+from fastapi_jsonapi.utils.dependency_helper import RequestDependencyCache
 from fastapi_jsonapi.views.utils import HTTPMethod
 
 if TYPE_CHECKING:
     from fastapi_jsonapi.data_layers.base import BaseDataLayer
+    from fastapi_jsonapi.schema import BaseJSONAPIItemInSchema
     from fastapi_jsonapi.views.detail_view import DetailViewBase
     from fastapi_jsonapi.views.list_view import ListViewBase
     from fastapi_jsonapi.views.view_base import ViewBase
@@ -25,6 +27,7 @@ class OperationBase:
     ref: Optional[AtomicOperationRef]
     data: OperationDataType
     op_type: str
+    dependency_cache: Optional[RequestDependencyCache] = None
 
     @property
     def http_method(self) -> HTTPMethod:
@@ -38,6 +41,7 @@ class OperationBase:
         jsonapi: RoutersJSONAPI,
         ref: Optional[AtomicOperationRef],
         data: OperationDataType,
+        dependency_cache: Optional[RequestDependencyCache] = None,
     ) -> "OperationBase":
         view_cls: Type[ViewBase] = jsonapi.detail_view_resource
 
@@ -64,6 +68,7 @@ class OperationBase:
             ref=ref,
             data=data,
             op_type=action,
+            dependency_cache=dependency_cache,
         )
 
     async def get_data_layer(self) -> BaseDataLayer:
@@ -71,6 +76,7 @@ class OperationBase:
             request=self.view.request,
             view_cls=self.view.__class__,
             method=self.http_method,
+            dependency_cache=self.dependency_cache,
         )
         return await self.view.get_data_layer(data_layer_view_dependencies)
 
@@ -110,20 +116,33 @@ class OperationBase:
         relationship_info.pop("lid")
         relationship_info["id"] = lids_for_resource[lid]
 
-    def update_relationships_with_lid(self, local_ids: LocalIdsType):
+    def iter_relationships_data(self) -> Iterator[dict]:
         if not (self.data and self.data.relationships):
             return
         for relationship_name, relationship_value in self.data.relationships.items():
             relationship_data = relationship_value["data"]
             if isinstance(relationship_data, list):
-                for data in relationship_data:
-                    self.upd_one_relationship_with_local_id(data, local_ids=local_ids)
+                yield from relationship_data
             elif isinstance(relationship_data, dict):
-                self.upd_one_relationship_with_local_id(relationship_data, local_ids=local_ids)
+                yield relationship_data
             else:
                 msg = "unexpected relationship data"
                 raise ValueError(msg)
 
+    def update_relationships_with_lid(self, local_ids: LocalIdsType):
+        for relationship_data in self.iter_relationships_data():
+            self.upd_one_relationship_with_local_id(relationship_data, local_ids=local_ids)
+
+    def get_referenced_local_ids(self) -> List[Tuple[str, str]]:
+        """
+        Local ids (resource type and lid) this operation's relationships refer to
+        """
+        return [
+            (relationship_data["type"], relationship_data["lid"])
+            for relationship_data in self.iter_relationships_data()
+            if "lid" in relationship_data
+        ]
+
 
 class ListOperationBase(OperationBase):
     view: ListViewBase
@@ -136,17 +155,41 @@ class DetailOperationBase(OperationBase):
 class OperationAdd(ListOperationBase):
     http_method = HTTPMethod.POST
 
-    async def handle(self, dl: BaseDataLayer):
+    def prepare_data_create(self) -> BaseJSONAPIItemInSchema:
         # use outer schema wrapper because we need this error path:
         # `{'loc': ['data', 'attributes', 'name']`
         # and not `{'loc': ['attributes', 'name']`
         data_in = self.jsonapi.schema_in_post(data=self.data)
+        return data_in.data
+
+    async def handle(self, dl: BaseDataLayer):
         response = await self.view.process_create_object(
             dl=dl,
-            data_create=data_in.data,
+            data_create=self.prepare_data_create(),
         )
         return response
 
+    @classmethod
+    async def handle_batch(
+        cls,
+        dl: BaseDataLayer,
+        operations: List[OperationAdd],
+        data_create_list: List[BaseJSONAPIItemInSchema],
+    ) -> list:
+        """
+        Create objects of several `add` operations of the same resource type at once
+
+        :param dl: data layer of the batch, operations of the batch resolved the same data layer kwargs
+        :param operations: operations of the batch
+        :param data_create_list: prepared data of each operation
+        :return: response of each operation
+        """
+        view = operations[-1].view
+        db_objects = await view.create_objects_and_fetch(dl=dl, data_create_list=data_create_list)
+        return [
+            operation.view._build_detail_response(db_object) for operation, db_object in zip(operations, db_objects)
+        ]
+
 
 class OperationUpdate(DetailOperationBase):
     http_method = HTTPMethod.PATCH
@@ -5,16 +5,27 @@ If you want to create your own data layer
 you must inherit from this base class
 """
 
-from typing import Dict, List, Optional, Tuple, Type
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Type
 
 from fastapi import Request
 
 from fastapi_jsonapi.data_typing import TypeModel, TypeSchema
 from fastapi_jsonapi.querystring import QueryStringManager
+from fastapi_jsonapi.request_timings import RequestTimings, disabled_request_timings
+from fastapi_jsonapi.response_cache import ResponseCacheInvalidator
 from fastapi_jsonapi.schema import BaseJSONAPIItemInSchema
 from fastapi_jsonapi.schema_builder import FieldConfig, TransferSaveWrapper
 
 
+@dataclass(frozen=True)
+class CollectionCursors:
+    """Cursors to the next and to the previous pages of collection (cursor pagination)"""
+
+    next: Optional[str] = None
+    prev: Optional[str] = None
+
+
 class BaseDataLayer:
     """Base class of a data layer"""
 
@@ -28,6 +39,9 @@ class BaseDataLayer:
         disable_collection_count: bool = False,
         default_collection_count: int = -1,
         type_: str = "",
+        timings: Optional[RequestTimings] = None,
+        load_only_requested_fields: bool = False,
+        response_cache_invalidator: Optional[ResponseCacheInvalidator] = None,
         **kwargs,
     ):
         """
@@ -41,6 +55,10 @@ class BaseDataLayer:
         :param disable_collection_count:
         :param default_collection_count:
         :param type_: resource type
+        :param timings: timings of the request phases
+        :param load_only_requested_fields: attributes not requested by sparse fieldsets may be not loaded,
+                                           the response doesn't read them
+        :param response_cache_invalidator: invalidates cached GET responses after changes are saved
         :param kwargs:
         """
         self.request = request
@@ -52,6 +70,11 @@ class BaseDataLayer:
         self.default_collection_count: int = default_collection_count
         self.is_atomic = False
         self.type_ = type_
+        self.timings: RequestTimings = timings or disabled_request_timings
+        self.load_only_requested_fields = load_only_requested_fields
+        self.response_cache_invalidator: Optional[ResponseCacheInvalidator] = response_cache_invalidator
+        # set by get_collection when cursor pagination is requested
+        self.collection_cursors: Optional[CollectionCursors] = None
 
     async def atomic_start(self, previous_dl: Optional["BaseDataLayer"] = None):
         self.is_atomic = True
@@ -59,6 +82,18 @@ class BaseDataLayer:
     async def atomic_end(self, success: bool = True):
         raise NotImplementedError
 
+    async def invalidate_cached_responses(self, resource_types: Iterable[str]) -> None:
+        """
+        Invalidate cached GET responses containing objects of the modified resource types
+
+        Must be called after changes are committed,
+        so responses fetched before the commit aren't cached again.
+
+        :param resource_types: modified resource types
+        """
+        if self.response_cache_invalidator is not None:
+            await self.response_cache_invalidator(resource_types)
+
     def _unwrap_field_config(self, extra: Dict):
         field_config_wrapper: Optional[TransferSaveWrapper] = extra.get("field_config")
 
@@ -103,6 +138,22 @@ class BaseDataLayer:
         """
         raise NotImplementedError
 
+    async def create_objects(
+        self,
+        data_create_list: List[BaseJSONAPIItemInSchema],
+        view_kwargs: dict,
+    ) -> List[TypeModel]:
+        """
+        Create objects (bulk create)
+
+        Objects are created one by one, data layers may override it to create them at once
+
+        :param data_create_list: validated data of each object
+        :param view_kwargs: kwargs from the resource view
+        :return: created objects in the same order
+        """
+        return [await self.create_object(data_create, view_kwargs) for data_create in data_create_list]
+
     def get_object_id_field_name(self):
         """
         compound key may cause errors
@@ -133,6 +184,60 @@ class BaseDataLayer:
         """
         raise NotImplementedError
 
+    async def get_objects(
+        self,
+        view_kwargs: dict,
+        ids: List[Any],
+        qs: Optional[QueryStringManager] = None,
+    ) -> List[TypeModel]:
+        """
+        Retrieve objects by ids
+
+        Objects are retrieved one by one, data layers may override it to retrieve them at once
+
+        :param view_kwargs: kwargs from the resource view
+        :param ids: ids of the objects
+        :param qs:
+        :return: objects in the same order as ids
+        """
+        return [await self.get_object({**view_kwargs, self.url_id_field: id_value}, qs) for id_value in ids]
+
+    async def get_created_object(
+        self,
+        obj: TypeModel,
+        view_kwargs: dict,
+        qs: Optional[QueryStringManager] = None,
+    ) -> TypeModel:
+        """
+        Get created object to render the response
+
+        Object is retrieved again (with includes), data layers may return the written object as is
+
+        :param obj: created object
+        :param view_kwargs: kwargs from the resource view
+        :param qs:
+        :return: an object
+        """
+        return await self.get_object({**view_kwargs, self.url_id_field: self.get_object_id(obj)}, qs)
+
+    async def get_created_objects(
+        self,
+        objects: List[TypeModel],
+        view_kwargs: dict,
+        qs: Optional[QueryStringManager] = None,
+    ) -> List[TypeModel]:
+        """
+        Get created objects to render the response
+
+        Objects are retrieved again (with includes), data layers may return the written objects as is
+
+        :param objects: created objects
+        :param view_kwargs: kwargs from the resource view
+        :param qs:
+        :return: objects in the same order
+        """
+        return await self.get_objects(view_kwargs, [self.get_object_id(obj) for obj in objects], qs)
+
     async def get_collection(self, qs: QueryStringManager, view_kwargs: Optional[dict] = None) -> Tuple[int, list]:
         """
         Retrieve a collection of objects
@@ -143,6 +248,22 @@ class BaseDataLayer:
         """
         raise NotImplementedError
 
+    async def get_collection_stream(
+        self,
+        qs: QueryStringManager,
+        view_kwargs: Optional[dict] = None,
+        yield_per: int = 100,
+    ) -> Tuple[int, AsyncIterator[list]]:
+        """
+        Retrieve a collection of objects by partitions
+
+        :param qs: a querystring manager to retrieve information from url
+        :param view_kwargs: kwargs from the resource view
+        :param yield_per: number of objects fetched at once
+        :return tuple: the number of object and an async iterator over lists of objects
+        """
+        raise NotImplementedError
+
     async def update_object(self, obj, data_update: BaseJSONAPIItemInSchema, view_kwargs: dict):
         """
         Update an object
@@ -155,6 +276,26 @@ class BaseDataLayer:
         # TODO: update doc
         raise NotImplementedError
 
+    async def get_and_update_object(
+        self,
+        data_update: BaseJSONAPIItemInSchema,
+        view_kwargs: dict,
+        qs: Optional[QueryStringManager] = None,
+    ) -> TypeModel:
+        """
+        Retrieve an object and update it
+
+        Object is retrieved (with includes) before update, data layers may update it without retrieving
+
+        :param data_update: the data validated by schemas
+        :param view_kwargs: kwargs from the resource view
+        :param qs:
+        :return: updated object
+        """
+        obj = await self.get_object(view_kwargs, qs)
+        await self.update_object(obj, data_update, view_kwargs)
+        return obj
+
     async def delete_object(self, obj, view_kwargs):
         """
         Delete an item through the data layer
@@ -164,6 +305,18 @@ class BaseDataLayer:
         """
         raise NotImplementedError
 
+    async def get_and_delete_object(self, view_kwargs: dict, qs: Optional[QueryStringManager] = None) -> None:
+        """
+        Retrieve an object and delete it
+
+        Object is retrieved before delete, data layers may delete it without retrieving
+
+        :param view_kwargs: kwargs from the resource view
+        :param qs:
+        """
+        obj = await self.get_object(view_kwargs, qs)
+        await self.delete_object(obj, view_kwargs)
+
     async def create_relationship(
         self,
         json_data,
@@ -417,6 +570,24 @@ class BaseDataLayer:
         # TODO: doc
         raise NotImplementedError
 
+    async def delete_collection(
+        self,
+        qs: QueryStringManager,
+        view_kwargs: Optional[dict] = None,
+    ) -> Tuple[int, List[TypeModel]]:
+        """
+        Delete objects of the collection page
+
+        Objects are retrieved before delete, data layers may delete them without retrieving
+
+        :param qs: a querystring manager to retrieve information from url
+        :param view_kwargs: kwargs from the resource view
+        :return: the number of objects in the collection and the deleted objects
+        """
+        count, objects = await self.get_collection(qs, view_kwargs)
+        await self.delete_objects(objects, view_kwargs or {})
+        return count, objects
+
     async def before_delete_objects(self, objects: List[TypeModel], view_kwargs: dict):
         """
         Make checks before deleting objects.
@@ -0,0 +1 @@
+"""Collection count strategies package."""
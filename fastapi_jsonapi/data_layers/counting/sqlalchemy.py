@@ -0,0 +1,383 @@
+"""Strategies to count sqlalchemy collection objects for list meta"""
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Tuple
+
+import simplejson as json
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import column, distinct
+
+from fastapi_jsonapi.data_typing import TypeModel
+from fastapi_jsonapi.querystring import QueryStringManager
+
+if TYPE_CHECKING:
+    from sqlalchemy.sql import Select
+
+    from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+
+
+async def count_query(session: AsyncSession, query: "Select") -> int:
+    """
+    Exact count of distinct objects selected by query.
+
+    :param session: sqlalchemy session.
+    :param query: filtered query.
+    :return: the number of objects.
+    """
+    count_query_ = select(func.count(distinct(column("id")))).select_from(query.subquery())
+    return (await session.execute(count_query_)).scalar_one()
+
+
+class CollectionCountStrategy:
+    """
+    Base strategy to count collection objects.
+
+    `count` is called with the filtered query before the page is fetched.
+    If it returns None, `count_page` is called after the page is fetched.
+    """
+
+    # strategies counting after the page is fetched are not run concurrently with the page query
+    counts_before_fetch: bool = True
+
+    def prepare_page_query(self, query: "Select", qs: QueryStringManager) -> "Select":
+        """
+        Modify the page query (after pagination is applied).
+
+        :param query: paginated query.
+        :param qs: a querystring manager to retrieve information from url.
+        :return: the page query.
+        """
+        return query
+
+    def read_page(self, result: Result) -> Tuple[List[TypeModel], Optional[int]]:
+        """
+        Read objects of the page from the page query result.
+
+        :param result: the page query result.
+        :return: objects and the number of objects (if it's selected by the page query).
+        """
+        return list(result.unique().scalars().all()), None
+
+    async def count(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        session: AsyncSession,
+    ) -> Optional[int]:
+        """
+        Count collection objects before the page is fetched.
+
+        :param dl: data layer.
+        :param query: filtered query.
+        :param qs: a querystring manager to retrieve information from url.
+        :param view_kwargs: kwargs from the resource view.
+        :param session: session to count with, may differ from the data layer session (concurrent count).
+        :return: the number of objects or None to count after the page is fetched.
+        """
+        raise NotImplementedError
+
+    async def count_page(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        collection: List[TypeModel],
+        page_count: Optional[int],
+    ) -> int:
+        """
+        Count collection objects after the page is fetched.
+
+        :param dl: data layer.
+        :param query: filtered query.
+        :param qs: a querystring manager to retrieve information from url.
+        :param view_kwargs: kwargs from the resource view.
+        :param collection: objects fetched by the page query.
+        :param page_count: the number of objects read by `read_page`.
+        :return: the number of objects.
+        """
+        return await count_query(dl.session, query)
+
+
+class SubqueryCount(CollectionCountStrategy):
+    """
+    Exact count with the separate query: `SELECT count(DISTINCT id) FROM (filtered query)`.
+    """
+
+    async def count(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        session: AsyncSession,
+    ) -> Optional[int]:
+        return await count_query(session, query)
+
+
+class WindowCount(CollectionCountStrategy):
+    """
+    Count with `COUNT(*) OVER()` selected by the page query itself, no separate query.
+
+    Rows are counted (not distinct objects), so count may differ
+    for filters by to-many relationships. Empty pages (out of range)
+    and cursor pagination are counted with the separate query.
+    """
+
+    counts_before_fetch = False
+
+    def prepare_page_query(self, query: "Select", qs: QueryStringManager) -> "Select":
+        if qs.pagination.is_cursor:
+            # window would count rows after the cursor only
+            return query
+        return query.add_columns(func.count().over())
+
+    def read_page(self, result: Result) -> Tuple[List[TypeModel], Optional[int]]:
+        rows = result.unique().all()
+        if rows and len(rows[0]) > 1:
+            return [row[0] for row in rows], rows[0][1]
+        return [row[0] for row in rows], None
+
+    async def count(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        session: AsyncSession,
+    ) -> Optional[int]:
+        return None
+
+    async def count_page(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        collection: List[TypeModel],
+        page_count: Optional[int],
+    ) -> int:
+        if page_count is not None:
+            return page_count
+        pagination = qs.pagination
+        if not pagination.is_cursor and pagination.number <= 1:
+            # the first page is empty, so there are no objects at all
+            return 0
+        return await count_query(dl.session, query)
+
+
+class PageNotFullCount(CollectionCountStrategy):
+    """
+    Count only when the page is full.
+
+    If the page has fewer objects than the page size, it's the last page
+    and count is computed from the page number and the page size, no separate query.
+    """
+
+    counts_before_fetch = False
+
+    def __init__(self, strategy: Optional[CollectionCountStrategy] = None):
+        """
+        :param strategy: strategy to count when the page is full.
+        """
+        self.strategy = strategy or SubqueryCount()
+
+    def prepare_page_query(self, query: "Select", qs: QueryStringManager) -> "Select":
+        return self.strategy.prepare_page_query(query, qs)
+
+    def read_page(self, result: Result) -> Tuple[List[TypeModel], Optional[int]]:
+        return self.strategy.read_page(result)
+
+    async def count(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        session: AsyncSession,
+    ) -> Optional[int]:
+        return None
+
+    async def count_page(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        collection: List[TypeModel],
+        page_count: Optional[int],
+    ) -> int:
+        pagination = qs.pagination
+        if not pagination.size:
+            return len(collection)
+
+        if pagination.is_cursor:
+            # cursor query fetches one more object, only the first page may be counted
+            if not (pagination.after or pagination.before) and len(collection) <= pagination.size:
+                return len(collection)
+        elif (collection and len(collection) < pagination.size) or (not collection and pagination.number <= 1):
+            return (pagination.number - 1) * pagination.size + len(collection)
+
+        if (objects_count := await self.strategy.count(dl, query, qs, view_kwargs, dl.session)) is not None:
+            return objects_count
+        return await self.strategy.count_page(dl, query, qs, view_kwargs, collection, page_count)
+
+
+class EstimateCount(CollectionCountStrategy):
+    """
+    Planner estimate of the table rows number for unfiltered queries (PostgreSQL `pg_class.reltuples`).
+
+    Filtered queries, other dialects and never analyzed tables are counted by fallback strategy.
+    """
+
+    def __init__(self, strategy: Optional[CollectionCountStrategy] = None):
+        """
+        :param strategy: strategy to count filtered queries.
+        """
+        self.strategy = strategy or SubqueryCount()
+        self.counts_before_fetch = self.strategy.counts_before_fetch
+
+    def prepare_page_query(self, query: "Select", qs: QueryStringManager) -> "Select":
+        return self.strategy.prepare_page_query(query, qs)
+
+    def read_page(self, result: Result) -> Tuple[List[TypeModel], Optional[int]]:
+        return self.strategy.read_page(result)
+
+    async def estimate(self, dl: "SqlalchemyDataLayer", session: AsyncSession) -> Optional[int]:
+        """
+        Get planner estimate of the model table rows number.
+
+        :param dl: data layer.
+        :param session: sqlalchemy session.
+        :return: estimate or None if it's not available.
+        """
+        connection = await session.connection()
+        if connection.dialect.name != "postgresql":
+            return None
+
+        estimate_query = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)")
+        table_name = dl.model.__table__.fullname
+        estimate = (await session.execute(estimate_query, {"table_name": table_name})).scalar_one_or_none()
+        if estimate is None or estimate < 0:
+            return None
+        return estimate
+
+    async def count(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        session: AsyncSession,
+    ) -> Optional[int]:
+        if query.whereclause is None and (estimate := await self.estimate(dl, session)) is not None:
+            return estimate
+        return await self.strategy.count(dl, query, qs, view_kwargs, session)
+
+    async def count_page(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        collection: List[TypeModel],
+        page_count: Optional[int],
+    ) -> int:
+        return await self.strategy.count_page(dl, query, qs, view_kwargs, collection, page_count)
+
+
+class CachedCount(CollectionCountStrategy):
+    """
+    Count cached for the same filtered query (normalized filters and view conditions) for `ttl` seconds.
+
+    Cache is stored in the strategy instance, so the same instance
+    has to be passed to data layers of all requests.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        max_size: int = 1024,
+        strategy: Optional[CollectionCountStrategy] = None,
+    ):
+        """
+        Create count cache
+
+        :param ttl: seconds to keep count.
+        :param max_size: max number of cached counts (least recently used are dropped).
+        :param strategy: strategy to count on cache miss.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.strategy = strategy or SubqueryCount()
+        self.counts_before_fetch = self.strategy.counts_before_fetch
+        self._cache: "OrderedDict[Hashable, Tuple[float, int]]" = OrderedDict()
+
+    def get_cache_key(self, dl: "SqlalchemyDataLayer", query: "Select") -> Hashable:
+        """
+        Build cache key from the filtered query, sorting doesn't matter for count.
+
+        :param dl: data layer.
+        :param query: filtered query.
+        :return: cache key.
+        """
+        compiled = query.order_by(None).compile()
+        params: Dict[str, Any] = compiled.params
+        return dl.model, str(compiled), json.dumps(params, sort_keys=True, default=str)
+
+    def _get(self, key: Hashable) -> Optional[int]:
+        if (cached := self._cache.get(key)) is None:
+            return None
+
+        expires_at, objects_count = cached
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        return objects_count
+
+    def _set(self, key: Hashable, objects_count: int) -> None:
+        self._cache[key] = (time.monotonic() + self.ttl, objects_count)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def prepare_page_query(self, query: "Select", qs: QueryStringManager) -> "Select":
+        return self.strategy.prepare_page_query(query, qs)
+
+    def read_page(self, result: Result) -> Tuple[List[TypeModel], Optional[int]]:
+        return self.strategy.read_page(result)
+
+    async def count(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        session: AsyncSession,
+    ) -> Optional[int]:
+        key = self.get_cache_key(dl, query)
+        if (objects_count := self._get(key)) is not None:
+            return objects_count
+
+        if (objects_count := await self.strategy.count(dl, query, qs, view_kwargs, session)) is not None:
+            self._set(key, objects_count)
+        return objects_count
+
+    async def count_page(
+        self,
+        dl: "SqlalchemyDataLayer",
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        collection: List[TypeModel],
+        page_count: Optional[int],
+    ) -> int:
+        objects_count = await self.strategy.count_page(dl, query, qs, view_kwargs, collection, page_count)
+        self._set(self.get_cache_key(dl, query), objects_count)
+        return objects_count
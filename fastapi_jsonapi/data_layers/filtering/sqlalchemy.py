@@ -1,11 +1,15 @@
 """Helper to create sqlalchemy filters according to filter querystring parameter"""
 import inspect
 import logging
+import warnings
 from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import (
     Any,
     Callable,
     Dict,
+    Iterator,
     List,
     Optional,
     Set,
@@ -18,7 +22,6 @@ from pydantic import BaseConfig, BaseModel
 from pydantic.fields import ModelField
 from pydantic.validators import _VALIDATORS, find_validators
 from sqlalchemy import and_, false, not_, or_
-from sqlalchemy.orm import aliased
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from sqlalchemy.orm.util import AliasedClass
 from sqlalchemy.sql.elements import BinaryExpression, BooleanClauseList
@@ -27,6 +30,7 @@ from fastapi_jsonapi.data_typing import TypeModel, TypeSchema
 from fastapi_jsonapi.exceptions import InvalidFilters, InvalidType
 from fastapi_jsonapi.exceptions.json_api import HTTPException
 from fastapi_jsonapi.schema import JSONAPISchemaIntrospectionError, get_model_field, get_relationships
+from fastapi_jsonapi.utils.sqla import get_relationship_alias
 
 log = logging.getLogger(__name__)
 
@@ -37,8 +41,13 @@ REGISTERED_PYDANTIC_TYPES: Dict[Type, List[Callable]] = dict(_VALIDATORS)
 
 cast_failed = object()
 
+# compiled filter plans (by filter shape) and value casters (by schema field)
+FILTER_PLANS_CACHE_SIZE = 1024
+
 RelationshipPath = str
 
+RELATIONSHIP_ALIASES_NAMESPACE = "filter"
+
 
 class RelationshipFilteringInfo(BaseModel):
     target_schema: Type[TypeSchema]
@@ -100,19 +109,57 @@ def validator_requires_model_field(validator: Callable) -> bool:
     return field_type == "ModelField" or field_type is ModelField
 
 
-def cast_value_with_pydantic(
-    types: List[Type],
-    value: Any,
-    schema_field: ModelField,
-) -> Tuple[Optional[Any], List[str]]:
-    result_value, errors = None, []
+def cast_value_with_scheme(field_types: List[Type], value: Any) -> Tuple[Any, List[str]]:
+    errors: List[str] = []
+    casted_value = cast_failed
 
-    for type_to_cast in types:
-        for validator in find_validators(type_to_cast, BaseConfig):
+    for field_type in field_types:
+        try:
+            if isinstance(value, list):  # noqa: SIM108
+                casted_value = [field_type(item) for item in value]
+            else:
+                casted_value = field_type(value)
+        except (TypeError, ValueError) as ex:
+            errors.append(str(ex))
+        else:
+            return casted_value, errors
+
+    return casted_value, errors
+
+
+class FilterValueCaster:
+    """
+    Casts filter values to the schema field type and builds filter expressions.
+
+    Field types and their validators are resolved once per schema field.
+    """
+
+    def __init__(self, schema_field: ModelField):
+        self.schema_field = schema_field
+        fields = [schema_field]
+
+        # for Union annotations
+        if schema_field.sub_fields:
+            fields = list(schema_field.sub_fields)
+
+        self.can_be_none = check_can_be_none(fields)
+        self.types = [i.type_ for i in fields]
+        pydantic_types, self.userspace_types = separate_types(self.types)
+        self.has_pydantic_types = bool(pydantic_types)
+        # pairs of (validator, requires model field)
+        self.validators: List[Tuple[Callable, bool]] = [
+            (validator, validator_requires_model_field(validator))
+            for type_to_cast in pydantic_types
+            for validator in find_validators(type_to_cast, BaseConfig)
+        ]
+
+    def cast_value_with_pydantic(self, value: Any) -> Tuple[Optional[Any], List[str]]:
+        errors = []
+
+        for validator, requires_model_field in self.validators:
             args = [value]
-            # TODO: some other way to get all the validator's dependencies?
-            if validator_requires_model_field(validator):
-                args.append(schema_field)
+            if requires_model_field:
+                args.append(self.schema_field)
             try:
                 result_value = validator(*args)
             except Exception as ex:
@@ -120,59 +167,74 @@ def cast_value_with_pydantic(
             else:
                 return result_value, errors
 
-    return None, errors
+        return None, errors
 
+    def cast_iterable_with_pydantic(self, values: List) -> Tuple[List, List[str]]:
+        failed_values = []
 
-def cast_iterable_with_pydantic(
-    types: List[Type],
-    values: List,
-    schema_field: ModelField,
-) -> Tuple[List, List[str]]:
-    type_cast_failed = False
-    failed_values = []
+        result_values: List[Any] = []
+        errors: List[str] = []
 
-    result_values: List[Any] = []
-    errors: List[str] = []
+        for value in values:
+            casted_value, cast_errors = self.cast_value_with_pydantic(value)
+            errors.extend(cast_errors)
 
-    for value in values:
-        casted_value, cast_errors = cast_value_with_pydantic(
-            types,
-            value,
-            schema_field,
-        )
-        errors.extend(cast_errors)
-
-        if casted_value is None:
-            type_cast_failed = True
-            failed_values.append(value)
+            if casted_value is None:
+                failed_values.append(value)
+                continue
 
-            continue
+            result_values.append(casted_value)
 
-        result_values.append(casted_value)
+        if failed_values:
+            msg = f"Can't parse items {failed_values} of value {values}"
+            raise InvalidFilters(msg, pointer=self.schema_field.name)
 
-    if type_cast_failed:
-        msg = f"Can't parse items {failed_values} of value {values}"
-        raise InvalidFilters(msg, pointer=schema_field.name)
+        return result_values, errors
 
-    return result_values, errors
+    def build_expression(
+        self,
+        model_column: InstrumentedAttribute,
+        operator: str,
+        value: Any,
+    ) -> BinaryExpression:
+        if value is None:
+            if self.can_be_none:
+                return getattr(model_column, operator)(value)
 
+            raise InvalidFilters(detail=f"The field `{self.schema_field.name}` can't be null")
 
-def cast_value_with_scheme(field_types: List[Type], value: Any) -> Tuple[Any, List[str]]:
-    errors: List[str] = []
-    casted_value = cast_failed
+        casted_value = None
+        errors: List[str] = []
 
-    for field_type in field_types:
-        try:
-            if isinstance(value, list):  # noqa: SIM108
-                casted_value = [field_type(item) for item in value]
+        if self.has_pydantic_types:
+            if isinstance(value, list):
+                casted_value, errors = self.cast_iterable_with_pydantic(value)
             else:
-                casted_value = field_type(value)
-        except (TypeError, ValueError) as ex:
-            errors.append(str(ex))
-        else:
-            return casted_value, errors
+                casted_value, errors = self.cast_value_with_pydantic(value)
 
-    return casted_value, errors
+        if casted_value is None and self.userspace_types:
+            log.warning("Filtering by user type values is not properly tested yet. Use this on your own risk.")
+
+            casted_value, errors = cast_value_with_scheme(self.types, value)
+
+            if casted_value is cast_failed:
+                raise InvalidType(
+                    detail=f"Can't cast filter value `{value}` to arbitrary type.",
+                    errors=[HTTPException(status_code=InvalidType.status_code, detail=str(err)) for err in errors],
+                )
+
+        if casted_value is None and not self.can_be_none:
+            raise InvalidType(
+                detail=", ".join(errors),
+                pointer=self.schema_field.name,
+            )
+
+        return getattr(model_column, operator)(casted_value)
+
+
+@lru_cache(maxsize=FILTER_PLANS_CACHE_SIZE)
+def get_filter_value_caster(schema_field: ModelField) -> FilterValueCaster:
+    return FilterValueCaster(schema_field)
 
 
 def build_filter_expression(
@@ -194,50 +256,7 @@ def build_filter_expression(
     :param value: filtering value
 
     """
-    fields = [schema_field]
-
-    # for Union annotations
-    if schema_field.sub_fields:
-        fields = list(schema_field.sub_fields)
-
-    can_be_none = check_can_be_none(fields)
-
-    if value is None:
-        if can_be_none:
-            return getattr(model_column, operator)(value)
-
-        raise InvalidFilters(detail=f"The field `{schema_field.name}` can't be null")
-
-    types = [i.type_ for i in fields]
-    casted_value = None
-    errors: List[str] = []
-
-    pydantic_types, userspace_types = separate_types(types)
-
-    if pydantic_types:
-        func = cast_value_with_pydantic
-        if isinstance(value, list):
-            func = cast_iterable_with_pydantic
-        casted_value, errors = func(pydantic_types, value, schema_field)
-
-    if casted_value is None and userspace_types:
-        log.warning("Filtering by user type values is not properly tested yet. Use this on your own risk.")
-
-        casted_value, errors = cast_value_with_scheme(types, value)
-
-        if casted_value is cast_failed:
-            raise InvalidType(
-                detail=f"Can't cast filter value `{value}` to arbitrary type.",
-                errors=[HTTPException(status_code=InvalidType.status_code, detail=str(err)) for err in errors],
-            )
-
-    if casted_value is None and not can_be_none:
-        raise InvalidType(
-            detail=", ".join(errors),
-            pointer=schema_field.name,
-        )
-
-    return getattr(model_column, operator)(casted_value)
+    return get_filter_value_caster(schema_field).build_expression(model_column, operator, value)
 
 
 def is_terminal_node(filter_item: dict) -> bool:
@@ -258,31 +277,6 @@ def is_relationship_filter(name: str) -> bool:
     return RELATIONSHIP_SPLITTER in name
 
 
-def gather_relationship_paths(filter_item: Union[dict, list]) -> Set[str]:
-    """
-    Extracts relationship paths from query filter
-    """
-    names = set()
-
-    if isinstance(filter_item, list):
-        for sub_item in filter_item:
-            names.update(gather_relationship_paths(sub_item))
-
-    elif is_terminal_node(filter_item):
-        name = filter_item["name"]
-
-        if RELATIONSHIP_SPLITTER not in name:
-            return set()
-
-        return {RELATIONSHIP_SPLITTER.join(name.split(RELATIONSHIP_SPLITTER)[:-1])}
-
-    else:
-        for sub_item in filter_item.values():
-            names.update(gather_relationship_paths(sub_item))
-
-    return names
-
-
 def get_model_column(
     model: Type[TypeModel],
     schema: Type[TypeSchema],
@@ -333,7 +327,9 @@ def gather_relationships_info(
     collected_info: dict[RelationshipPath, RelationshipFilteringInfo],
     target_relationship_idx: int = 0,
     prev_aliased_model: Optional[Any] = None,
+    entrypoint_model: Optional[Type[TypeModel]] = None,
 ) -> dict[RelationshipPath, RelationshipFilteringInfo]:
+    entrypoint_model = entrypoint_model or model
     is_last_relationship = target_relationship_idx == len(relationship_path) - 1
     target_relationship_path = RELATIONSHIP_SPLITTER.join(
         relationship_path[: target_relationship_idx + 1],
@@ -360,7 +356,12 @@ def gather_relationships_info(
             target_relationship_name,
         )
 
-    aliased_model = aliased(target_model)
+    aliased_model = get_relationship_alias(
+        namespace=RELATIONSHIP_ALIASES_NAMESPACE,
+        root_model=entrypoint_model,
+        relationship_path=target_relationship_path,
+        target_model=target_model,
+    )
     collected_info[target_relationship_path] = RelationshipFilteringInfo(
         target_schema=target_schema,
         model=target_model,
@@ -376,6 +377,7 @@ def gather_relationships_info(
             collected_info=collected_info,
             target_relationship_idx=target_relationship_idx + 1,
             prev_aliased_model=aliased_model,
+            entrypoint_model=entrypoint_model,
         )
 
     return collected_info
@@ -398,158 +400,244 @@ def gather_relationships(
     return collected_info
 
 
-def prepare_relationships_info(
+def resolve_relationship_path(
     model: Type[TypeModel],
     schema: Type[TypeSchema],
-    filter_info: list,
-):
-    # TODO: do this on application startup or use the cache
-    relationship_paths = gather_relationship_paths(filter_info)
-    return gather_relationships(
-        entrypoint_model=model,
-        schema=schema,
-        relationship_paths=relationship_paths,
-    )
+    relationship_path: List[str],
+) -> Tuple[Type[TypeModel], Type[TypeSchema]]:
+    """
+    Get target model and schema of relationship path
 
+    :raises InvalidFilters: if there is no such relationship
+    """
+    for relationship_name in relationship_path:
+        if relationship_name not in set(get_relationships(schema)):
+            msg = f"There are no relationship '{relationship_name}' defined in schema {schema.__name__}"
+            raise InvalidFilters(msg)
 
-def build_terminal_node_filter_expressions(
-    filter_item: Dict,
-    target_schema: Type[TypeSchema],
-    target_model: Type[TypeModel],
-    relationships_info: Dict[RelationshipPath, RelationshipFilteringInfo],
-):
-    name: str = filter_item["name"]
-    if is_relationship_filter(name):
-        *relationship_path, field_name = name.split(RELATIONSHIP_SPLITTER)
-        relationship_info: RelationshipFilteringInfo = relationships_info[
-            RELATIONSHIP_SPLITTER.join(relationship_path)
-        ]
-        model_column = get_model_column(
-            model=relationship_info.aliased_model,
-            schema=relationship_info.target_schema,
-            field_name=field_name,
-        )
-        target_schema = relationship_info.target_schema
-    else:
-        field_name = name
-        model_column = get_model_column(
-            model=target_model,
-            schema=target_schema,
-            field_name=field_name,
-        )
+        model = getattr(model, relationship_name).property.mapper.class_
+        schema = schema.__fields__[relationship_name].type_
 
-    schema_field = target_schema.__fields__[field_name]
+    return model, schema
 
-    filter_operator = filter_item["op"]
-    custom_filter_expression: Callable = get_custom_filter_expression_callable(
-        schema_field=schema_field,
-        operator=filter_operator,
-    )
-    if custom_filter_expression is None:
-        return build_filter_expression(
-            schema_field=schema_field,
+
+class FilterPlan:
+    """
+    Compiled filter node, values are bound on each request
+    """
+
+    def bind(
+        self,
+        values: Iterator[Any],
+        model: Type[TypeModel],
+        relationships_info: Dict[RelationshipPath, RelationshipFilteringInfo],
+    ) -> Union[BinaryExpression, BooleanClauseList]:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class LogicFilterPlan(FilterPlan):
+    operator: Callable
+    children: Tuple[FilterPlan, ...]
+
+    def bind(self, values, model, relationships_info):
+        return self.operator(*(child.bind(values, model, relationships_info) for child in self.children))
+
+
+@dataclass(frozen=True)
+class NotFilterPlan(FilterPlan):
+    child: FilterPlan
+
+    def bind(self, values, model, relationships_info):
+        return not_(self.child.bind(values, model, relationships_info))
+
+
+class NoopFilterPlan(FilterPlan):
+    def bind(self, values, model, relationships_info):
+        # dirty. refactor.
+        return not_(false())
+
+
+@dataclass(frozen=True)
+class FieldFilterPlan(FilterPlan):
+    """
+    Compiled terminal node: schema field, model attribute, operator and value caster
+    """
+
+    relationship_path: Optional[RelationshipPath]
+    schema_field: ModelField
+    model_field_name: str
+    filter_operator: str
+    # attribute of the column to call (when there is no custom filter)
+    operator: Optional[str]
+    custom_filter_expression: Optional[Callable]
+    caster: FilterValueCaster
+
+    def bind(self, values, model, relationships_info):
+        if self.relationship_path is not None:
+            model = relationships_info[self.relationship_path].aliased_model
+        model_column = getattr(model, self.model_field_name)
+        value = next(values)
+
+        if self.custom_filter_expression is None:
+            return self.caster.build_expression(model_column, self.operator, value)
+
+        custom_call_result = self.custom_filter_expression(
+            schema_field=self.schema_field,
             model_column=model_column,
-            operator=get_operator(
-                model_column=model_column,
-                operator_name=filter_operator,
-            ),
-            value=filter_item["val"],
+            value=value,
+            operator=self.filter_operator,
         )
-
-    custom_call_result = custom_filter_expression(
-        schema_field=schema_field,
-        model_column=model_column,
-        value=filter_item["val"],
-        operator=filter_operator,
-    )
-    if isinstance(custom_call_result, Sequence):
-        expected_len = 2
-        if len(custom_call_result) != expected_len:
-            log.error(
-                "Invalid filter, returned sequence length is not %s: %s, len=%s",
-                expected_len,
-                custom_call_result,
-                len(custom_call_result),
+        if isinstance(custom_call_result, Sequence):
+            expected_len = 2
+            if len(custom_call_result) != expected_len:
+                log.error(
+                    "Invalid filter, returned sequence length is not %s: %s, len=%s",
+                    expected_len,
+                    custom_call_result,
+                    len(custom_call_result),
+                )
+                raise InvalidFilters(detail="Custom sql filter backend error.")
+            log.warning(
+                "Custom filter result of `[expr, [joins]]` is deprecated."
+                " Please return only filter expression from now on. "
+                "(triggered on schema field %s for filter operator %s on column %s)",
+                self.schema_field,
+                self.filter_operator,
+                model_column,
             )
-            raise InvalidFilters(detail="Custom sql filter backend error.")
-        log.warning(
-            "Custom filter result of `[expr, [joins]]` is deprecated."
-            " Please return only filter expression from now on. "
-            "(triggered on schema field %s for filter operator %s on column %s)",
-            schema_field,
-            filter_operator,
-            model_column,
-        )
-        custom_call_result = custom_call_result[0]
-    return custom_call_result
+            custom_call_result = custom_call_result[0]
+        return custom_call_result
 
 
-def build_filter_expressions(
-    filter_item: Dict,
-    target_schema: Type[TypeSchema],
-    target_model: Type[TypeModel],
-    relationships_info: Dict[RelationshipPath, RelationshipFilteringInfo],
-) -> Union[BinaryExpression, BooleanClauseList]:
+SQLA_LOGIC_OPERATORS = {
+    "or": or_,
+    "and": and_,
+    "not": not_,
+}
+
+
+def get_filter_shape(filter_item: Any, values: List[Any]) -> Tuple:
     """
-    Return sqla expressions.
+    Get filter shape (filter without values) and collect values in the same order
 
-    Builds sqlalchemy expression which can be use
-    in where condition: query(Model).where(build_filter_expressions(...))
+    Shape is hashable and used as the compiled plans cache key:
+
+        ("field", name, op) | ("and" | "or", (shape, ...)) | ("not", shape) | ("noop",)
+
+    :raises InvalidFilters: if logic node is invalid
     """
-    if is_terminal_node(filter_item):
-        return build_terminal_node_filter_expressions(
-            filter_item=filter_item,
-            target_schema=target_schema,
-            target_model=target_model,
-            relationships_info=relationships_info,
-        )
+    if isinstance(filter_item, dict) and is_terminal_node(filter_item):
+        name, filter_operator = filter_item["name"], filter_item["op"]
+        if not isinstance(name, str) or not isinstance(filter_operator, str):
+            msg = f"Filter name and operator are expected to be strings, got {name!r} and {filter_operator!r}"
+            raise InvalidFilters(msg)
+        values.append(filter_item["val"])
+        return "field", name, filter_operator
 
     if not isinstance(filter_item, dict):
-        log.warning("Could not build filtering expressions %s", locals())
-        # dirty. refactor.
-        return not_(false())
-
-    sqla_logic_operators = {
-        "or": or_,
-        "and": and_,
-        "not": not_,
-    }
+        log.warning("Could not build filtering expressions %s", filter_item)
+        return ("noop",)
 
     if len(logic_operators := set(filter_item.keys())) > 1:
         msg = (
-            f"In each logic node expected one of operators: {set(sqla_logic_operators.keys())} "
+            f"In each logic node expected one of operators: {set(SQLA_LOGIC_OPERATORS.keys())} "
             f"but got {len(logic_operators)}: {logic_operators}"
         )
         raise InvalidFilters(msg)
 
-    if (logic_operator := logic_operators.pop()) not in set(sqla_logic_operators.keys()):
-        msg = f"Not found logic operator {logic_operator} expected one of {set(sqla_logic_operators.keys())}"
+    if (logic_operator := logic_operators.pop()) not in set(SQLA_LOGIC_OPERATORS.keys()):
+        msg = f"Not found logic operator {logic_operator} expected one of {set(SQLA_LOGIC_OPERATORS.keys())}"
         raise InvalidFilters(msg)
 
-    op = sqla_logic_operators[logic_operator]
-
     if logic_operator == "not":
-        return op(
-            build_filter_expressions(
-                filter_item=filter_item[logic_operator],
-                target_schema=target_schema,
-                target_model=target_model,
-                relationships_info=relationships_info,
-            ),
-        )
+        return logic_operator, get_filter_shape(filter_item[logic_operator], values)
 
-    expressions = []
-    for filter_sub_item in filter_item[logic_operator]:
-        expressions.append(
-            build_filter_expressions(
-                filter_item=filter_sub_item,
-                target_schema=target_schema,
-                target_model=target_model,
-                relationships_info=relationships_info,
-            ),
-        )
+    return logic_operator, tuple(get_filter_shape(sub_item, values) for sub_item in filter_item[logic_operator])
+
+
+def compile_field_filter(
+    model: Type[TypeModel],
+    schema: Type[TypeSchema],
+    name: str,
+    filter_operator: str,
+) -> FieldFilterPlan:
+    relationship_path = None
+    field_name = name
+    if is_relationship_filter(name):
+        *path, field_name = name.split(RELATIONSHIP_SPLITTER)
+        relationship_path = RELATIONSHIP_SPLITTER.join(path)
+        model, schema = resolve_relationship_path(model, schema, path)
 
-    return op(*expressions)
+    model_column = get_model_column(model=model, schema=schema, field_name=field_name)
+    schema_field = schema.__fields__[field_name]
+
+    custom_filter_expression = get_custom_filter_expression_callable(
+        schema_field=schema_field,
+        operator=filter_operator,
+    )
+    operator = None
+    if custom_filter_expression is None:
+        operator = get_operator(model_column=model_column, operator_name=filter_operator)
+
+    return FieldFilterPlan(
+        relationship_path=relationship_path,
+        schema_field=schema_field,
+        model_field_name=get_model_field(schema, field_name),
+        filter_operator=filter_operator,
+        operator=operator,
+        custom_filter_expression=custom_filter_expression,
+        caster=get_filter_value_caster(schema_field),
+    )
+
+
+def compile_filter_shape(
+    model: Type[TypeModel],
+    schema: Type[TypeSchema],
+    shape: Tuple,
+    relationship_paths: Set[RelationshipPath],
+) -> FilterPlan:
+    kind = shape[0]
+    if kind == "field":
+        plan = compile_field_filter(model, schema, name=shape[1], filter_operator=shape[2])
+        if plan.relationship_path is not None:
+            relationship_paths.add(plan.relationship_path)
+        return plan
+
+    if kind == "noop":
+        return NoopFilterPlan()
+
+    if kind == "not":
+        return NotFilterPlan(child=compile_filter_shape(model, schema, shape[1], relationship_paths))
+
+    return LogicFilterPlan(
+        operator=SQLA_LOGIC_OPERATORS[kind],
+        children=tuple(compile_filter_shape(model, schema, sub_shape, relationship_paths) for sub_shape in shape[1]),
+    )
+
+
+@lru_cache(maxsize=FILTER_PLANS_CACHE_SIZE)
+def compile_filter_plan(
+    model: Type[TypeModel],
+    schema: Type[TypeSchema],
+    shape: Tuple,
+) -> Tuple[FilterPlan, Dict[RelationshipPath, RelationshipFilteringInfo]]:
+    """
+    Compile filter shape: resolve columns, operators and value casters once per shape
+
+    Relationship aliases are the same for each (model, relationship path),
+    so the join metadata is compiled with the plan as well.
+
+    :return: compiled plan and relationships to join
+    """
+    relationship_paths: Set[RelationshipPath] = set()
+    plan = compile_filter_shape(model, schema, shape, relationship_paths)
+    relationships_info = gather_relationships(
+        entrypoint_model=model,
+        schema=schema,
+        relationship_paths=relationship_paths,
+    )
+    return plan, relationships_info
 
 
 def create_filters_and_joins(
@@ -557,16 +645,140 @@ def create_filters_and_joins(
     model: Type[TypeModel],
     schema: Type[TypeSchema],
 ):
-    relationships_info = prepare_relationships_info(
-        model=model,
+    values: List[Any] = []
+    shape = get_filter_shape({"and": filter_info}, values)
+    plan, relationships_info = compile_filter_plan(model, schema, shape)
+
+    expressions = plan.bind(iter(values), model, relationships_info)
+    joins = [(info.aliased_model, info.join_column) for info in relationships_info.values()]
+    return expressions, joins
+
+
+# deprecated helpers of the filters built without compiled plans
+
+
+def warn_deprecated_filtering_helper(name: str) -> None:
+    warnings.warn(
+        f"`{name}` is deprecated, filters are compiled by shape with `compile_filter_plan`",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+
+
+def cast_value_with_pydantic(
+    types: List[Type],
+    value: Any,
+    schema_field: ModelField,
+) -> Tuple[Optional[Any], List[str]]:
+    """
+    Cast value with pydantic validators of the schema field types
+
+    Deprecated: use `FilterValueCaster.cast_value_with_pydantic`,
+    types are resolved from `schema_field` (`types` is ignored).
+    """
+    warn_deprecated_filtering_helper("cast_value_with_pydantic")
+    return get_filter_value_caster(schema_field).cast_value_with_pydantic(value)
+
+
+def cast_iterable_with_pydantic(
+    types: List[Type],
+    values: List,
+    schema_field: ModelField,
+) -> Tuple[List, List[str]]:
+    """
+    Cast values with pydantic validators of the schema field types
+
+    Deprecated: use `FilterValueCaster.cast_iterable_with_pydantic`,
+    types are resolved from `schema_field` (`types` is ignored).
+    """
+    warn_deprecated_filtering_helper("cast_iterable_with_pydantic")
+    return get_filter_value_caster(schema_field).cast_iterable_with_pydantic(values)
+
+
+def _gather_relationship_paths(filter_item: Union[dict, list]) -> Set[str]:
+    names = set()
+
+    if isinstance(filter_item, list):
+        for sub_item in filter_item:
+            names.update(_gather_relationship_paths(sub_item))
+
+    elif is_terminal_node(filter_item):
+        name = filter_item["name"]
+
+        if RELATIONSHIP_SPLITTER not in name:
+            return set()
+
+        return {RELATIONSHIP_SPLITTER.join(name.split(RELATIONSHIP_SPLITTER)[:-1])}
+
+    else:
+        for sub_item in filter_item.values():
+            names.update(_gather_relationship_paths(sub_item))
+
+    return names
+
+
+def gather_relationship_paths(filter_item: Union[dict, list]) -> Set[str]:
+    """
+    Extracts relationship paths from query filter
+
+    Deprecated: relationship paths are collected by `compile_filter_plan`.
+    """
+    warn_deprecated_filtering_helper("gather_relationship_paths")
+    return _gather_relationship_paths(filter_item)
+
+
+def prepare_relationships_info(
+    model: Type[TypeModel],
+    schema: Type[TypeSchema],
+    filter_info: list,
+) -> Dict[RelationshipPath, RelationshipFilteringInfo]:
+    """
+    Gather relationships to join for the filter
+
+    Deprecated: relationships are compiled with the plan by `compile_filter_plan`.
+    """
+    warn_deprecated_filtering_helper("prepare_relationships_info")
+    return gather_relationships(
+        entrypoint_model=model,
         schema=schema,
-        filter_info=filter_info,
+        relationship_paths=_gather_relationship_paths(filter_info),
     )
-    expressions = build_filter_expressions(
-        filter_item={"and": filter_info},
-        target_model=model,
-        target_schema=schema,
-        relationships_info=relationships_info,
+
+
+def build_terminal_node_filter_expressions(
+    filter_item: Dict,
+    target_schema: Type[TypeSchema],
+    target_model: Type[TypeModel],
+    relationships_info: Dict[RelationshipPath, RelationshipFilteringInfo],
+):
+    """
+    Build sqla expression of the terminal node
+
+    Deprecated: terminal nodes are compiled by `compile_field_filter`.
+    """
+    warn_deprecated_filtering_helper("build_terminal_node_filter_expressions")
+    plan = compile_field_filter(
+        model=target_model,
+        schema=target_schema,
+        name=filter_item["name"],
+        filter_operator=filter_item["op"],
     )
-    joins = [(info.aliased_model, info.join_column) for info in relationships_info.values()]
-    return expressions, joins
+    return plan.bind(iter([filter_item["val"]]), target_model, relationships_info)
+
+
+def build_filter_expressions(
+    filter_item: Dict,
+    target_schema: Type[TypeSchema],
+    target_model: Type[TypeModel],
+    relationships_info: Dict[RelationshipPath, RelationshipFilteringInfo],
+) -> Union[BinaryExpression, BooleanClauseList]:
+    """
+    Return sqla expressions.
+
+    Deprecated: filters are compiled by shape with `compile_filter_plan`, use `create_filters_and_joins`.
+    """
+    warn_deprecated_filtering_helper("build_filter_expressions")
+    values: List[Any] = []
+    shape = get_filter_shape(filter_item, values)
+    plan = compile_filter_shape(target_model, target_schema, shape, relationship_paths=set())
+    return plan.bind(iter(values), target_model, relationships_info)
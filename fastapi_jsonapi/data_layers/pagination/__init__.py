@@ -0,0 +1 @@
+"""Base pagination functions package."""
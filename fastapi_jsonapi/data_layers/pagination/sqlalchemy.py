@@ -0,0 +1,183 @@
+"""Helper to create sqlalchemy keyset (cursor) pagination according to page querystring parameter"""
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import simplejson as json
+from pydantic import ValidationError, parse_obj_as
+from pydantic.json import pydantic_encoder
+from sqlalchemy import and_, false, or_
+from sqlalchemy.engine import Dialect
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.sql.elements import BooleanClauseList, UnaryExpression
+
+from fastapi_jsonapi.data_typing import TypeModel
+from fastapi_jsonapi.exceptions import BadRequest, InvalidSort
+from fastapi_jsonapi.splitter import SPLIT_REL
+
+# databases sorting NULLs after all the other values in ascending order (others sort them first)
+NULLS_LARGEST_DIALECTS = frozenset({"postgresql", "oracle"})
+
+
+@dataclass(frozen=True)
+class KeysetColumn:
+    """
+    One key of the keyset: sort column or the primary key (tiebreaker)
+
+    `nulls_largest` tells where the database puts NULLs of nullable columns:
+    after all the other values in ascending order (PostgreSQL) or before them (SQLite, MySQL).
+    """
+
+    attr_name: str
+    column: InstrumentedAttribute
+    descending: bool = False
+    nulls_largest: bool = False
+
+    @property
+    def nullable(self) -> bool:
+        return getattr(self.column.expression, "nullable", True)
+
+    def order_by(self, reverse: bool = False) -> UnaryExpression:
+        descending = self.descending is not reverse
+        return self.column.desc() if descending else self.column.asc()
+
+    def cast_value(self, value: Any, parameter: str) -> Any:
+        if value is None:
+            return value
+
+        try:
+            python_type = self.column.type.python_type
+        except NotImplementedError:
+            return value
+
+        try:
+            return parse_obj_as(python_type, value)
+        except ValidationError:
+            msg = "Invalid cursor"
+            raise BadRequest(msg, parameter=parameter)
+
+
+def dialect_nulls_are_largest(dialect: Dialect) -> bool:
+    """
+    Check if the database sorts NULLs after all the other values in ascending order.
+
+    :param dialect: sqlalchemy dialect.
+    :return:
+    """
+    return dialect.name in NULLS_LARGEST_DIALECTS
+
+
+def create_keyset(
+    model: Type[TypeModel],
+    sort_info: List[Dict[str, str]],
+    id_field_name: str,
+    nulls_largest: bool = False,
+) -> List[KeysetColumn]:
+    """
+    Create keyset from sort information, the primary key is added as a tiebreaker.
+
+    :param model: an sqlalchemy model.
+    :param sort_info: sort information, model fields and orders.
+    :param id_field_name: name of the primary key field.
+    :param nulls_largest: the database sorts NULLs after all the other values in ascending order.
+    :return: keyset columns.
+    """
+    keyset = []
+    for sort_ in sort_info:
+        field = sort_["field"]
+        if SPLIT_REL in field:
+            msg = f"Cursor pagination doesn't support sort by relationship field {field}"
+            raise InvalidSort(msg)
+        keyset.append(
+            KeysetColumn(
+                attr_name=field,
+                column=getattr(model, field),
+                descending=sort_["order"] == "desc",
+                nulls_largest=nulls_largest,
+            ),
+        )
+
+    if id_field_name not in {key.attr_name for key in keyset}:
+        keyset.append(KeysetColumn(attr_name=id_field_name, column=getattr(model, id_field_name)))
+
+    return keyset
+
+
+def create_keyset_condition(
+    keyset: Sequence[KeysetColumn],
+    values: Sequence[Any],
+    reverse: bool = False,
+) -> BooleanClauseList:
+    """
+    Create condition selecting rows after the cursor (or before the cursor if reversed).
+
+    Keys may have different order directions, so the row comparison is expanded:
+    ``(a > :a) OR (a = :a AND b > :b) OR ...``
+
+    NULLs of nullable keys are compared the way the database orders them (see `KeysetColumn.nulls_largest`):
+    ``a = NULL`` becomes ``a IS NULL``, rows with NULL go after the cursor value if NULLs are sorted after values
+    and rows with values go after the cursor NULL if NULLs are sorted before values.
+
+    :param keyset: keyset columns.
+    :param values: cursor values.
+    :param reverse: select rows before the cursor.
+    :return: where clause.
+    """
+    clauses = []
+    for index, (key, value) in enumerate(zip(keyset, values)):
+        descending = key.descending is not reverse
+        # NULLs go after the values in the order of the rows selected
+        nulls_after = key.nulls_largest is not descending
+        if value is None:
+            comparison = false() if nulls_after else key.column.isnot(None)
+        else:
+            comparison = key.column < value if descending else key.column > value
+            if nulls_after and key.nullable:
+                comparison = or_(comparison, key.column.is_(None))
+
+        equals = [
+            prev_key.column.is_(None) if prev_value is None else prev_key.column == prev_value
+            for prev_key, prev_value in zip(keyset[:index], values[:index])
+        ]
+        clauses.append(and_(*equals, comparison))
+
+    return or_(*clauses)
+
+
+def encode_cursor(keyset: Sequence[KeysetColumn], item: TypeModel) -> str:
+    """
+    Create opaque cursor pointing to the item.
+
+    :param keyset: keyset columns.
+    :param item: an object from sqlalchemy.
+    :return: cursor.
+    """
+    values = [getattr(item, key.attr_name) for key in keyset]
+    dumped = json.dumps(values, default=pydantic_encoder, separators=(",", ":"))
+    return urlsafe_b64encode(dumped.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(keyset: Sequence[KeysetColumn], cursor: str, parameter: str) -> Optional[List[Any]]:
+    """
+    Decode cursor values. Empty cursor points to the start (or the end) of the collection.
+
+    :param keyset: keyset columns.
+    :param cursor: cursor from the querystring.
+    :param parameter: querystring parameter name for errors.
+    :return: cursor values casted to column types.
+    :raises BadRequest: if cursor is malformed or doesn't match sorting.
+    """
+    if not cursor:
+        return None
+
+    msg = "Invalid cursor"
+    try:
+        values = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise BadRequest(msg, parameter=parameter)
+
+    if not isinstance(values, list) or len(values) != len(keyset):
+        raise BadRequest(msg, parameter=parameter)
+
+    return [key.cast_value(value, parameter) for key, value in zip(keyset, values)]
@@ -1,8 +1,8 @@
 """Helper to create sqlalchemy sortings according to filter querystring parameter"""
-from typing import Any, List, Tuple, Type, Union
+from typing import Any, List, Optional, Tuple, Type, Union
 
 from pydantic.fields import ModelField
-from sqlalchemy.orm import DeclarativeMeta, InstrumentedAttribute, aliased
+from sqlalchemy.orm import DeclarativeMeta, InstrumentedAttribute
 from sqlalchemy.sql.elements import BinaryExpression
 
 from fastapi_jsonapi.data_layers.shared import create_filters_or_sorts
@@ -10,7 +10,7 @@ from fastapi_jsonapi.data_typing import TypeModel, TypeSchema
 from fastapi_jsonapi.exceptions import InvalidFilters, InvalidSort
 from fastapi_jsonapi.schema import get_model_field, get_relationships
 from fastapi_jsonapi.splitter import SPLIT_REL
-from fastapi_jsonapi.utils.sqla import get_related_model_cls
+from fastapi_jsonapi.utils.sqla import get_related_model_cls, get_relationship_alias
 
 Sort = BinaryExpression
 Join = List[Any]
@@ -20,6 +20,8 @@ SortAndJoins = Tuple[
     List[Join],
 ]
 
+RELATIONSHIP_ALIASES_NAMESPACE = "sort"
+
 
 def create_sorts(model: Type[TypeModel], filter_info: Union[list, dict], schema: Type[TypeSchema]):
     """
@@ -35,17 +37,28 @@ def create_sorts(model: Type[TypeModel], filter_info: Union[list, dict], schema:
 class Node(object):
     """Helper to recursively create sorts with sqlalchemy according to sort querystring parameter"""
 
-    def __init__(self, model: Type[TypeModel], sort_: dict, schema: Type[TypeSchema]):
+    def __init__(
+        self,
+        model: Type[TypeModel],
+        sort_: dict,
+        schema: Type[TypeSchema],
+        root_model: Optional[Type[TypeModel]] = None,
+        relationship_path: str = "",
+    ):
         """
         Initialize an instance of a filter node.
 
         :params model: an sqlalchemy model.
         :params sort_: sorts information of the current node and deeper nodes.
         :param schema: the serializer of the resource.
+        :param root_model: the model of the root node, to get the same relationship aliases.
+        :param relationship_path: relationship path from the root node to the current node.
         """
         self.model = model
         self.sort_ = sort_
         self.schema = schema
+        self.root_model = root_model or model
+        self.relationship_path = relationship_path
 
     @classmethod
     def create_sort(cls, schema_field: ModelField, model_column, order: str):
@@ -86,9 +99,15 @@ class Node(object):
 
         if SPLIT_REL in field:
             value = {"field": SPLIT_REL.join(field.split(SPLIT_REL)[1:]), "order": self.sort_["order"]}
-            alias = aliased(self.related_model)
+            relationship_path = SPLIT_REL.join(filter(None, (self.relationship_path, self.name)))
+            alias = get_relationship_alias(
+                namespace=RELATIONSHIP_ALIASES_NAMESPACE,
+                root_model=self.root_model,
+                relationship_path=relationship_path,
+                target_model=self.related_model,
+            )
             joins = [[alias, self.column]]
-            node = Node(alias, value, self.related_schema)
+            node = Node(alias, value, self.related_schema, self.root_model, relationship_path)
             filters, new_joins = node.resolve()
             joins.extend(new_joins)
             return filters, joins
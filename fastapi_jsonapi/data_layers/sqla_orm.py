@@ -1,22 +1,56 @@
 """This module is a CRUD interface between resource managers and the sqlalchemy ORM"""
+import asyncio
 import logging
-from typing import TYPE_CHECKING, Any, Iterable, List, Literal, Optional, Tuple, Type, Union
+from collections import defaultdict
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
-from sqlalchemy import delete, func, select
-from sqlalchemy.exc import DBAPIError, IntegrityError, MissingGreenlet, NoResultFound
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.exc import DBAPIError, IntegrityError, InvalidRequestError, MissingGreenlet, NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
 from sqlalchemy.inspection import inspect
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import Load, RelationshipProperty, defaultload, joinedload, load_only, raiseload, selectinload
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from sqlalchemy.orm.collections import InstrumentedList
-from sqlalchemy.sql import column, distinct
+from sqlalchemy.orm.decl_base import _declarative_constructor
+from sqlalchemy.orm.session import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.types import JSON
 
 from fastapi_jsonapi import BadRequest
-from fastapi_jsonapi.data_layers.base import BaseDataLayer
+from fastapi_jsonapi.data_layers.base import BaseDataLayer, CollectionCursors
+from fastapi_jsonapi.data_layers.counting.sqlalchemy import CollectionCountStrategy, SubqueryCount, count_query
 from fastapi_jsonapi.data_layers.filtering.sqlalchemy import (
     create_filters_and_joins,
 )
+from fastapi_jsonapi.data_layers.pagination.sqlalchemy import (
+    KeysetColumn,
+    create_keyset,
+    create_keyset_condition,
+    decode_cursor,
+    dialect_nulls_are_largest,
+    encode_cursor,
+)
 from fastapi_jsonapi.data_layers.sorting.sqlalchemy import create_sorts
+from fastapi_jsonapi.data_layers.statements.sqlalchemy import StatementCounter
 from fastapi_jsonapi.data_typing import TypeModel, TypeSchema
 from fastapi_jsonapi.exceptions import (
     HTTPException,
@@ -27,6 +61,7 @@ from fastapi_jsonapi.exceptions import (
     RelationNotFound,
 )
 from fastapi_jsonapi.querystring import PaginationQueryStringManager, QueryStringManager
+from fastapi_jsonapi.request_timings import RequestPhase
 from fastapi_jsonapi.schema import (
     BaseJSONAPIItemInSchema,
     BaseJSONAPIRelationshipDataToManySchema,
@@ -36,16 +71,122 @@ from fastapi_jsonapi.schema import (
 )
 from fastapi_jsonapi.schema_base import RelationshipInfo
 from fastapi_jsonapi.splitter import SPLIT_REL
+from fastapi_jsonapi.utils.dependency_helper import DEPENDENCIES_EXIT_BEFORE_RESPONSE
 from fastapi_jsonapi.utils.sqla import get_related_model_cls
+from fastapi_jsonapi.views.utils import IGNORE_ALL_FIELDS_LITERAL
 
 if TYPE_CHECKING:
     from pydantic import BaseModel as PydanticBaseModel
+    from sqlalchemy.engine import Result
     from sqlalchemy.sql import Select
 
 log = logging.getLogger(__name__)
 
 ModelTypeOneOrMany = Union[TypeModel, list[TypeModel]]
+SPARSE_FIELDSET_COLUMNS_CACHE_SIZE = 1024
 ActionTrigger = Literal["create", "update"]
+# update with `RETURNING` skips these methods, so it's not used when any of them is overridden
+UPDATE_WITH_RETURNING_SKIPPED_METHODS = (
+    "query",
+    "retrieve_object_query",
+    "get_object",
+    "before_get_object",
+    "after_get_object",
+    "update_object",
+    "before_update_object",
+    "after_update_object",
+)
+# delete with a single statement skips these methods, so it's not used when any of them is overridden
+DELETE_WITH_STATEMENT_SKIPPED_METHODS = (
+    "query",
+    "retrieve_object_query",
+    "get_object",
+    "before_get_object",
+    "after_get_object",
+    "delete_object",
+    "before_delete_object",
+    "after_delete_object",
+)
+DELETE_COLLECTION_WITH_STATEMENT_SKIPPED_METHODS = (
+    "get_collection",
+    "after_get_collection",
+    "delete_objects",
+    "before_delete_objects",
+    "after_delete_objects",
+)
+# insert with `RETURNING` skips these methods, so it's not used when any of them is overridden
+INSERT_WITH_RETURNING_SKIPPED_METHODS = (
+    "build_object_to_create",
+    "before_create_object",
+    "apply_relationships",
+    "save_created_objects",
+)
+# related objects are loaded at once bypassing these methods, so they are loaded one by one when any is overridden
+LOAD_RELATED_OBJECTS_AT_ONCE_SKIPPED_METHODS = (
+    "get_related_object",
+    "get_related_objects_list",
+    "get_related_object_query",
+    "get_related_objects_list_query",
+)
+# max number of bound parameters of one `INSERT` statement (asyncpg and psycopg limit is 32767)
+INSERT_STATEMENT_MAX_PARAMETERS = 32767
+# max number of rows deleted by one statement when whole collection is deleted
+DELETE_COLLECTION_CHUNK_SIZE = 1000
+RelationshipInSchema = Union[BaseJSONAPIRelationshipDataToOneSchema, BaseJSONAPIRelationshipDataToManySchema]
+# related model and id field to ids (objects)
+RelatedIds = Dict[Tuple[Type[TypeModel], str], Set[Any]]
+RelatedObjects = Dict[Tuple[Type[TypeModel], str], Dict[Any, TypeModel]]
+
+
+def get_relationship_path_option(relationship_path: List[InstrumentedAttribute]) -> "Load":
+    """
+    Loader option to configure loading of the last model in the path.
+
+    Loading strategies of the relationships in the path aren't changed.
+
+    :param relationship_path: relationships from the root model.
+    :return: loader option.
+    """
+    option = defaultload(relationship_path[0])
+    for relationship in relationship_path[1:]:
+        option = option.defaultload(relationship)
+    return option
+
+
+@lru_cache(maxsize=SPARSE_FIELDSET_COLUMNS_CACHE_SIZE)
+def get_sparse_fieldset_columns(
+    model: Type[TypeModel],
+    schema: Type[TypeSchema],
+    requested_fields: FrozenSet[str],
+) -> Optional[Tuple[InstrumentedAttribute, ...]]:
+    """
+    Get columns to load for the sparse fieldset.
+
+    Primary and foreign keys are always loaded: they identify the object and load its relationships.
+
+    :param model: sqlalchemy model.
+    :param schema: schema of the resource.
+    :param requested_fields: fields requested by the sparse fieldset.
+    :return: columns, or None if a requested attribute isn't a column (e.g. it's computed from other columns).
+    """
+    mapper = inspect(model)
+    keys = set()
+    for field_name in requested_fields - {IGNORE_ALL_FIELDS_LITERAL, "id"}:
+        # not rendered by this schema
+        if (field := schema.__fields__.get(field_name)) is None:
+            continue
+        if isinstance(field.field_info.extra.get("relationship"), RelationshipInfo):
+            continue
+        if field_name not in mapper.column_attrs:
+            return None
+        keys.add(field_name)
+
+    return tuple(
+        getattr(model, column_property.key)
+        for column_property in mapper.column_attrs
+        if column_property.key in keys
+        or any(column.primary_key or column.foreign_keys for column in column_property.columns)
+    )
 
 
 class SqlalchemyDataLayer(BaseDataLayer):
@@ -63,6 +204,14 @@ class SqlalchemyDataLayer(BaseDataLayer):
         eagerload_includes: bool = True,
         query: Optional["Select"] = None,
         auto_convert_id_to_column_type: bool = True,
+        count_strategy: Optional[CollectionCountStrategy] = None,
+        count_session_maker: Optional[Callable[[], AsyncSession]] = None,
+        stream_session_maker: Optional[Callable[[], AsyncSession]] = None,
+        strict_loading: bool = False,
+        count_statements: bool = False,
+        statement_budget: Optional[int] = None,
+        reuse_written_objects: bool = False,
+        trust_related_ids: bool = False,
         **kwargs: Any,
     ):
         """
@@ -77,6 +226,25 @@ class SqlalchemyDataLayer(BaseDataLayer):
         :param eagerload_includes: Use eagerload feature of sqlalchemy to optimize data retrieval
                                     for include querystring parameter.
         :param query: подготовленный заранее запрос.
+        :param count_strategy: strategy to count collection objects, exact count with subquery by default.
+        :param count_session_maker: session factory, if passed, collection count runs with a new session
+                                    concurrently with the page query (sequentially in atomic operations).
+        :param stream_session_maker: session factory, if passed, streamed collections are read by a new session
+                                     owned by the response body (the request session may be closed before
+                                     the body is sent), otherwise by the request session.
+        :param strict_loading: relationships not listed in include raise on access instead of lazy loading.
+        :param count_statements: count SQL statements executed by the data layer sessions,
+                                 the number is available as `statement_counter.count`.
+        :param statement_budget: max number of SQL statements per request, `StatementBudgetExceeded`
+                                 is raised if exceeded (implies `count_statements`).
+        :param reuse_written_objects: render responses of create from the created objects instead of
+                                      retrieving them again, objects are queried only to load requested includes
+                                      or column attributes expired by flush (server side defaults and onupdate
+                                      values, unless the mapper has `eager_defaults`). Written objects
+                                      aren't expired by commit even if the session has `expire_on_commit`.
+        :param trust_related_ids: don't check that related objects passed in request exist, objects not found
+                                  in the session are linked as primary key only references without loading
+                                  (foreign key constraints report missing ones on flush).
         :param kwargs: initialization parameters of an SqlalchemyDataLayer instance
         """
         super().__init__(
@@ -93,12 +261,27 @@ class SqlalchemyDataLayer(BaseDataLayer):
         self.eagerload_includes_ = eagerload_includes
         self._query = query
         self.auto_convert_id_to_column_type = auto_convert_id_to_column_type
+        self.count_strategy: CollectionCountStrategy = count_strategy or SubqueryCount()
+        self.count_session_maker = count_session_maker
+        self.stream_session_maker = stream_session_maker
         self.transaction: Optional[AsyncSessionTransaction] = None
+        self.strict_loading = strict_loading
+        self.reuse_written_objects = reuse_written_objects
+        self.trust_related_ids = trust_related_ids
+        # resource types modified in atomic transaction, cached responses are invalidated on commit
+        self.modified_resource_types: Set[str] = set()
+        self.statement_counter: Optional[StatementCounter] = None
+        if count_statements or statement_budget is not None:
+            self.statement_counter = StatementCounter(budget=statement_budget)
+            self.statement_counter.watch(session)
 
     async def atomic_start(self, previous_dl: Optional["SqlalchemyDataLayer"] = None):
         self.is_atomic = True
         if previous_dl:
             self.session = previous_dl.session
+            self.modified_resource_types = previous_dl.modified_resource_types
+            if self.statement_counter is not None:
+                self.statement_counter.watch(self.session)
             if previous_dl.transaction:
                 self.transaction = previous_dl.transaction
                 return
@@ -109,14 +292,36 @@ class SqlalchemyDataLayer(BaseDataLayer):
     async def atomic_end(self, success: bool = True):
         if success:
             await self.transaction.commit()
+            await self.invalidate_cached_responses(self.modified_resource_types)
         else:
             await self.transaction.rollback()
+        self.modified_resource_types.clear()
 
     async def save(self):
         if self.is_atomic:
             await self.session.flush()
+            self.modified_resource_types.add(self.type_)
+        elif self.reuse_written_objects:
+            await self.commit_keeping_written_objects()
+            await self.invalidate_cached_responses([self.type_])
         else:
             await self.session.commit()
+            await self.invalidate_cached_responses([self.type_])
+
+    async def commit_keeping_written_objects(self):
+        """
+        Commit without expiring objects of the session, so written objects are rendered without a new query.
+
+        Values generated by the database are loaded by the write itself: `RETURNING` of statements
+        or flush of mappers with `eager_defaults`, otherwise flush expires them.
+        """
+        sync_session = self.session.sync_session
+        expire_on_commit = sync_session.expire_on_commit
+        sync_session.expire_on_commit = False
+        try:
+            await self.session.commit()
+        finally:
+            sync_session.expire_on_commit = expire_on_commit
 
     def prepare_id_value(self, col: InstrumentedAttribute, value: Any) -> Any:
         """
@@ -164,7 +369,8 @@ class SqlalchemyDataLayer(BaseDataLayer):
         """
         try:
             hasattr(obj, relation_name)
-        except MissingGreenlet:
+        except (MissingGreenlet, InvalidRequestError):
+            # not loaded relationship: lazy load isn't possible with asyncio or is disabled (raiseload)
             raise InternalServerError(
                 detail=(
                     f"Error of loading the {relation_name!r} relationship. "
@@ -173,14 +379,175 @@ class SqlalchemyDataLayer(BaseDataLayer):
                 parameter="include",
             )
 
-    async def get_related_data_to_link(
+    def iter_relationships_to_apply(
+        self,
+        data: BaseJSONAPIItemInSchema,
+    ) -> Iterator[Tuple[str, RelationshipInfo, Type[TypeModel], RelationshipInSchema]]:
+        """
+        Relationships passed in request with their info and related model
+
+        :param data: the data validated by pydantic.
+        :return: relationship name, info, related model and data passed in request.
+        """
+        relationships: "PydanticBaseModel" = data.relationships
+        if relationships is None:
+            return
+
+        schema_fields = self.schema.__fields__ or {}
+        for relation_name, relationship_in in relationships:
+            if relationship_in is None:
+                continue
+
+            field = schema_fields.get(relation_name)
+            if field is None:
+                # should not happen if schema is built properly
+                # there may be an error if schema and schema_in are different
+                log.warning("field for %s in schema %s not found", relation_name, self.schema.__name__)
+                continue
+
+            if "relationship" not in field.field_info.extra:
+                log.warning(
+                    "relationship info for %s in schema %s extra not found",
+                    relation_name,
+                    self.schema.__name__,
+                )
+                continue
+
+            relationship_info: RelationshipInfo = field.field_info.extra["relationship"]
+            related_model = get_related_model_cls(self.model, relation_name)
+            yield relation_name, relationship_info, related_model, relationship_in
+
+    def collect_related_ids(self, data_list: Iterable[BaseJSONAPIItemInSchema]) -> RelatedIds:
+        """
+        Ids of related objects passed in request, by related model and id field
+
+        :param data_list: the data of each written object validated by pydantic.
+        :return: prepared ids by related model and id field.
+        """
+        related_ids: RelatedIds = defaultdict(set)
+        for data in data_list:
+            for _, relationship_info, related_model, relationship_in in self.iter_relationships_to_apply(data):
+                if not relationship_in.data:
+                    continue
+
+                id_field = getattr(related_model, relationship_info.id_field_name)
+                items = relationship_in.data if relationship_info.many else [relationship_in.data]
+                related_ids[related_model, relationship_info.id_field_name].update(
+                    self.prepare_id_value(id_field, item.id) for item in items
+                )
+
+        return related_ids
+
+    def get_related_object_reference(self, related_model: Type[TypeModel], id_value: Any) -> TypeModel:
+        """
+        Object with the primary key only, attached to the session without loading its row.
+
+        :param related_model: SQLA ORM model class.
+        :param id_value: primary key value.
+        :return: a persistent object, other attributes are loaded on access.
+        """
+        mapper = inspect(related_model)
+        reference = related_model(**{mapper.get_property_by_column(mapper.primary_key[0]).key: id_value})
+        make_transient_to_detached(reference)
+        self.session.add(reference)
+        return reference
+
+    def can_load_related_objects_at_once(self) -> bool:
+        """
+        Check if related objects may be loaded at once with `load_related_objects`.
+
+        Related objects are loaded one by one with `get_related_object` and `get_related_objects_list`
+        when any of these methods or their query builders are overridden (e.g. for scoping).
+        """
+        return not self.has_overridden_methods(LOAD_RELATED_OBJECTS_AT_ONCE_SKIPPED_METHODS)
+
+    async def load_related_objects(self, related_ids: RelatedIds) -> RelatedObjects:
+        """
+        Load related objects with at most one query per related model.
+
+        Objects found in the session identity map (by primary key) are not queried,
+        unless `get_related_model_query_base` is overridden (query may scope related objects).
+        With `trust_related_ids` the missing ones are attached as primary key only references, not scoped.
+
+        :param related_ids: prepared ids by related model and id field.
+        :return: related objects by related model and id field, then by id.
+        """
+        # objects linked without loading are checked against identity map anyway
+        use_identity_map = self.trust_related_ids or not self.has_overridden_methods(["get_related_model_query_base"])
+        identity_map = self.session.sync_session.identity_map
+        related_objects: RelatedObjects = {}
+        for (related_model, related_id_field), ids in related_ids.items():
+            objects_by_id = related_objects[related_model, related_id_field] = {}
+            mapper = inspect(related_model)
+            by_primary_key = (
+                len(mapper.primary_key) == 1
+                and mapper.get_property_by_column(mapper.primary_key[0]).key == related_id_field
+            )
+            ids_to_load = set(ids)
+            if by_primary_key and use_identity_map:
+                for id_value in ids:
+                    if (related_object := identity_map.get(identity_key(related_model, id_value))) is not None:
+                        objects_by_id[id_value] = related_object
+                        ids_to_load.discard(id_value)
+
+                if self.trust_related_ids:
+                    for id_value in ids_to_load:
+                        objects_by_id[id_value] = self.get_related_object_reference(related_model, id_value)
+                    continue
+
+            if not ids_to_load:
+                continue
+
+            id_field = getattr(related_model, related_id_field)
+            stmt: "Select" = self.get_related_model_query_base(related_model)
+            for related_object in (await self.session.execute(stmt.where(id_field.in_(ids_to_load)))).scalars():
+                objects_by_id[getattr(related_object, related_id_field)] = related_object
+
+        return related_objects
+
+    def get_related_data_to_link(
+        self,
+        related_model: TypeModel,
+        relationship_info: RelationshipInfo,
+        relationship_in: RelationshipInSchema,
+        related_objects: Dict[Any, TypeModel],
+    ) -> Optional[ModelTypeOneOrMany]:
+        """
+        Picks object or objects to link from loaded related objects
+
+        :param related_model:
+        :param relationship_info:
+        :param relationship_in:
+        :param related_objects: loaded objects of the related model by id
+        """
+        if not relationship_in.data:
+            return [] if relationship_info.many else None
+
+        related_id_field = relationship_info.id_field_name
+        id_field = getattr(related_model, related_id_field)
+        if relationship_info.many:
+            assert isinstance(relationship_in, BaseJSONAPIRelationshipDataToManySchema)
+            ids = [self.prepare_id_value(id_field, r.id) for r in relationship_in.data]
+            if not_found_ids := set(ids).difference(related_objects):
+                msg = f"Objects for {related_model.__name__} with ids: {not_found_ids} not found"
+                raise RelatedObjectNotFound(detail=msg, pointer="/data")
+
+            # same object may be passed more than once
+            return list({id_value: related_objects[id_value] for id_value in ids}.values())
+
+        assert isinstance(relationship_in, BaseJSONAPIRelationshipDataToOneSchema)
+        id_value = relationship_in.data.id
+        if (related_object := related_objects.get(self.prepare_id_value(id_field, id_value))) is None:
+            msg = f"{related_model.__name__}.{related_id_field}: {id_value} not found"
+            raise RelatedObjectNotFound(msg)
+
+        return related_object
+
+    async def fetch_related_data_to_link(
         self,
         related_model: TypeModel,
         relationship_info: RelationshipInfo,
-        relationship_in: Union[
-            BaseJSONAPIRelationshipDataToOneSchema,
-            BaseJSONAPIRelationshipDataToManySchema,
-        ],
+        relationship_in: RelationshipInSchema,
     ) -> Optional[ModelTypeOneOrMany]:
         """
         Retrieves object or objects to link from database
@@ -212,70 +579,78 @@ class SqlalchemyDataLayer(BaseDataLayer):
         obj: TypeModel,
         data_create: BaseJSONAPIItemInSchema,
         action_trigger: ActionTrigger,
+        related_objects: Optional[RelatedObjects] = None,
     ) -> None:
         """
         Handles relationships passed in request
 
+        Related objects are loaded at once, with at most one query per related model
+        (one by one if `can_load_related_objects_at_once` is false).
+
         :param obj:
         :param data_create:
         :param action_trigger: indicates which one operation triggered relationships applying
+        :param related_objects: related objects loaded in advance (e.g. for several objects at once)
         :return:
         """
-        relationships: "PydanticBaseModel" = data_create.relationships
-        if relationships is None:
+        relationships_to_apply = list(self.iter_relationships_to_apply(data_create))
+        if not relationships_to_apply:
             return
 
-        schema_fields = self.schema.__fields__ or {}
-        for relation_name, relationship_in in relationships:
-            if relationship_in is None:
-                continue
-
-            field = schema_fields.get(relation_name)
-            if field is None:
-                # should not happen if schema is built properly
-                # there may be an error if schema and schema_in are different
-                log.warning("field for %s in schema %s not found", relation_name, self.schema.__name__)
-                continue
-
-            if "relationship" not in field.field_info.extra:
-                log.warning(
-                    "relationship info for %s in schema %s extra not found",
-                    relation_name,
-                    self.schema.__name__,
+        load_at_once = self.can_load_related_objects_at_once()
+        if related_objects is None and load_at_once:
+            related_objects = await self.load_related_objects(self.collect_related_ids([data_create]))
+        for relation_name, relationship_info, related_model, relationship_in in relationships_to_apply:
+            if load_at_once:
+                related_data = self.get_related_data_to_link(
+                    related_model=related_model,
+                    relationship_info=relationship_info,
+                    relationship_in=relationship_in,
+                    related_objects=related_objects.get((related_model, relationship_info.id_field_name), {}),
+                )
+            else:
+                related_data = await self.fetch_related_data_to_link(
+                    related_model=related_model,
+                    relationship_info=relationship_info,
+                    relationship_in=relationship_in,
                 )
-                continue
-
-            relationship_info: RelationshipInfo = field.field_info.extra["relationship"]
-            related_model = get_related_model_cls(type(obj), relation_name)
-            related_data = await self.get_related_data_to_link(
-                related_model=related_model,
-                relationship_info=relationship_info,
-                relationship_in=relationship_in,
-            )
 
             await self.check_object_has_relationship_or_raise(obj, relation_name)
             await self.link_relationship_object(obj, relation_name, related_data, action_trigger)
 
-    async def create_object(self, data_create: BaseJSONAPIItemInSchema, view_kwargs: dict) -> TypeModel:
+    async def build_object_to_create(
+        self,
+        data_create: BaseJSONAPIItemInSchema,
+        view_kwargs: dict,
+        related_objects: Optional[RelatedObjects] = None,
+    ) -> Tuple[TypeModel, dict]:
         """
-        Create an object through sqlalchemy.
+        Build a new object (not added to the session yet) with its relationships.
 
         :param data_create: the data validated by pydantic.
         :param view_kwargs: kwargs from the resource view.
-        :return:
+        :param related_objects: related objects loaded in advance.
+        :return: the object and model kwargs it's built with.
         """
-        log.debug("Create object with data %s", data_create)
         # todo: pydantic v2 model_dump()
         model_kwargs = data_create.attributes.dict()
         model_kwargs = self._apply_client_generated_id(data_create, model_kwargs=model_kwargs)
         await self.before_create_object(model_kwargs=model_kwargs, view_kwargs=view_kwargs)
 
         obj = self.model(**model_kwargs)
-        await self.apply_relationships(obj, data_create, action_trigger="create")
+        await self.apply_relationships(obj, data_create, action_trigger="create", related_objects=related_objects)
 
-        self.session.add(obj)
+        return obj, model_kwargs
+
+    @asynccontextmanager
+    async def create_errors_handled(self, data_create: Any) -> AsyncIterator[None]:
+        """
+        Convert errors of objects creation to JSON:API errors.
+
+        :param data_create: the data objects are created with, for logs.
+        """
         try:
-            await self.save()
+            yield
         except IntegrityError:
             log.exception("Could not create object with data create %s", data_create)
             msg = "Object creation error"
@@ -290,10 +665,171 @@ class SqlalchemyDataLayer(BaseDataLayer):
             msg = f"Object creation error: {e}"
             raise HTTPException(msg, pointer="/data")
 
+    async def save_created_objects(self, data_create: Any):
+        """
+        Save objects added to the session.
+
+        :param data_create: the data objects are created with, for logs.
+        """
+        async with self.create_errors_handled(data_create):
+            await self.save()
+
+    async def create_object(self, data_create: BaseJSONAPIItemInSchema, view_kwargs: dict) -> TypeModel:
+        """
+        Create an object through sqlalchemy.
+
+        :param data_create: the data validated by pydantic.
+        :param view_kwargs: kwargs from the resource view.
+        :return:
+        """
+        log.debug("Create object with data %s", data_create)
+        obj, model_kwargs = await self.build_object_to_create(data_create, view_kwargs)
+
+        self.session.add(obj)
+        await self.save_created_objects(data_create)
+
         await self.after_create_object(obj=obj, model_kwargs=model_kwargs, view_kwargs=view_kwargs)
 
         return obj
 
+    async def create_objects(
+        self,
+        data_create_list: List[BaseJSONAPIItemInSchema],
+        view_kwargs: dict,
+    ) -> List[TypeModel]:
+        """
+        Create objects through sqlalchemy with a single save.
+
+        Objects are inserted with multi-row `INSERT ... RETURNING` statements when possible,
+        see `can_insert_with_returning`. Otherwise they are added to the session and inserted by the flush,
+        SQLAlchemy 1.4 sends an `INSERT` per object then (psycopg2 batches them with `executemany_mode`).
+
+        :param data_create_list: the data of each object validated by pydantic.
+        :param view_kwargs: kwargs from the resource view.
+        :return: created objects in the same order.
+        """
+        log.debug("Create %s objects", len(data_create_list))
+        if self.can_insert_with_returning(data_create_list):
+            return await self.insert_objects(data_create_list, view_kwargs)
+
+        # related objects of all the objects are loaded at once
+        related_objects = None
+        if self.can_load_related_objects_at_once():
+            related_objects = await self.load_related_objects(self.collect_related_ids(data_create_list))
+        # objects built before aren't in the session yet, queries of related objects must not flush them
+        with self.session.sync_session.no_autoflush:
+            created = [
+                await self.build_object_to_create(data_create, view_kwargs, related_objects=related_objects)
+                for data_create in data_create_list
+            ]
+
+        self.session.add_all([obj for obj, _ in created])
+        await self.save_created_objects(data_create_list)
+
+        for obj, model_kwargs in created:
+            await self.after_create_object(obj=obj, model_kwargs=model_kwargs, view_kwargs=view_kwargs)
+
+        return [obj for obj, _ in created]
+
+    def can_insert_with_returning(self, data_create_list: List[BaseJSONAPIItemInSchema]) -> bool:
+        """
+        Check if objects can be created with multi-row `INSERT ... RETURNING` statements.
+
+        Statements are used when objects have no relationships, all the passed attributes are columns
+        of the model table, model has no custom constructor, validators or insert events
+        and build, before create and save methods are not overridden.
+
+        Rows returned by `INSERT ... RETURNING` may come in any order (PostgreSQL doesn't guarantee
+        the order of values), they are matched to objects by primary key. So statements are used only
+        if primary key of each object is generated by client, otherwise objects are inserted by the flush.
+
+        :param data_create_list: the data of each object validated by pydantic.
+        :return:
+        """
+        if self.has_overridden_methods(INSERT_WITH_RETURNING_SKIPPED_METHODS):
+            return False
+
+        mapper = inspect(self.model)
+        if (
+            mapper.inherits is not None
+            or mapper.validators
+            or mapper.class_manager.original_init is not _declarative_constructor
+            or mapper.dispatch.before_insert
+            or mapper.dispatch.after_insert
+        ):
+            return False
+
+        primary_key_names = [mapper.get_property_by_column(column).key for column in mapper.primary_key]
+        for data_create in data_create_list:
+            if next(self.iter_relationships_to_apply(data_create), None) is not None:
+                return False
+            if any(field_name not in mapper.column_attrs for field_name in data_create.attributes.__fields__):
+                return False
+            model_kwargs = self._apply_client_generated_id(data_create, model_kwargs=data_create.attributes.dict())
+            if any(model_kwargs.get(name) is None for name in primary_key_names):
+                return False
+
+        dialect = self.session.sync_session.get_bind(mapper=mapper).dialect
+        return self.supports_returning("insert") and dialect.supports_multivalues_insert
+
+    async def insert_objects(
+        self,
+        data_create_list: List[BaseJSONAPIItemInSchema],
+        view_kwargs: dict,
+    ) -> List[TypeModel]:
+        """
+        Create objects with multi-row `INSERT ... RETURNING` statements.
+
+        Rows are inserted in chunks limited by the number of bound parameters.
+        Rows with different sets of columns are inserted by different statements.
+        Returned rows are matched to objects by client generated primary key.
+
+        :param data_create_list: the data of each object validated by pydantic.
+        :param view_kwargs: kwargs from the resource view.
+        :return: created objects in the same order.
+        """
+        mapper = inspect(self.model)
+        model_kwargs_list = []
+        for data_create in data_create_list:
+            # todo: pydantic v2 model_dump()
+            model_kwargs = data_create.attributes.dict()
+            model_kwargs_list.append(self._apply_client_generated_id(data_create, model_kwargs=model_kwargs))
+
+        # rows of one statement must have the same columns
+        rows_by_keys: Dict[FrozenSet[str], List[Tuple[int, dict]]] = defaultdict(list)
+        for position, model_kwargs in enumerate(model_kwargs_list):
+            row = {mapper.column_attrs[name].columns[0].key: value for name, value in model_kwargs.items()}
+            rows_by_keys[frozenset(row)].append((position, row))
+
+        columns = mapper.local_table.columns
+        chunk_size = max(1, INSERT_STATEMENT_MAX_PARAMETERS // len(columns))
+
+        def get_row_key(values: Iterable[Any]) -> Tuple[str, ...]:
+            # client generated ids may be passed as strings
+            return tuple(str(value) for value in values)
+
+        objects: List[Optional[TypeModel]] = [None] * len(model_kwargs_list)
+        async with self.create_errors_handled(data_create_list):
+            for rows in rows_by_keys.values():
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start : start + chunk_size]
+                    stmt = insert(self.model).values([row for _, row in chunk]).returning(*columns)
+                    orm_stmt = select(self.model).from_statement(stmt).execution_options(populate_existing=True)
+                    positions = {
+                        get_row_key(row[column.key] for column in mapper.primary_key): position
+                        for position, row in chunk
+                    }
+                    # order of returned rows isn't guaranteed
+                    for obj in (await self.session.execute(orm_stmt)).scalars():
+                        objects[positions[get_row_key(mapper.primary_key_from_instance(obj))]] = obj
+
+            await self.save()
+
+        for obj, model_kwargs in zip(objects, model_kwargs_list):
+            await self.after_create_object(obj=obj, model_kwargs=model_kwargs, view_kwargs=view_kwargs)
+
+        return objects
+
     def get_object_id_field_name(self):
         """
         compound key may cause errors
@@ -315,13 +851,17 @@ class SqlalchemyDataLayer(BaseDataLayer):
         filter_field = self.get_object_id_field()
         filter_value = view_kwargs[self.url_id_field]
 
-        query = self.retrieve_object_query(view_kwargs, filter_field, filter_value)
+        with self.timings.measure(RequestPhase.QUERY):
+            query = self.retrieve_object_query(view_kwargs, filter_field, filter_value)
 
-        if qs is not None:
-            query = self.eagerload_includes(query, qs)
+            if qs is not None:
+                query = self.eagerload_includes(query, qs)
+                if self.load_only_requested_fields:
+                    query = self.load_only_requested_columns(query, qs)
 
         try:
-            obj = (await self.session.execute(query)).scalar_one()
+            with self.timings.measure(RequestPhase.FETCH):
+                obj = (await self.session.execute(query)).scalar_one()
         except NoResultFound:
             msg = f"Resource {self.model.__name__} `{filter_value}` not found"
             raise ObjectNotFound(
@@ -331,55 +871,373 @@ class SqlalchemyDataLayer(BaseDataLayer):
 
         await self.after_get_object(obj, view_kwargs)
 
-        return obj
+        return obj
+
+    async def get_objects(
+        self,
+        view_kwargs: dict,
+        ids: List[Any],
+        qs: Optional[QueryStringManager] = None,
+    ) -> List[TypeModel]:
+        """
+        Retrieve objects by ids with a single query.
+
+        :param view_kwargs: kwargs from the resource view.
+        :param ids: ids of the objects.
+        :param qs:
+        :return: objects in the same order as ids.
+        """
+        filter_field = self.get_object_id_field()
+        with self.timings.measure(RequestPhase.QUERY):
+            values = [self.prepare_id_value(filter_field, id_value) for id_value in ids]
+            query = self.query(view_kwargs).where(filter_field.in_(values))
+
+            if qs is not None:
+                query = self.eagerload_includes(query, qs)
+                if self.load_only_requested_fields:
+                    query = self.load_only_requested_columns(query, qs)
+
+        with self.timings.measure(RequestPhase.FETCH):
+            objects = (await self.session.execute(query)).scalars().all()
+
+        objects_by_id = {self.get_object_id(obj): obj for obj in objects}
+        if missing_ids := [value for value in values if value not in objects_by_id]:
+            msg = f"Resources {self.model.__name__} {missing_ids} not found"
+            raise ObjectNotFound(msg, parameter=self.url_id_field)
+
+        return [objects_by_id[value] for value in values]
+
+    def can_reuse_written_objects(self, qs: Optional[QueryStringManager]) -> bool:
+        return self.reuse_written_objects and not (qs is not None and qs.include)
+
+    async def refresh_expired_attributes(self, objects: List[TypeModel]):
+        """
+        Load column attributes expired by flush or commit with a single query.
+
+        Rows of the query populate expired attributes of the objects in the identity map,
+        so objects can be serialized without lazy loads.
+
+        :param objects: objects of the data layer model.
+        """
+        mapper = inspect(self.model)
+        column_keys = {column_property.key for column_property in mapper.column_attrs}
+        # identity doesn't load expired primary key
+        expired_ids = [
+            state.identity[0]
+            for state in map(inspect, objects)
+            if not state.expired_attributes.isdisjoint(column_keys)
+        ]
+        if not expired_ids:
+            return
+
+        with self.timings.measure(RequestPhase.FETCH):
+            await self.session.execute(select(self.model).where(mapper.primary_key[0].in_(expired_ids)))
+
+    async def get_created_object(
+        self,
+        obj: TypeModel,
+        view_kwargs: dict,
+        qs: Optional[QueryStringManager] = None,
+    ) -> TypeModel:
+        """
+        Get created object to render the response.
+
+        :param obj: created object.
+        :param view_kwargs: kwargs from the resource view.
+        :param qs:
+        :return: the created object itself if `reuse_written_objects` is set and there are no includes.
+        """
+        if not self.can_reuse_written_objects(qs):
+            return await super().get_created_object(obj, view_kwargs, qs)
+
+        await self.refresh_expired_attributes([obj])
+        return obj
+
+    async def get_created_objects(
+        self,
+        objects: List[TypeModel],
+        view_kwargs: dict,
+        qs: Optional[QueryStringManager] = None,
+    ) -> List[TypeModel]:
+        """
+        Get created objects to render the response.
+
+        :param objects: created objects.
+        :param view_kwargs: kwargs from the resource view.
+        :param qs:
+        :return: the created objects themselves if `reuse_written_objects` is set and there are no includes.
+        """
+        if not self.can_reuse_written_objects(qs):
+            return await super().get_created_objects(objects, view_kwargs, qs)
+
+        await self.refresh_expired_attributes(objects)
+        return objects
+
+    async def get_collection_count(
+        self,
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+        session: Optional[AsyncSession] = None,
+    ) -> Optional[int]:
+        """
+        Returns number of elements for this collection
+
+        :param query: SQLAlchemy query
+        :param qs: QueryString
+        :param view_kwargs: view kwargs
+        :param session: session to count with, data layer session by default
+        :return: number of elements or None if count strategy counts them after the page is fetched
+        """
+        if self.disable_collection_count is True or not qs.pagination.count:
+            return self.default_collection_count
+
+        with self.timings.measure(RequestPhase.COUNT):
+            return await self.count_strategy.count(self, query, qs, view_kwargs, session or self.session)
+
+    async def get_collection_count_concurrently(
+        self,
+        query: "Select",
+        qs: QueryStringManager,
+        view_kwargs: dict,
+    ) -> Optional[int]:
+        """
+        Count collection objects with a new session (another pooled connection).
+
+        So the count runs concurrently with the page query.
+
+        :param query: SQLAlchemy query
+        :param qs: QueryString
+        :param view_kwargs: view kwargs
+        :return:
+        """
+        async with self.count_session_maker() as session:
+            if self.statement_counter is not None:
+                self.statement_counter.watch(session)
+            return await self.get_collection_count(query, qs, view_kwargs, session=session)
+
+    def can_count_concurrently(self) -> bool:
+        """
+        Check if collection can be counted with a new session.
+
+        Objects created in the transaction are not visible from another connection,
+        so atomic operations are counted sequentially on the same session.
+
+        :return:
+        """
+        return self.count_session_maker is not None and not self.is_atomic and self.count_strategy.counts_before_fetch
+
+    async def get_collection_query(self, qs: QueryStringManager, view_kwargs: dict) -> "Select":
+        """
+        Prepare filtered and sorted query for collection.
+
+        :param qs: a querystring manager to retrieve information from url.
+        :param view_kwargs: kwargs from the resource view.
+        :return: the query.
+        """
+        await self.before_get_collection(qs, view_kwargs)
+
+        query = self.query(view_kwargs)
+
+        if filters_qs := qs.filters:
+            query = self.filter_query(query, filters_qs)
+
+        # keyset pagination sorts query by itself
+        if (sorts := qs.get_sorts(schema=self.schema)) and not qs.pagination.is_cursor:
+            query = self.sort_query(query, sorts)
+
+        return query
+
+    def get_collection_page_query(self, query: "Select", qs: QueryStringManager) -> "Select":
+        """
+        Prepare query for a page of collection.
+
+        :param query: filtered and sorted query.
+        :param qs: a querystring manager to retrieve information from url.
+        :return: the query for the requested page.
+        """
+        if self.eagerload_includes_:
+            query = self.eagerload_includes(query, qs)
+
+        keyset = None
+        if (pagination := qs.pagination).is_cursor:
+            keyset = self.create_keyset(qs.get_sorts(schema=self.schema))
+
+        if self.load_only_requested_fields:
+            # cursors are made of keyset values of the page objects
+            query = self.load_only_requested_columns(query, qs, extra_columns=[key.column for key in keyset or ()])
+
+        if keyset is not None:
+            return self.paginate_query_by_cursor(query, pagination, keyset)
+
+        return self.paginate_query(query, pagination)
+
+    async def execute_collection_page_query(self, page_query: "Select") -> "Result":
+        """
+        Fetch a page of collection.
+
+        :param page_query: query for the requested page.
+        :return: result of the query.
+        """
+        with self.timings.measure(RequestPhase.FETCH):
+            return await self.session.execute(page_query)
+
+    async def get_collection(self, qs: QueryStringManager, view_kwargs: Optional[dict] = None) -> Tuple[int, list]:
+        """
+        Retrieve a collection of objects through sqlalchemy.
+
+        :param qs: a querystring manager to retrieve information from url.
+        :param view_kwargs: kwargs from the resource view.
+        :return: the number of object and the list of objects.
+        """
+        view_kwargs = view_kwargs or {}
+
+        with self.timings.measure(RequestPhase.QUERY):
+            query = await self.get_collection_query(qs, view_kwargs)
+            page_query = self.get_collection_page_query(query, qs)
+
+        if self.can_count_concurrently():
+            objects_count, result = await asyncio.gather(
+                self.get_collection_count_concurrently(query, qs, view_kwargs),
+                self.execute_collection_page_query(page_query),
+            )
+        else:
+            objects_count = await self.get_collection_count(query, qs, view_kwargs)
+
+            if objects_count is None:
+                page_query = self.count_strategy.prepare_page_query(page_query, qs)
+
+            result = await self.execute_collection_page_query(page_query)
+
+        collection, page_count = self.count_strategy.read_page(result)
+
+        if objects_count is None:
+            with self.timings.measure(RequestPhase.COUNT):
+                objects_count = await self.count_strategy.count_page(
+                    self,
+                    query,
+                    qs,
+                    view_kwargs,
+                    collection,
+                    page_count,
+                )
 
-    async def get_collection_count(self, query: "Select", qs: QueryStringManager, view_kwargs: dict) -> int:
-        """
-        Returns number of elements for this collection
+        if (pagination := qs.pagination).is_cursor:
+            keyset = self.create_keyset(qs.get_sorts(schema=self.schema))
+            collection = self.paginate_collection_by_cursor(collection, pagination, keyset)
 
-        :param query: SQLAlchemy query
-        :param qs: QueryString
-        :param view_kwargs: view kwargs
-        :return:
-        """
-        if self.disable_collection_count is True:
-            return self.default_collection_count
+        collection = await self.after_get_collection(collection, qs, view_kwargs)
 
-        count_query = select(func.count(distinct(column("id")))).select_from(query.subquery())
-        return (await self.session.execute(count_query)).scalar_one()
+        return objects_count, list(collection)
 
-    async def get_collection(self, qs: QueryStringManager, view_kwargs: Optional[dict] = None) -> Tuple[int, list]:
+    async def get_collection_stream(
+        self,
+        qs: QueryStringManager,
+        view_kwargs: Optional[dict] = None,
+        yield_per: int = 100,
+    ) -> Tuple[int, AsyncIterator[List[TypeModel]]]:
         """
-        Retrieve a collection of objects through sqlalchemy.
+        Retrieve a collection of objects through sqlalchemy by partitions (server side cursor).
+
+        Includes are loaded for each partition separately.
+        `after_get_collection` is called for each partition.
+        Partitions are read by a session of `stream_session_maker`, closed when the iterator is exhausted.
+        Without it the request session is used, unless FastAPI closes it before the response body is sent
+        (FastAPI >= 0.106): then the whole page is fetched beforehand and yielded as one partition.
 
         :param qs: a querystring manager to retrieve information from url.
         :param view_kwargs: kwargs from the resource view.
-        :return: the number of object and the list of objects.
+        :param yield_per: number of objects fetched at once.
+        :return: the number of objects and an async iterator over partitions of objects.
         """
         view_kwargs = view_kwargs or {}
 
-        await self.before_get_collection(qs, view_kwargs)
+        if qs.pagination.is_cursor:
+            msg = "Cursor pagination is not supported for streamed collections"
+            raise BadRequest(msg, parameter="page")
 
-        query = self.query(view_kwargs)
+        with self.timings.measure(RequestPhase.QUERY):
+            query = await self.get_collection_query(qs, view_kwargs)
 
-        if filters_qs := qs.filters:
-            query = self.filter_query(query, filters_qs)
+        # meta is written at the end of the stream, but it's built beforehand
+        if (objects_count := await self.get_collection_count(query, qs, view_kwargs)) is None:
+            with self.timings.measure(RequestPhase.COUNT):
+                objects_count = await count_query(self.session, query)
 
-        if sorts := qs.get_sorts(schema=self.schema):
-            query = self.sort_query(query, sorts)
+        with self.timings.measure(RequestPhase.QUERY):
+            query = self.get_collection_page_query(query, qs)
 
-        objects_count = await self.get_collection_count(query, qs, view_kwargs)
+        if self.stream_session_maker is None and DEPENDENCIES_EXIT_BEFORE_RESPONSE:
+            # request session is closed before the response body is sent, so the page is fetched beforehand
+            with self.timings.measure(RequestPhase.FETCH):
+                collection = (await self.session.execute(query)).scalars().all()
+            page = list(await self.after_get_collection(collection, qs, view_kwargs))
 
-        if self.eagerload_includes_:
-            query = self.eagerload_includes(query, qs)
+            async def iter_page() -> AsyncIterator[List[TypeModel]]:
+                yield page
 
-        query = self.paginate_query(query, qs.pagination)
+            return objects_count, iter_page()
 
-        collection = (await self.session.execute(query)).unique().scalars().all()
+        session_stack = AsyncExitStack()
+        session = self.session
+        if self.stream_session_maker is not None:
+            session = await session_stack.enter_async_context(self.stream_session_maker())
+            if self.statement_counter is not None:
+                self.statement_counter.watch(session)
 
-        collection = await self.after_get_collection(collection, qs, view_kwargs)
+        # the query is started beforehand, so its errors are reported before the response
+        try:
+            result = await session.stream(query.execution_options(yield_per=yield_per))
+        except BaseException:
+            await session_stack.aclose()
+            raise
 
-        return objects_count, list(collection)
+        async def iter_partitions() -> AsyncIterator[List[TypeModel]]:
+            async with session_stack:
+                async for partition in result.scalars().partitions():
+                    yield list(await self.after_get_collection(partition, qs, view_kwargs))
+
+        return objects_count, iter_partitions()
+
+    @asynccontextmanager
+    async def update_errors_handled(
+        self,
+        data_update: BaseJSONAPIItemInSchema,
+        view_kwargs: dict,
+    ) -> AsyncIterator[None]:
+        """
+        Convert database errors of update statements to API errors.
+
+        :param data_update: the data validated by pydantic, for logs.
+        :param view_kwargs: kwargs from the resource view.
+        """
+        try:
+            yield
+        except IntegrityError:
+            log.exception("Could not update object with data update %s", data_update)
+            msg = "Object update error"
+            raise BadRequest(
+                msg,
+                pointer="/data",
+                meta={
+                    "type": self.type_,
+                    "id": view_kwargs.get(self.url_id_field),
+                },
+            )
+        except DBAPIError as e:
+            await self.session.rollback()
+
+            err_message = f"Got an error {e.__class__.__name__} during updating obj {view_kwargs} data in DB"
+            log.error(err_message, exc_info=e)
+
+            raise InternalServerError(
+                detail=err_message,
+                pointer="/data",
+                meta={
+                    "type": self.type_,
+                    "id": view_kwargs.get(self.url_id_field),
+                },
+            )
 
     async def update_object(
         self,
@@ -414,23 +1272,123 @@ class SqlalchemyDataLayer(BaseDataLayer):
             if old_value != new_value:
                 setattr(obj, field_name, new_value)
                 has_updated = True
-        try:
+        async with self.update_errors_handled(data_update, view_kwargs):
             await self.save()
-        except IntegrityError:
-            log.exception("Could not update object with data update %s", data_update)
-            msg = "Object update error"
-            raise BadRequest(
-                msg,
-                pointer="/data",
-                meta={
-                    "type": self.type_,
-                    "id": view_kwargs.get(self.url_id_field),
-                },
-            )
+
+        if self.reuse_written_objects:
+            await self.refresh_expired_attributes([obj])
+
+        await self.after_update_object(obj=obj, model_kwargs=new_data, view_kwargs=view_kwargs)
+
+        return has_updated
+
+    def has_overridden_methods(self, method_names: Iterable[str]) -> bool:
+        layer_cls = type(self)
+        return any(
+            getattr(layer_cls, method_name) is not getattr(SqlalchemyDataLayer, method_name)
+            for method_name in method_names
+        )
+
+    def supports_returning(self, statement_type: Literal["insert", "update", "delete"]) -> bool:
+        dialect = self.session.sync_session.get_bind(mapper=inspect(self.model)).dialect
+        # `insert_returning`, `update_returning` and `delete_returning` since SQLAlchemy 2.0, `full_returning` in 1.4
+        return bool(getattr(dialect, f"{statement_type}_returning", getattr(dialect, "full_returning", False)))
+
+    def can_update_with_returning(
+        self,
+        data_update: BaseJSONAPIItemInSchema,
+        qs: Optional[QueryStringManager] = None,
+    ) -> bool:
+        """
+        Check if object can be updated with a single `UPDATE ... RETURNING` statement.
+
+        Statement is used when request has no includes and relationships, all the passed attributes
+        are columns of the model table and retrieve and update hooks are not overridden.
+
+        :param data_update: the data validated by pydantic.
+        :param qs:
+        :return:
+        """
+        if (qs is not None and qs.include) or self._query is not None:
+            return False
+
+        if self.has_overridden_methods(UPDATE_WITH_RETURNING_SKIPPED_METHODS):
+            return False
+
+        mapper = inspect(self.model)
+        if mapper.inherits is not None or next(self.iter_relationships_to_apply(data_update), None) is not None:
+            return False
+
+        for field_name in data_update.attributes.dict(exclude_unset=True):
+            # json type has no equality operator to skip unchanged values
+            if field_name not in mapper.column_attrs or any(
+                isinstance(column.type, JSON) for column in mapper.column_attrs[field_name].columns
+            ):
+                return False
+
+        return self.supports_returning("update")
+
+    async def get_and_update_object(
+        self,
+        data_update: BaseJSONAPIItemInSchema,
+        view_kwargs: dict,
+        qs: Optional[QueryStringManager] = None,
+    ) -> TypeModel:
+        """
+        Update an object with a single `UPDATE ... RETURNING` statement when possible.
+
+        Row is written only if passed values differ from stored ones. When no row is updated
+        the object is retrieved, so unchanged object is returned and missing one is reported.
+
+        :param data_update: the data validated by pydantic.
+        :param view_kwargs: kwargs from the resource view.
+        :param qs:
+        :return: updated object.
+        """
+        if not self.can_update_with_returning(data_update, qs):
+            return await super().get_and_update_object(data_update, view_kwargs, qs)
+
+        new_data = {
+            getattr(self.model, field_name): value
+            for field_name, value in data_update.attributes.dict(exclude_unset=True).items()
+        }
+        if not new_data:
+            return await self.get_object(view_kwargs, qs)
+
+        id_field = self.get_object_id_field()
+        stmt = (
+            update(self.model)
+            .where(id_field == self.prepare_id_value(id_field, view_kwargs[self.url_id_field]))
+            .where(or_(*(field.is_distinct_from(value) for field, value in new_data.items())))
+            .values(new_data)
+            .returning(*inspect(self.model).local_table.columns)
+        )
+        orm_stmt = select(self.model).from_statement(stmt).execution_options(populate_existing=True)
+
+        async with self.update_errors_handled(data_update, view_kwargs):
+            obj = (await self.session.execute(orm_stmt)).scalar_one_or_none()
+            if obj is not None:
+                await self.save()
+
+        if obj is None:
+            # nothing has changed or object doesn't exist
+            obj = await self.get_object(view_kwargs, qs)
+
+        return obj
+
+    @asynccontextmanager
+    async def delete_errors_handled(self, view_kwargs: dict) -> AsyncIterator[None]:
+        """
+        Convert database errors of delete statements to API errors.
+
+        :param view_kwargs: kwargs from the resource view.
+        """
+        try:
+            yield
         except DBAPIError as e:
             await self.session.rollback()
 
-            err_message = f"Got an error {e.__class__.__name__} during updating obj {view_kwargs} data in DB"
+            err_message = f"Got an error {e.__class__.__name__} deleting object {view_kwargs}"
             log.error(err_message, exc_info=e)
 
             raise InternalServerError(
@@ -442,10 +1400,6 @@ class SqlalchemyDataLayer(BaseDataLayer):
                 },
             )
 
-        await self.after_update_object(obj=obj, model_kwargs=new_data, view_kwargs=view_kwargs)
-
-        return has_updated
-
     async def delete_object(self, obj: TypeModel, view_kwargs: dict):
         """
         Delete an object through sqlalchemy.
@@ -456,32 +1410,53 @@ class SqlalchemyDataLayer(BaseDataLayer):
         await self.before_delete_object(obj, view_kwargs)
         stmt = delete(self.model).where(self.model.id == obj.id)
 
-        try:
+        async with self.delete_errors_handled(view_kwargs):
             await self.session.execute(stmt)
             await self.save()
-        except DBAPIError as e:
-            await self.session.rollback()
 
-            err_message = f"Got an error {e.__class__.__name__} deleting object {view_kwargs}"
-            log.error(err_message, exc_info=e)
+        await self.after_delete_object(obj, view_kwargs)
 
-            raise InternalServerError(
-                detail=err_message,
-                pointer="/data",
-                meta={
-                    "type": self.type_,
-                    "id": view_kwargs.get(self.url_id_field),
-                },
-            )
+    def can_delete_with_statement(self) -> bool:
+        return self._query is None and not self.has_overridden_methods(DELETE_WITH_STATEMENT_SKIPPED_METHODS)
 
-        await self.after_delete_object(obj, view_kwargs)
+    async def get_and_delete_object(self, view_kwargs: dict, qs: Optional[QueryStringManager] = None) -> None:
+        """
+        Delete an object with a single `DELETE` statement when possible.
+
+        Statement is used when retrieve and delete hooks are not overridden,
+        missing object is reported when no row is deleted.
+
+        :param view_kwargs: kwargs from the resource view.
+        :param qs:
+        """
+        if not self.can_delete_with_statement():
+            return await super().get_and_delete_object(view_kwargs, qs)
+
+        id_field = self.get_object_id_field()
+        filter_value = view_kwargs[self.url_id_field]
+        stmt = delete(self.model).where(id_field == self.prepare_id_value(id_field, filter_value))
+
+        async with self.delete_errors_handled(view_kwargs):
+            result = await self.session.execute(stmt)
+            if result.rowcount:
+                await self.save()
+
+        if not result.rowcount:
+            msg = f"Resource {self.model.__name__} `{filter_value}` not found"
+            raise ObjectNotFound(
+                msg,
+                parameter=self.url_id_field,
+            )
 
     async def delete_objects(self, objects: List[TypeModel], view_kwargs: dict):
         await self.before_delete_objects(objects, view_kwargs)
-        query = delete(self.model).filter(self.model.id.in_((obj.id for obj in objects)))
+        ids = [obj.id for obj in objects]
 
         try:
-            await self.session.execute(query)
+            # huge lists of ids are split, so statements have limited number of parameters
+            for chunk_start in range(0, len(ids), DELETE_COLLECTION_CHUNK_SIZE):
+                chunk_ids = ids[chunk_start : chunk_start + DELETE_COLLECTION_CHUNK_SIZE]
+                await self.session.execute(delete(self.model).filter(self.model.id.in_(chunk_ids)))
             await self.save()
         except DBAPIError as e:
             await self.session.rollback()
@@ -491,6 +1466,105 @@ class SqlalchemyDataLayer(BaseDataLayer):
 
         await self.after_delete_objects(objects, view_kwargs)
 
+    def can_delete_collection_with_statement(self, qs: QueryStringManager) -> bool:
+        """
+        Check if collection can be deleted with `DELETE ... RETURNING` statements.
+
+        Statements are used when request has no includes, sorts and cursors,
+        and collection and delete hooks are not overridden.
+
+        :param qs: a querystring manager to retrieve information from url.
+        :return:
+        """
+        return not (
+            qs.include
+            or qs.get_sorts(schema=self.schema)
+            or qs.pagination.is_cursor
+            or inspect(self.model).inherits is not None
+            or self.has_overridden_methods(DELETE_COLLECTION_WITH_STATEMENT_SKIPPED_METHODS)
+            or not self.supports_returning("delete")
+        )
+
+    def get_deleted_columns_to_return(self, qs: QueryStringManager) -> Sequence[Any]:
+        """
+        Columns of deleted objects returned by `DELETE ... RETURNING` statements.
+
+        Only primary and foreign keys and columns of the requested attributes are returned
+        when no attributes are requested (`fields[<type>]=`) or not requested ones may be left not loaded.
+
+        :param qs: a querystring manager to retrieve information from url.
+        :return:
+        """
+        requested_fields = qs.fields.get(self.type_)
+        if requested_fields is not None and (
+            self.load_only_requested_fields or set(requested_fields) <= {IGNORE_ALL_FIELDS_LITERAL}
+        ):
+            columns = get_sparse_fieldset_columns(self.model, self.schema, frozenset(requested_fields))
+            if columns is not None:
+                return columns
+
+        return tuple(inspect(self.model).local_table.columns)
+
+    async def delete_collection(
+        self,
+        qs: QueryStringManager,
+        view_kwargs: Optional[dict] = None,
+    ) -> Tuple[int, List[TypeModel]]:
+        """
+        Delete objects of the collection page with `DELETE ... RETURNING` statements when possible.
+
+        Filters are compiled into the statement, so objects are not retrieved before delete.
+        Whole collection (`page[size]=0`) is deleted by chunks of `DELETE_COLLECTION_CHUNK_SIZE` rows.
+        Deleted objects are returned for the response, so only the columns it renders are returned
+        by the statements (see `get_deleted_columns_to_return`).
+
+        :param qs: a querystring manager to retrieve information from url.
+        :param view_kwargs: kwargs from the resource view.
+        :return: the number of objects in the collection and the deleted objects ordered by id.
+        """
+        if not self.can_delete_collection_with_statement(qs):
+            return await super().delete_collection(qs, view_kwargs)
+
+        view_kwargs = view_kwargs or {}
+
+        with self.timings.measure(RequestPhase.QUERY):
+            query = await self.get_collection_query(qs, view_kwargs)
+
+        if (objects_count := await self.get_collection_count(query, qs, view_kwargs)) is None:
+            with self.timings.measure(RequestPhase.COUNT):
+                objects_count = await count_query(self.session, query)
+
+        id_field = self.get_object_id_field()
+        # filters may join related models, so ids are deduplicated
+        ids_query = query.with_only_columns(id_field).distinct().order_by(id_field)
+        if is_paginated := bool(qs.pagination.size):
+            ids_query = self.paginate_query(ids_query, qs.pagination)
+        else:
+            ids_query = ids_query.limit(DELETE_COLLECTION_CHUNK_SIZE)
+
+        stmt = delete(self.model).where(id_field.in_(ids_query)).returning(*self.get_deleted_columns_to_return(qs))
+        orm_stmt = select(self.model).from_statement(stmt).execution_options(populate_existing=True)
+
+        objects = []
+        try:
+            while True:
+                with self.timings.measure(RequestPhase.FETCH):
+                    deleted_objects = (await self.session.execute(orm_stmt)).scalars().all()
+                objects.extend(deleted_objects)
+                if is_paginated or len(deleted_objects) < DELETE_COLLECTION_CHUNK_SIZE:
+                    break
+
+            await self.save()
+        except DBAPIError as e:
+            await self.session.rollback()
+            raise InternalServerError(
+                detail=f"Got an error {e.__class__.__name__} during delete data from DB: {e!s}",
+            )
+
+        # returned rows order is not defined
+        objects.sort(key=self.get_object_id)
+        return objects_count, objects
+
     async def create_relationship(
         self,
         json_data: dict,
@@ -721,8 +1795,13 @@ class SqlalchemyDataLayer(BaseDataLayer):
         """
         if sort_info:
             sorts, joins = create_sorts(self.model, sort_info, self.schema)
-            for i_join in joins:
-                query = query.join(*i_join)
+            joined_aliases = set()
+            for alias, join_column in joins:
+                # sorts by several fields of a relationship share its alias
+                if alias in joined_aliases:
+                    continue
+                joined_aliases.add(alias)
+                query = query.join(alias, join_column)
             for i_sort in sorts:
                 query = query.order_by(i_sort)
         return query
@@ -744,6 +1823,80 @@ class SqlalchemyDataLayer(BaseDataLayer):
 
         return query
 
+    def create_keyset(self, sort_info: list) -> List[KeysetColumn]:
+        """
+        Create keyset for cursor pagination: sort columns and the primary key as a tiebreaker.
+
+        :param sort_info: sort information.
+        :return: keyset columns.
+        """
+        dialect = self.session.sync_session.get_bind(mapper=inspect(self.model)).dialect
+        return create_keyset(
+            self.model,
+            sort_info,
+            self.get_object_id_field_name(),
+            nulls_largest=dialect_nulls_are_largest(dialect),
+        )
+
+    def paginate_query_by_cursor(
+        self,
+        query: "Select",
+        paginate_info: PaginationQueryStringManager,
+        keyset: List[KeysetColumn],
+    ) -> "Select":
+        """
+        Paginate query by keyset (cursor), deep pages cost the same as the first one.
+
+        One more object is requested to know if there is one more page.
+        For `page[before]` order is reversed, see `paginate_collection_by_cursor`.
+
+        :param query: sqlalchemy queryset.
+        :param paginate_info: pagination information.
+        :param keyset: keyset columns.
+        :return: the paginated query
+        """
+        reverse = paginate_info.before is not None
+        cursor, parameter = (paginate_info.before, "page[before]") if reverse else (paginate_info.after, "page[after]")
+
+        if (values := decode_cursor(keyset, cursor, parameter)) is not None:
+            query = query.where(create_keyset_condition(keyset, values, reverse=reverse))
+
+        query = query.order_by(*(key.order_by(reverse=reverse) for key in keyset))
+
+        if paginate_info.size:
+            query = query.limit(paginate_info.size + 1)
+
+        return query
+
+    def paginate_collection_by_cursor(
+        self,
+        collection: Sequence[TypeModel],
+        paginate_info: PaginationQueryStringManager,
+        keyset: List[KeysetColumn],
+    ) -> List[TypeModel]:
+        """
+        Cut the page from collection fetched by `paginate_query_by_cursor` and create cursors to sibling pages.
+
+        :param collection: objects fetched by the paginated query.
+        :param paginate_info: pagination information.
+        :param keyset: keyset columns.
+        :return: objects of the page.
+        """
+        reverse = paginate_info.before is not None
+        has_more = bool(paginate_info.size) and len(collection) > paginate_info.size
+        page = list(collection[: paginate_info.size] if has_more else collection)
+        if reverse:
+            page.reverse()
+
+        has_cursor = bool(paginate_info.before if reverse else paginate_info.after)
+        has_next, has_prev = (has_cursor, has_more) if reverse else (has_more, has_cursor)
+        self.collection_cursors = CollectionCursors(
+            next=encode_cursor(keyset, page[-1]) if page and has_next else None,
+            prev=encode_cursor(keyset, page[0]) if page and has_prev else None,
+        )
+
+        return page
+
     def eagerload_includes(self, query: "Select", qs: QueryStringManager) -> "Select":
         """
         Use eagerload feature of sqlalchemy to optimize data retrieval for include querystring parameter.
@@ -752,8 +1905,12 @@ class SqlalchemyDataLayer(BaseDataLayer):
         :param qs: a querystring manager to retrieve information from url.
         :return: the query with includes eagerloaded.
         """
+        if self.strict_loading:
+            query = query.options(raiseload("*"))
+
         for include in qs.include:
             relation_join_object = None
+            relationship_path: List[InstrumentedAttribute] = []
 
             current_schema = self.schema
             current_model = self.model
@@ -764,6 +1921,10 @@ class SqlalchemyDataLayer(BaseDataLayer):
                     raise InvalidInclude(str(e))
 
                 field_to_load: InstrumentedAttribute = getattr(current_model, field_name_to_load)
+                if not isinstance(field_to_load.property, RelationshipProperty):
+                    msg = f"{current_model.__name__}.{field_name_to_load} is not a relationship"
+                    raise InvalidInclude(msg)
+
                 is_many = field_to_load.property.uselist
                 if relation_join_object is None:
                     relation_join_object = selectinload(field_to_load) if is_many else joinedload(field_to_load)
@@ -772,6 +1933,10 @@ class SqlalchemyDataLayer(BaseDataLayer):
                 else:
                     relation_join_object = relation_join_object.joinedload(field_to_load)
 
+                if self.strict_loading:
+                    relationship_path.append(field_to_load)
+                    query = query.options(get_relationship_path_option(relationship_path).raiseload("*"))
+
                 current_schema = get_related_schema(current_schema, related_field_name)
 
                 # the first entity is Mapper,
@@ -782,6 +1947,66 @@ class SqlalchemyDataLayer(BaseDataLayer):
 
         return query
 
+    def load_only_requested_columns(
+        self,
+        query: "Select",
+        qs: QueryStringManager,
+        extra_columns: Iterable[InstrumentedAttribute] = (),
+    ) -> "Select":
+        """
+        Load only columns of the attributes requested by sparse fieldsets, for the resource and included objects.
+
+        :param query: sqlalchemy queryset.
+        :param qs: a querystring manager to retrieve information from url.
+        :param extra_columns: more columns of the resource to load (e.g. keyset of cursor pagination).
+        :return: the query with not requested columns deferred.
+        """
+        if not (fields := qs.fields):
+            return query
+
+        if (requested_fields := fields.get(self.type_)) is not None and (
+            columns := get_sparse_fieldset_columns(self.model, self.schema, frozenset(requested_fields))
+        ) is not None:
+            query = query.options(load_only(*columns, *extra_columns))
+
+        loaded_includes = set()
+        for include in qs.include:
+            relationship_path: List[InstrumentedAttribute] = []
+            related_field_names: List[str] = []
+
+            current_schema = self.schema
+            current_model = self.model
+            for related_field_name in include.split(SPLIT_REL):
+                try:
+                    field_to_load: InstrumentedAttribute = getattr(
+                        current_model,
+                        get_model_field(current_schema, related_field_name),
+                    )
+                except Exception as e:
+                    raise InvalidInclude(str(e))
+
+                relationship_path.append(field_to_load)
+                related_field_names.append(related_field_name)
+                relationship_info: RelationshipInfo = current_schema.__fields__[related_field_name].field_info.extra[
+                    "relationship"
+                ]
+                current_schema = get_related_schema(current_schema, related_field_name)
+                current_model = field_to_load.property.entity.entity
+
+                # common prefixes of includes are configured once
+                if (loaded_include := SPLIT_REL.join(related_field_names)) in loaded_includes:
+                    continue
+                loaded_includes.add(loaded_include)
+
+                if (requested_fields := fields.get(relationship_info.resource_type)) is None:
+                    continue
+
+                columns = get_sparse_fieldset_columns(current_model, current_schema, frozenset(requested_fields))
+                if columns is not None:
+                    query = query.options(get_relationship_path_option(relationship_path).load_only(*columns))
+
+        return query
+
     def retrieve_object_query(
         self,
         view_kwargs: dict,
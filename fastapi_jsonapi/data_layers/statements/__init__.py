@@ -0,0 +1 @@
+"""SQL statements accounting package."""
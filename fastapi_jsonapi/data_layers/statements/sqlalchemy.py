@@ -0,0 +1,98 @@
+"""Request scoped accounting of SQL statements executed by sqlalchemy sessions"""
+import logging
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from fastapi_jsonapi.exceptions import StatementBudgetExceeded
+
+log = logging.getLogger(__name__)
+
+STATEMENT_COUNTER_KEY = "fastapi_jsonapi_statement_counter"
+STATEMENT_LISTENER_KEY = "fastapi_jsonapi_statement_listener"
+
+
+class StatementCounter:
+    """
+    Counts SQL statements executed by watched sessions.
+
+    Statements are counted on the connection level, so lazy loads,
+    relationship loaders (selectinload) and unit of work flushes are counted too.
+    """
+
+    def __init__(self, budget: Optional[int] = None):
+        """
+        Init statement counter.
+
+        :param budget: max number of statements, `StatementBudgetExceeded` is raised
+                       before the statement exceeding the budget is executed.
+        """
+        self.budget = budget
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def watch(self, session: AsyncSession):
+        """
+        Count statements of the session with this counter.
+
+        Session listeners are registered once, the counter is kept in `session.info`
+        and looked up on each statement, so a session (expected to be request scoped)
+        is counted by the latest counter only.
+
+        :param session: sqlalchemy session.
+        """
+        sync_session = session.sync_session
+        sync_session.info[STATEMENT_COUNTER_KEY] = self
+        sync_session.info.setdefault(STATEMENT_LISTENER_KEY, SessionStatementListener(sync_session.info))
+
+        if not event.contains(sync_session, "do_orm_execute", on_session_execute):
+            event.listen(sync_session, "do_orm_execute", on_session_execute)
+            event.listen(sync_session, "before_flush", on_session_flush)
+
+    def on_statement(self, conn, cursor, statement: str, parameters: Any, context, executemany: bool):
+        if self.budget is not None and self.count >= self.budget:
+            log.warning(
+                "Statement budget %s is exceeded, executed statements:\n%s",
+                self.budget,
+                "\n".join(self.statements),
+            )
+            msg = f"Statement budget {self.budget} is exceeded"
+            raise StatementBudgetExceeded(msg, meta={"statement": statement})
+
+        self.statements.append(statement)
+
+
+class SessionStatementListener:
+    """
+    Connection listener of a session, passes statements to the current counter of the session
+    """
+
+    def __init__(self, session_info: dict):
+        self.session_info = session_info
+
+    def __call__(self, conn, cursor, statement: str, parameters: Any, context, executemany: bool):
+        if (counter := self.session_info.get(STATEMENT_COUNTER_KEY)) is not None:
+            counter.on_statement(conn, cursor, statement, parameters, context, executemany)
+
+
+def watch_session_connection(session: Session, bind_arguments: Optional[dict] = None):
+    if (listener := session.info.get(STATEMENT_LISTENER_KEY)) is None:
+        return
+
+    # connections are not shared between sessions, listener goes away with the connection
+    connection = session.connection(bind_arguments=bind_arguments)
+    if not event.contains(connection, "before_cursor_execute", listener):
+        event.listen(connection, "before_cursor_execute", listener)
+
+
+def on_session_execute(orm_execute_state: ORMExecuteState):
+    watch_session_connection(orm_execute_state.session, orm_execute_state.bind_arguments)
+
+
+def on_session_flush(session: Session, flush_context, instances):
+    watch_session_connection(session)
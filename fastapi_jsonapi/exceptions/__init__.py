@@ -19,6 +19,7 @@ from .json_api import (
     ObjectNotFound,
     RelatedObjectNotFound,
     RelationNotFound,
+    StatementBudgetExceeded,
 )
 
 __all__ = [
@@ -38,4 +39,5 @@ __all__ = [
     "RelatedObjectNotFound",
     "ObjectNotFound",
     "Forbidden",
+    "StatementBudgetExceeded",
 ]
@@ -105,6 +105,14 @@ class UnsupportedFeatureORM(InternalServerError):
     title = "Unsupported ORM"
 
 
+class StatementBudgetExceeded(InternalServerError):
+    """
+    Request executed more SQL statements than allowed for the endpoint.
+    """
+
+    title = "Statement budget exceeded"
+
+
 class BadRequest(HTTPException):
     """
     Bad request HTTP exception class customized for json_api exceptions.
@@ -0,0 +1,85 @@
+"""Limits of the `filter` querystring parameter complexity."""
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from fastapi_jsonapi.exceptions import InvalidFilters
+from fastapi_jsonapi.splitter import SPLIT_REL
+
+TERMINAL_NODE_KEYS = frozenset(("name", "op", "val"))
+
+
+@dataclass(frozen=True)
+class FilterLimits:
+    """
+    Limits of filters complexity, `None` disables a limit.
+
+    Filters are checked when the querystring is parsed, before any query is built.
+
+    :param max_nodes: max number of conditions and logic operators (`and`, `or`, `not`).
+    :param max_depth: max nesting of conditions in logic operators, top level conditions have depth 1.
+    :param max_list_length: max number of values in a condition value list (`in` and other list operators).
+    :param max_relationship_joins: max number of distinct relationships to join,
+                                   `posts.comments.text` joins `posts` and `posts.comments`.
+    """
+
+    max_nodes: Optional[int] = None
+    max_depth: Optional[int] = None
+    max_list_length: Optional[int] = None
+    max_relationship_joins: Optional[int] = None
+
+
+def is_limit_exceeded(value: int, limit: Optional[int]) -> bool:
+    return limit is not None and value > limit
+
+
+def check_filter_condition(filter_item: dict, limits: FilterLimits, relationship_paths: Set[str]) -> None:
+    value = filter_item["val"]
+    if isinstance(value, list) and is_limit_exceeded(len(value), limits.max_list_length):
+        msg = f"Filter {filter_item['name']!r} has more than {limits.max_list_length} values"
+        raise InvalidFilters(msg)
+
+    if not isinstance(name := filter_item["name"], str) or SPLIT_REL not in name:
+        return
+
+    *path, _ = name.split(SPLIT_REL)
+    relationship_paths.update(SPLIT_REL.join(path[: index + 1]) for index in range(len(path)))
+    if is_limit_exceeded(len(relationship_paths), limits.max_relationship_joins):
+        msg = f"Filters can't join more than {limits.max_relationship_joins} relationships"
+        raise InvalidFilters(msg)
+
+
+def check_filter_limits(filters: Iterable[Any], limits: FilterLimits) -> None:
+    """
+    Check filters complexity.
+
+    Filter tree is walked iteratively, so oversized filters are rejected as soon as a limit is exceeded.
+
+    :param filters: loaded filters (top level conditions).
+    :param limits: filters complexity limits.
+    :raises InvalidFilters: if filters exceed any limit.
+    """
+    nodes_count = 0
+    relationship_paths: Set[str] = set()
+    stack: List[Tuple[Any, int]] = [(filter_item, 1) for filter_item in filters]
+    while stack:
+        filter_item, depth = stack.pop()
+        nodes_count += 1
+        if is_limit_exceeded(nodes_count, limits.max_nodes):
+            msg = f"Filters can't have more than {limits.max_nodes} conditions and logic operators"
+            raise InvalidFilters(msg)
+
+        if is_limit_exceeded(depth, limits.max_depth):
+            msg = f"Filters can't be nested deeper than {limits.max_depth} levels"
+            raise InvalidFilters(msg)
+
+        if not isinstance(filter_item, dict):
+            continue
+
+        if filter_item.keys() == TERMINAL_NODE_KEYS:
+            check_filter_condition(filter_item, limits, relationship_paths)
+            continue
+
+        for value in filter_item.values():
+            # `not` has a single condition, `and` and `or` have lists of them
+            sub_items = value if isinstance(value, list) else [value]
+            stack.extend((sub_item, depth + 1) for sub_item in sub_items)
@@ -1,12 +1,15 @@
 """Helper to deal with querystring parameters according to jsonapi specification."""
 from collections import defaultdict
-from functools import cached_property
+from copy import deepcopy
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from typing import (
     TYPE_CHECKING,
     Any,
     Dict,
     List,
     Optional,
+    Tuple,
     Type,
 )
 from urllib.parse import unquote
@@ -31,6 +34,7 @@ from fastapi_jsonapi.exceptions import (
     InvalidSort,
     InvalidType,
 )
+from fastapi_jsonapi.filter_limits import FilterLimits, check_filter_limits
 from fastapi_jsonapi.schema import (
     get_model_field,
     get_relationships,
@@ -40,18 +44,33 @@ from fastapi_jsonapi.splitter import SPLIT_REL
 if TYPE_CHECKING:
     from fastapi_jsonapi.data_typing import TypeSchema
 
+MANAGED_KEYS = ("filter", "page", "fields", "sort", "include", "q")
+# query strings are parsed (and validated) once, polling clients repeat the same ones
+QUERY_STRING_CACHE_SIZE = 1024
+QueryItems = Tuple[Tuple[str, str], ...]
+
 
 class PaginationQueryStringManager(BaseModel):
     """
     Pagination query string manager.
 
     Contains info about offsets, sizes, number and limits of query with pagination.
+    Cursors `after` and `before` switch to keyset (cursor) pagination,
+    empty cursor requests the first (or the last) page.
+    `count` set to false skips counting collection objects.
     """
 
     offset: Optional[int] = None
     size: Optional[int] = 25
     number: int = 1
     limit: Optional[int] = None
+    after: Optional[str] = None
+    before: Optional[str] = None
+    count: bool = True
+
+    @property
+    def is_cursor(self) -> bool:
+        return self.after is not None or self.before is not None
 
 
 class HeadersQueryStringManager(BaseModel):
@@ -70,72 +89,262 @@ class HeadersQueryStringManager(BaseModel):
     accept_language: Optional[str] = Field(None, alias="accept-language")
 
 
+def extract_item_key(key: str) -> str:
+    try:
+        key_start = key.index("[") + 1
+        key_end = key.index("]")
+        return key[key_start:key_end]
+    except Exception:
+        msg = "Parse error"
+        raise BadRequest(msg, parameter=key)
+
+
+@dataclass(frozen=True)
+class ParsedQueryString:
+    """
+    Querystring parameters managed by JSON:API, collected in a single pass.
+
+    Item keys of parameters like `page[size]` are extracted when the parameter is used,
+    so a malformed key fails only requests using it.
+    """
+
+    filter: Optional[str] = None
+    simple_filters: QueryItems = ()
+    page: QueryItems = ()
+    fields: QueryItems = ()
+    sort: Optional[str] = None
+    include: Optional[str] = None
+    managed_items: QueryItems = ()
+
+
+@lru_cache(maxsize=QUERY_STRING_CACHE_SIZE)
+def parse_query_string(query_items: QueryItems) -> ParsedQueryString:
+    """
+    Collect managed parameters of the querystring.
+
+    :param query_items: decoded key / value pairs of the querystring.
+    :return: parsed querystring.
+    """
+    single_values: Dict[str, str] = {}
+    simple_filters, page, fields, managed_items = [], [], [], []
+    for raw_key, value in query_items:
+        if raw_key in ("filter", "sort", "include"):
+            # the last value is used, like `QueryParams.get`
+            single_values[raw_key] = value
+        if raw_key.startswith(MANAGED_KEYS):
+            managed_items.append((raw_key, value))
+
+        key = unquote(raw_key)
+        if key.startswith("filter["):
+            simple_filters.append((key, value))
+        if key.startswith("page"):
+            page.append((key, value))
+        if key.startswith("fields"):
+            fields.append((key, value))
+
+    return ParsedQueryString(
+        filter=single_values.get("filter"),
+        simple_filters=tuple(simple_filters),
+        page=tuple(page),
+        fields=tuple(fields),
+        sort=single_values.get("sort"),
+        include=single_values.get("include"),
+        # all the parameters are kept when there are simple filters
+        managed_items=query_items if simple_filters else tuple(managed_items),
+    )
+
+
+@lru_cache(maxsize=QUERY_STRING_CACHE_SIZE)
+def load_filters(
+    filter_param: Optional[str],
+    simple_filters: QueryItems,
+    limits: Optional[FilterLimits] = None,
+) -> Tuple[dict, ...]:
+    """
+    Load filters from `filter` (json) and `filter[<name>]` parameters.
+
+    :param filter_param: `filter` parameter value.
+    :param simple_filters: `filter[<name>]` parameters.
+    :param limits: filters complexity limits.
+    :return: filter information, shared between requests, so it must not be modified.
+    :raises InvalidFilters: if filter loading from json has failed or filters exceed limits.
+    """
+    results = []
+    if filter_param is not None:
+        try:
+            loaded_filters = json.loads(filter_param)
+        except (ValueError, TypeError, RecursionError):
+            msg = "Parse error"
+            raise InvalidFilters(msg)
+
+        if not isinstance(loaded_filters, list):
+            msg = f"Incorrect filters format, expected list of conditions but got {type(loaded_filters).__name__}"
+            raise InvalidFilters(msg)
+
+        results.extend(loaded_filters)
+
+    simple_filter_values = {extract_item_key(key): value for key, value in simple_filters}
+    results.extend({"name": key, "op": "eq", "val": value} for key, value in simple_filter_values.items())
+    if limits is not None:
+        check_filter_limits(results, limits)
+
+    return tuple(results)
+
+
+@lru_cache(maxsize=QUERY_STRING_CACHE_SIZE)
+def load_pagination(
+    page_items: QueryItems,
+    allow_disable_pagination: bool,
+    max_page_size: Optional[int],
+) -> PaginationQueryStringManager:
+    """
+    Load and check `page[<name>]` parameters.
+
+    :param page_items: `page` parameters.
+    :param allow_disable_pagination: if the client is allowed to disable pagination.
+    :param max_page_size: page size limit.
+    :return: pagination, shared between requests, so it must be copied before modifying.
+    :raises BadRequest: if the client is not allowed to disable pagination.
+    """
+    # check values type
+    pagination_data: Dict[str, str] = {extract_item_key(key): value for key, value in page_items}
+    pagination = PaginationQueryStringManager(**pagination_data)
+    if pagination_data.get("size") is None:
+        pagination.size = None
+    if pagination.size:
+        if allow_disable_pagination is False and pagination.size == 0:
+            msg = "You are not allowed to disable pagination"
+            raise BadRequest(msg, parameter="page[size]")
+        if max_page_size and pagination.size > max_page_size:
+            pagination.size = max_page_size
+    if pagination.after is not None and pagination.before is not None:
+        msg = "You can't use both page[after] and page[before]"
+        raise BadRequest(msg, parameter="page")
+
+    return pagination
+
+
+@lru_cache(maxsize=QUERY_STRING_CACHE_SIZE)
+def load_sparse_fieldsets(fields_items: QueryItems) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """
+    Load `fields[<type>]` parameters.
+
+    :param fields_items: `fields` parameters.
+    :return: requested field names by resource type.
+    """
+    fields = defaultdict(list)
+    for key, value in fields_items:
+        fields[extract_item_key(key)].extend(value.split(","))
+
+    return tuple((resource_type, tuple(field_names)) for resource_type, field_names in fields.items())
+
+
+@lru_cache(maxsize=QUERY_STRING_CACHE_SIZE)
+def validate_sparse_fieldset(schema: Type[BaseModel], field_names: Tuple[str, ...]) -> None:
+    """
+    Check requested fields are attributes of the schema.
+
+    :param schema: schema of the resource.
+    :param field_names: requested field names.
+    :raises InvalidField: if result field not in schema.
+    """
+    for field_name in field_names:
+        if field_name == "":
+            continue
+
+        if field_name not in schema.__fields__:
+            msg = "{schema} has no attribute {field}".format(
+                schema=schema.__name__,
+                field=field_name,
+            )
+            raise InvalidField(msg)
+
+
+@lru_cache(maxsize=QUERY_STRING_CACHE_SIZE)
+def load_sorts(schema: Type["TypeSchema"], sort_param: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Load and check `sort` parameter.
+
+    :param schema: schema of the resource.
+    :param sort_param: `sort` parameter value.
+    :return: field and order pairs.
+    :raises InvalidSort: if sort field wrong.
+    """
+    sorting_results = []
+    for sort_field in sort_param.split(","):
+        field = sort_field.replace("-", "")
+        if SPLIT_REL not in field:
+            if field not in schema.__fields__:
+                msg = "{schema} has no attribute {field}".format(
+                    schema=schema.__name__,
+                    field=field,
+                )
+                raise InvalidSort(msg)
+            if field in get_relationships(schema):
+                msg = "You can't sort on {field} because it is a relationship field".format(field=field)
+                raise InvalidSort(msg)
+            field = get_model_field(schema, field)
+        order = "desc" if sort_field.startswith("-") else "asc"
+        sorting_results.append((field, order))
+
+    return tuple(sorting_results)
+
+
+@lru_cache(maxsize=QUERY_STRING_CACHE_SIZE)
+def load_includes(include_param: Optional[str], max_include_depth: Optional[int]) -> Tuple[str, ...]:
+    """
+    Load and check `include` parameter.
+
+    :param include_param: `include` parameter value.
+    :param max_include_depth: max number of relationships in include path.
+    :return: include paths.
+    :raises InvalidInclude: if nesting is more than max_include_depth.
+    """
+    includes = include_param.split(",") if include_param and isinstance(include_param, str) else []
+
+    if max_include_depth is not None:
+        for include_path in includes:
+            if len(include_path.split(SPLIT_REL)) > max_include_depth:
+                msg = "You can't use include through more than {max_include_depth} relationships".format(
+                    max_include_depth=max_include_depth,
+                )
+                raise InvalidInclude(msg)
+
+    return tuple(includes)
+
+
 class QueryStringManager:
-    """Querystring parser according to jsonapi reference."""
+    """
+    Querystring parser according to jsonapi reference.
+
+    Querystring is parsed in a single pass, parsed and checked parameters are cached by querystring.
+    """
 
-    managed_keys = ("filter", "page", "fields", "sort", "include", "q")
+    managed_keys = MANAGED_KEYS
 
-    def __init__(self, request: Request) -> None:
+    def __init__(self, request: Request, filter_limits: Optional[FilterLimits] = None) -> None:
         """
         Initialize instance.
 
         :param request
+        :param filter_limits: filters complexity limits
         """
         self.request: Request = request
+        self.filter_limits: Optional[FilterLimits] = filter_limits
         self.app: FastAPI = request.app
         self.qs: QueryParams = request.query_params
         self.config: Dict[str, Any] = getattr(self.app, "config", {})
         self.ALLOW_DISABLE_PAGINATION: bool = self.config.get("ALLOW_DISABLE_PAGINATION", True)
         self.MAX_PAGE_SIZE: int = self.config.get("MAX_PAGE_SIZE", 10000)
         self.MAX_INCLUDE_DEPTH: int = self.config.get("MAX_INCLUDE_DEPTH", 3)
-        self.headers: HeadersQueryStringManager = HeadersQueryStringManager(**dict(self.request.headers))
-
-    def _extract_item_key(self, key: str) -> str:
-        try:
-            key_start = key.index("[") + 1
-            key_end = key.index("]")
-            return key[key_start:key_end]
-        except Exception:
-            msg = "Parse error"
-            raise BadRequest(msg, parameter=key)
+        self.parsed: ParsedQueryString = parse_query_string(tuple(self.qs.multi_items()))
 
-    def _get_unique_key_values(self, name: str) -> Dict[str, str]:
-        """
-        Return a dict containing key / values items for a given key, used for items like filters, page, etc.
-
-        :param name: name of the querystring parameter
-        :return: a dict of key / values items
-        :raises BadRequest: if an error occurred while parsing the querystring.
-        """
-        results = {}
-
-        for raw_key, value in self.qs.multi_items():
-            key = unquote(raw_key)
-            if not key.startswith(name):
-                continue
-
-            item_key = self._extract_item_key(key)
-            results[item_key] = value
-
-        return results
-
-    def _get_multiple_key_values(self, name: str) -> Dict[str, List]:
-        results = defaultdict(list)
-
-        for raw_key, value in self.qs.multi_items():
-            key = unquote(raw_key)
-            if not key.startswith(name):
-                continue
-
-            item_key = self._extract_item_key(key)
-            results[item_key].extend(value.split(","))
-
-        return results
+    @cached_property
+    def headers(self) -> HeadersQueryStringManager:
+        return HeadersQueryStringManager(**dict(self.request.headers))
 
-    @classmethod
-    def _simple_filters(cls, dict_: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Filter creation."""
-        return [{"name": key, "op": "eq", "val": value} for (key, value) in dict_.items()]
+    def _extract_item_key(self, key: str) -> str:
+        return extract_item_key(key)
 
     @property
     def querystring(self) -> Dict[str, str]:
@@ -144,37 +353,20 @@ class QueryStringManager:
 
         :return: dict of managed querystring parameter
         """
-        return {
-            key: value
-            for (key, value) in self.qs.multi_items()
-            if key.startswith(self.managed_keys) or self._get_unique_key_values("filter[")
-        }
+        return dict(self.parsed.managed_items)
 
     @property
     def filters(self) -> List[dict]:
         """
         Return filters from query string.
 
+        Loaded filters are shared between requests with the same querystring,
+        so a deep copy is returned, it may be modified (e.g. by `before_get_collection`).
+
         :return: filter information
-        :raises InvalidFilters: if filter loading from json has failed.
+        :raises InvalidFilters: if filter loading from json has failed or filters exceed limits.
         """
-        results = []
-        filters = self.qs.get("filter")
-        if filters is not None:
-            try:
-                loaded_filters = json.loads(filters)
-            except (ValueError, TypeError):
-                msg = "Parse error"
-                raise InvalidFilters(msg)
-
-            if not isinstance(loaded_filters, list):
-                msg = f"Incorrect filters format, expected list of conditions but got {type(loaded_filters).__name__}"
-                raise InvalidFilters(msg)
-
-            results.extend(loaded_filters)
-        if filter_key_values := self._get_unique_key_values("filter["):
-            results.extend(self._simple_filters(filter_key_values))
-        return results
+        return deepcopy(list(load_filters(self.parsed.filter, self.parsed.simple_filters, self.filter_limits)))
 
     @cached_property
     def pagination(self) -> PaginationQueryStringManager:
@@ -196,21 +388,16 @@ class QueryStringManager:
             parsed_query.pagination
             {'number': '25', 'size': '10'}
 
+        Example with cursor strategy:
+
+            query_string = {'page[after]': 'WyJKb2huIiwxMF0', 'page[size]': '10'}
+            parsed_query.pagination
+            {'after': 'WyJKb2huIiwxMF0', 'size': '10'}
+
         :raises BadRequest: if the client is not allowed to disable pagination.
         """
-        # check values type
-        pagination_data: Dict[str, str] = self._get_unique_key_values("page")
-        pagination = PaginationQueryStringManager(**pagination_data)
-        if pagination_data.get("size") is None:
-            pagination.size = None
-        if pagination.size:
-            if self.ALLOW_DISABLE_PAGINATION is False and pagination.size == 0:
-                msg = "You are not allowed to disable pagination"
-                raise BadRequest(msg, parameter="page[size]")
-            if self.MAX_PAGE_SIZE and pagination.size > self.MAX_PAGE_SIZE:
-                pagination.size = self.MAX_PAGE_SIZE
-
-        return pagination
+        pagination = load_pagination(self.parsed.page, self.ALLOW_DISABLE_PAGINATION, self.MAX_PAGE_SIZE)
+        return pagination.copy()
 
     @property
     def fields(self) -> Dict[str, List[str]]:
@@ -227,8 +414,8 @@ class QueryStringManager:
 
         :raises InvalidField: if result field not in schema.
         """
-        fields = self._get_multiple_key_values("fields")
-        for resource_type, field_names in fields.items():
+        fields = load_sparse_fieldsets(self.parsed.fields)
+        for resource_type, field_names in fields:
             # TODO: we have registry for models (BaseModel)
             # TODO: create `type to schemas` registry
 
@@ -236,20 +423,9 @@ class QueryStringManager:
                 msg = f"Application has no resource with type {resource_type!r}"
                 raise InvalidType(msg)
 
-            schema: Type[BaseModel] = self._get_schema(resource_type)
-
-            for field_name in field_names:
-                if field_name == "":
-                    continue
-
-                if field_name not in schema.__fields__:
-                    msg = "{schema} has no attribute {field}".format(
-                        schema=schema.__name__,
-                        field=field_name,
-                    )
-                    raise InvalidField(msg)
+            validate_sparse_fieldset(self._get_schema(resource_type), field_names)
 
-        return {resource_type: set(field_names) for resource_type, field_names in fields.items()}
+        return {resource_type: set(field_names) for resource_type, field_names in fields}
 
     def _get_schema(self, resource_type: str) -> Type[BaseModel]:
         return RoutersJSONAPI.all_jsonapi_routers[resource_type]._schema
@@ -268,24 +444,8 @@ class QueryStringManager:
 
         :raises InvalidSort: if sort field wrong.
         """
-        if sort_q := self.qs.get("sort"):
-            sorting_results = []
-            for sort_field in sort_q.split(","):
-                field = sort_field.replace("-", "")
-                if SPLIT_REL not in field:
-                    if field not in schema.__fields__:
-                        msg = "{schema} has no attribute {field}".format(
-                            schema=schema.__name__,
-                            field=field,
-                        )
-                        raise InvalidSort(msg)
-                    if field in get_relationships(schema):
-                        msg = "You can't sort on {field} because it is a relationship field".format(field=field)
-                        raise InvalidSort(msg)
-                    field = get_model_field(schema, field)
-                order = "desc" if sort_field.startswith("-") else "asc"
-                sorting_results.append({"field": field, "order": order})
-            return sorting_results
+        if sort_q := self.parsed.sort:
+            return [{"field": field, "order": order} for field, order in load_sorts(schema, sort_q)]
 
         return []
 
@@ -297,14 +457,4 @@ class QueryStringManager:
         :return: a list of include information.
         :raises InvalidInclude: if nesting is more than MAX_INCLUDE_DEPTH.
         """
-        include_param: str = self.qs.get("include")
-        includes = include_param.split(",") if include_param and isinstance(include_param, str) else []
-
-        if self.MAX_INCLUDE_DEPTH is not None:
-            for include_path in includes:
-                if len(include_path.split(SPLIT_REL)) > self.MAX_INCLUDE_DEPTH:
-                    msg = "You can't use include through more than {max_include_depth} relationships".format(
-                        max_include_depth=self.MAX_INCLUDE_DEPTH,
-                    )
-                    raise InvalidInclude(msg)
-        return includes
+        return list(load_includes(self.parsed.include, self.MAX_INCLUDE_DEPTH))
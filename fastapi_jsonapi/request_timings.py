@@ -0,0 +1,79 @@
+"""Wall time of request processing phases"""
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import (
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    Optional,
+)
+
+from fastapi import Request
+
+
+class RequestPhase:
+    """
+    Names of measured phases, used as `Server-Timing` metric names
+    """
+
+    # view dependencies (`handle_endpoint_dependencies`)
+    DEPENDENCIES = "dependencies"
+    # query construction: filters, sorts, includes eager loading, pagination
+    QUERY = "query"
+    # collection count
+    COUNT = "count"
+    # collection page or object fetch
+    FETCH = "fetch"
+    # includes processing
+    INCLUDES = "includes"
+    # response building and rendering to JSON
+    SERIALIZATION = "serialization"
+
+
+class RequestTimings:
+    """
+    Wall time of request processing phases, in seconds
+
+    If a phase is measured more than once, its durations are summed up.
+    Phases may overlap, for example count and fetch run concurrently
+    when the data layer counts collection with a separate session.
+    """
+
+    enabled: bool = True
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        started_at = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] = self.phases.get(phase, 0.0) + perf_counter() - started_at
+
+    def as_server_timing(self) -> str:
+        """
+        `Server-Timing` header value, durations are in milliseconds
+        """
+        return ", ".join(f"{phase};dur={duration * 1000:.3f}" for phase, duration in self.phases.items())
+
+
+class DisabledRequestTimings(RequestTimings):
+    """
+    Nothing is measured, the same no-op context manager is returned for each phase
+    """
+
+    enabled: bool = False
+    _noop: ContextManager[None] = nullcontext()
+
+    def measure(self, phase: str) -> ContextManager[None]:
+        return self._noop
+
+
+# views share the same instance when timings are disabled
+disabled_request_timings = DisabledRequestTimings()
+
+RequestTimingsCallback = Callable[[Request, RequestTimings], Optional[Awaitable[None]]]
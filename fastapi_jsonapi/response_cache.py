@@ -0,0 +1,294 @@
+"""Cache of serialized GET responses, invalidated by writes of resources they contain"""
+import gzip
+import inspect
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from hashlib import sha256
+from operator import itemgetter
+from time import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+
+RESPONSE_CACHE_DEFAULT_SIZE = 1024
+GZIP_CONTENT_ENCODING = "gzip"
+
+# request and solved view dependencies -> key part, like tenant id or user role,
+# `None` means the response isn't cached
+ResponseCacheKeyBuilder = Callable[[Request, Dict[str, Any]], Union[Optional[str], Awaitable[Optional[str]]]]
+# modified resource types -> invalidates cached responses containing objects of these types
+ResponseCacheInvalidator = Callable[[Iterable[str]], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """
+    Serialized response
+
+    :param content: response body, compressed if `content_encoding` is set.
+    :param media_type: response media type.
+    :param content_encoding: `gzip` if content is precompressed.
+    :param fetched_at: timestamp the response data fetch started at, responses fetched
+                       before their resource types were invalidated are not stored.
+    """
+
+    content: bytes
+    media_type: str = JSONResponse.media_type
+    content_encoding: Optional[str] = None
+    fetched_at: float = 0.0
+
+
+class ResponseCacheBackend:
+    """
+    Storage of cached responses
+
+    Each entry is tagged with resource types of objects the response contains,
+    entries are invalidated by these types. Implement this interface to keep responses
+    in an external store shared by all the processes (Redis, Memcached, etc).
+    """
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Get response by key
+
+        :param key: cache key.
+        :return: cached response or `None` if there's no entry.
+        """
+        raise NotImplementedError
+
+    async def set(self, key: str, response: CachedResponse, resource_types: FrozenSet[str]) -> None:
+        """
+        Store response
+
+        Response must not be stored if any of its resource types was invalidated after `response.fetched_at`.
+
+        :param key: cache key.
+        :param response: serialized response.
+        :param resource_types: resource types of objects the response contains.
+        """
+        raise NotImplementedError
+
+    async def invalidate(self, resource_types: Iterable[str]) -> None:
+        """
+        Remove responses containing objects of these resource types
+
+        :param resource_types: modified resource types.
+        """
+        raise NotImplementedError
+
+
+class InMemoryResponseCache(ResponseCacheBackend):
+    """
+    LRU cache of responses in the process memory
+
+    Each process has its own cache and writes made by other processes don't invalidate it,
+    use an external store backend if the application runs more than one worker.
+    """
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_DEFAULT_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, Tuple[CachedResponse, FrozenSet[str]]] = OrderedDict()
+        self._keys_by_type: Dict[str, Set[str]] = defaultdict(set)
+        self._invalidated_at: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        if (entry := self._entries.get(key)) is None:
+            return None
+
+        self._entries.move_to_end(key)
+        response, _ = entry
+        return response
+
+    async def set(self, key: str, response: CachedResponse, resource_types: FrozenSet[str]) -> None:
+        if any(response.fetched_at <= self._invalidated_at.get(type_, 0.0) for type_ in resource_types):
+            return
+
+        self._remove(key)
+        self._entries[key] = (response, resource_types)
+        for type_ in resource_types:
+            self._keys_by_type[type_].add(key)
+
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    async def invalidate(self, resource_types: Iterable[str]) -> None:
+        invalidated_at = time()
+        for type_ in resource_types:
+            self._invalidated_at[type_] = invalidated_at
+            for key in self._keys_by_type.pop(type_, ()):
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        if (entry := self._entries.pop(key, None)) is None:
+            return
+
+        _, resource_types = entry
+        for type_ in resource_types:
+            if (keys := self._keys_by_type.get(type_)) is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_type[type_]
+
+
+def build_cache_key(
+    resource_type: str,
+    obj_id: Optional[str],
+    query_items: Iterable[Tuple[str, str]],
+    key_part: str = "",
+) -> str:
+    """
+    Build response cache key
+
+    Querystring is normalized: parameters are sorted by name, values of repeated parameters keep their order.
+
+    :param resource_type: resource type of the router.
+    :param obj_id: object id for detail responses, `None` for list responses.
+    :param query_items: querystring parameters.
+    :param key_part: key part built by the user supplied key builder.
+    :return: cache key.
+    """
+    normalized_query = sorted(query_items, key=itemgetter(0))
+    digest = sha256(repr((obj_id, normalized_query, key_part)).encode()).hexdigest()
+    return f"{resource_type}:{digest}"
+
+
+@dataclass(frozen=True)
+class ResponseCacheConfig:
+    """
+    Cache of GET list and detail responses of a router
+
+    :param backend: responses storage.
+    :param key_builder: builds key part from request and solved view dependencies (tenant, user role),
+                        return `None` to skip the cache for the request.
+    :param compress: store responses gzip compressed, compressed bytes are sent as is
+                     to clients accepting gzip encoding.
+    :param compress_min_size: min size of responses to compress, in bytes.
+    :param compress_level: gzip compression level.
+    """
+
+    backend: ResponseCacheBackend
+    key_builder: Optional[ResponseCacheKeyBuilder] = None
+    compress: bool = False
+    compress_min_size: int = 1024
+    compress_level: int = 6
+
+    async def build_key(
+        self,
+        request: Request,
+        resource_type: str,
+        dependencies: Dict[str, Any],
+        obj_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Build response cache key
+
+        :param request:
+        :param resource_type: resource type of the router.
+        :param dependencies: solved view dependencies.
+        :param obj_id: object id for detail responses.
+        :return: cache key or `None` if the response isn't cached.
+        """
+        key_part = ""
+        if self.key_builder is not None:
+            key_part = self.key_builder(request, dependencies)
+            if inspect.isawaitable(key_part):
+                key_part = await key_part
+            if key_part is None:
+                return None
+
+        return build_cache_key(resource_type, obj_id, request.query_params.multi_items(), key_part)
+
+    def serialize(self, result: Any, fetched_at: float) -> Optional[CachedResponse]:
+        """
+        Serialize result returned by the view
+
+        :param result: result schema, dict or response.
+        :param fetched_at: timestamp the response data fetch started at.
+        :return: serialized response or `None` if the result can't be cached (streamed or not successful).
+        """
+        if isinstance(result, StreamingResponse):
+            return None
+
+        if isinstance(result, Response):
+            if result.status_code != status.HTTP_200_OK:
+                return None
+            content, media_type = result.body, result.media_type or JSONResponse.media_type
+        else:
+            # rendered the same way FastAPI renders endpoints results
+            content, media_type = JSONResponse(jsonable_encoder(result)).body, JSONResponse.media_type
+
+        content_encoding = None
+        if self.compress and len(content) >= self.compress_min_size:
+            content = gzip.compress(content, compresslevel=self.compress_level)
+            content_encoding = GZIP_CONTENT_ENCODING
+
+        return CachedResponse(
+            content=content,
+            media_type=media_type,
+            content_encoding=content_encoding,
+            fetched_at=fetched_at,
+        )
+
+    def build_response(self, request: Request, cached: CachedResponse) -> Response:
+        """
+        Build response from serialized one
+
+        Compressed content is decompressed for clients not accepting gzip encoding.
+
+        :param request:
+        :param cached: serialized response.
+        :return: response.
+        """
+        content, headers = cached.content, {}
+        if cached.content_encoding is not None:
+            headers["Vary"] = "Accept-Encoding"
+            if cached.content_encoding in request.headers.get("accept-encoding", ""):
+                headers["Content-Encoding"] = cached.content_encoding
+            else:
+                content = gzip.decompress(content)
+
+        return Response(content=content, media_type=cached.media_type, headers=headers)
+
+    async def get_or_build_response(
+        self,
+        request: Request,
+        key: str,
+        resource_types: FrozenSet[str],
+        build: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Serve response from the cache or build and store it
+
+        :param request:
+        :param key: cache key.
+        :param resource_types: resource types of objects the response may contain.
+        :param build: builds the response on cache miss.
+        :return: response or result of `build` if it can't be cached.
+        """
+        if (cached := await self.backend.get(key)) is not None:
+            return self.build_response(request, cached)
+
+        fetched_at = time()
+        result = await build()
+        if (cached := self.serialize(result, fetched_at)) is None:
+            return result
+
+        await self.backend.set(key, cached, resource_types)
+        return self.build_response(request, cached)
@@ -81,6 +81,13 @@ class JSONAPIResultListMetaSchema(BaseModel):
         allow_population_by_field_name = True
 
 
+class JSONAPIResultListCursorMetaSchema(JSONAPIResultListMetaSchema):
+    """JSON:API list meta schema with cursors to sibling pages (cursor pagination)."""
+
+    next_cursor: Optional[str] = Field(alias="nextCursor")
+    prev_cursor: Optional[str] = Field(alias="prevCursor")
+
+
 class JSONAPIDocumentObjectSchema(BaseModel):
     """
     JSON:API Document Object Schema.
@@ -6,6 +6,7 @@ from typing import (
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
     Iterable,
     List,
     Optional,
@@ -46,6 +47,13 @@ JSONAPIObjectSchemaType = TypeVar("JSONAPIObjectSchemaType", bound=PydanticBaseM
 
 not_passed = object()
 
+# resource type to names of requested fields, sorted to be used as a cache key
+SparseFieldsets = Tuple[Tuple[str, FrozenSet[str]], ...]
+
+
+def normalize_sparse_fieldsets(fields: Optional[Dict[str, Iterable[str]]]) -> SparseFieldsets:
+    return tuple(sorted((resource_type, frozenset(names)) for resource_type, names in (fields or {}).items()))
+
 
 # todo: when 3.9 support is dropped, return back `slots=True to JSONAPIObjectSchemas dataclass`
 
@@ -86,6 +94,12 @@ class JSONAPIObjectSchemas:
         return list(self.can_be_included_schemas.values())
 
 
+@dataclass(frozen=True)
+class JSONAPIResultSchemas:
+    object_schemas: JSONAPIObjectSchemas
+    result_schema: Union[Type[JSONAPIResultListSchema], Type[JSONAPIResultDetailSchema]]
+
+
 @dataclass(frozen=True)
 class BuiltSchemasDTO:
     schema_in_post: Type[BaseJSONAPIDataInSchema]
@@ -133,6 +147,12 @@ class SchemaBuilder:
         self._get_info_from_schema_for_building_cached = lru_cache(maxsize=max_cache_size)(
             self._get_info_from_schema_for_building_cached,
         )
+        self._get_result_schemas_cached = lru_cache(maxsize=max_cache_size)(
+            self._get_result_schemas_cached,
+        )
+        self._create_object_schemas_for_includes_cached = lru_cache(maxsize=max_cache_size)(
+            self._create_object_schemas_for_includes_cached,
+        )
 
     def _create_schemas_objects_list(self, schema: Type[BaseModel]) -> Type[JSONAPIResultListSchema]:
         object_jsonapi_list_schema, list_jsonapi_schema = self.build_list_schemas(schema)
@@ -483,6 +503,7 @@ class SchemaBuilder:
         resource_type: str,
         includes: Iterable[str],
         included_schemas: List[Tuple[str, BaseModel, str]],
+        fields: Optional[Dict[str, FrozenSet[str]]] = None,
     ) -> Dict[str, Type[JSONAPIObjectSchema]]:
         if includes is not_passed:
             return {
@@ -491,6 +512,7 @@ class SchemaBuilder:
                 name: self.create_jsonapi_object_schemas(
                     included_schema,
                     resource_type=resource_type,
+                    fields=fields,
                 ).object_jsonapi_schema
                 for (name, included_schema, resource_type) in included_schemas
             }
@@ -501,16 +523,18 @@ class SchemaBuilder:
             relations_list: List[str] = i_include.split(SPLIT_REL)
             for part_index, include_part in enumerate(relations_list, start=1):
                 # find nested from the Schema
-                nested_schema: Type[BaseModel] = current_schema.__fields__[include_part].type_
+                nested_field = current_schema.__fields__[include_part]
+                nested_schema: Type[BaseModel] = nested_field.type_
                 # find all relations for this one
                 nested_schema_includes = set(relations_list[: part_index - 1] + relations_list[part_index:])
                 related_jsonapi_object_schema = self.create_jsonapi_object_schemas(
                     nested_schema,
-                    resource_type=resource_type,
+                    resource_type=nested_field.field_info.extra["relationship"].resource_type,
                     # higher and lower
                     includes=nested_schema_includes,
                     # rebuild schemas for each response
                     use_schema_cache=False,
+                    fields=fields,
                 ).object_jsonapi_schema
                 # cache it
                 can_be_included_schemas[include_part] = related_jsonapi_object_schema
@@ -519,6 +543,30 @@ class SchemaBuilder:
 
         return can_be_included_schemas
 
+    def _build_sparse_attributes_schema(
+        self,
+        base_name: str,
+        schema: Type[BaseModel],
+        attributes_schema: Type[BaseModel],
+        attribute_names: Iterable[str],
+    ) -> Type[BaseModel]:
+        """
+        Attributes schema with only the attributes of sparse fieldset
+
+        Validators of the attributes not requested are skipped, so these attributes aren't read from objects.
+        """
+        skipped_attributes = set(attributes_schema.__fields__).difference(attribute_names)
+        return pydantic.create_model(
+            f"{base_name}AttributesJSONAPI",
+            **{
+                name: (field.outer_type_, field.field_info)
+                for name, field in attributes_schema.__fields__.items()
+                if name not in skipped_attributes
+            },
+            __config__=attributes_schema.__config__,
+            __validators__=extract_validators(schema, exclude_for_field_names={"id", *skipped_attributes}),
+        )
+
     def create_jsonapi_object_schemas(
         self,
         schema: Type[BaseModel],
@@ -527,7 +575,19 @@ class SchemaBuilder:
         base_name: str = "",
         compute_included_schemas: bool = False,
         use_schema_cache: bool = True,
+        fields: Optional[Dict[str, FrozenSet[str]]] = None,
     ) -> JSONAPIObjectSchemas:
+        """
+        Create object schemas for the schema
+
+        :param fields: sparse fieldsets, resource type to requested fields.
+                       Attributes schemas of the requested types have only the requested attributes.
+        """
+        attribute_names = (fields or {}).get(resource_type or self._resource_type)
+        if attribute_names is not None:
+            # schemas cached by name only are built for all attributes
+            use_schema_cache = False
+
         if use_schema_cache and schema in self.object_schemas_cache and includes is not_passed:
             return self.object_schemas_cache[schema]
 
@@ -542,11 +602,19 @@ class SchemaBuilder:
             schema=schema,
             includes=includes,
         )
+        attributes_schema = dto.attributes_schema
+        if attribute_names is not None:
+            attributes_schema = self._build_sparse_attributes_schema(
+                base_name=base_name,
+                schema=schema,
+                attributes_schema=attributes_schema,
+                attribute_names=attribute_names,
+            )
 
         object_jsonapi_schema = self._build_jsonapi_object(
             base_name=base_name,
             resource_type=resource_type,
-            attributes_schema=dto.attributes_schema,
+            attributes_schema=attributes_schema,
             relationships_schema=dto.relationships_schema,
             resource_id_field=dto.resource_id_field,
             includes=includes,
@@ -561,10 +629,11 @@ class SchemaBuilder:
                 resource_type=resource_type,
                 includes=includes,
                 included_schemas=dto.included_schemas,
+                fields=fields,
             )
 
         result = JSONAPIObjectSchemas(
-            attributes_schema=dto.attributes_schema,
+            attributes_schema=attributes_schema,
             relationships_schema=dto.relationships_schema,
             object_jsonapi_schema=object_jsonapi_schema,
             can_be_included_schemas=can_be_included_schemas,
@@ -573,6 +642,96 @@ class SchemaBuilder:
             self.object_schemas_cache[schema] = result
         return result
 
+    def _create_object_schemas_for_includes_cached(
+        self,
+        schema: Type[BaseModel],
+        includes: FrozenSet[str],
+        resource_type: Optional[str],
+        fields: SparseFieldsets,
+    ) -> JSONAPIObjectSchemas:
+        return self.create_jsonapi_object_schemas(
+            schema=schema,
+            includes=includes,
+            resource_type=resource_type,
+            compute_included_schemas=True,
+            fields=dict(fields),
+        )
+
+    def create_object_schemas_for_includes(
+        self,
+        schema: Type[BaseModel],
+        includes: Iterable[str],
+        resource_type: Optional[str] = None,
+        fields: Optional[Dict[str, Iterable[str]]] = None,
+    ) -> JSONAPIObjectSchemas:
+        """
+        Object schemas used on each step of includes processing
+
+        Cached by schema, includes set, resource type and sparse fieldsets if `max_cache_size` is set
+        """
+        return self._create_object_schemas_for_includes_cached(
+            schema=schema,
+            includes=frozenset(includes),
+            resource_type=resource_type,
+            fields=normalize_sparse_fieldsets(fields),
+        )
+
+    def _get_result_schemas_cached(
+        self,
+        name: str,
+        schema: Type[BaseModel],
+        includes: Tuple[str, ...],
+        is_list: bool,
+        fields: SparseFieldsets,
+    ) -> JSONAPIResultSchemas:
+        object_schemas = self.create_jsonapi_object_schemas(
+            schema=schema,
+            includes=includes,
+            compute_included_schemas=bool(includes),
+            use_schema_cache=False,
+            fields=dict(fields),
+        )
+        builder = self.build_schema_for_list_result if is_list else self.build_schema_for_detail_result
+        result_schema = builder(
+            name=name,
+            object_jsonapi_schema=object_schemas.object_jsonapi_schema,
+            includes_schemas=object_schemas.included_schemas_list,
+        )
+        return JSONAPIResultSchemas(
+            object_schemas=object_schemas,
+            result_schema=result_schema,
+        )
+
+    def get_result_schemas(
+        self,
+        name: str,
+        schema: Type[BaseModel],
+        includes: Iterable[str],
+        is_list: bool,
+        fields: Optional[Dict[str, Iterable[str]]] = None,
+    ) -> JSONAPIResultSchemas:
+        """
+        Object, included and result schemas to build a response
+
+        Responses with the same includes and sparse fieldsets reuse the same schemas,
+        so bundles are cached (LRU, up to `max_cache_size` items)
+        by schema, normalized includes set, sparse fieldsets and result kind (list / detail)
+
+        :param name: result schema name
+        :param schema: resource schema
+        :param includes: requested includes
+        :param is_list: build result schema for list (or detail) response
+        :param fields: sparse fieldsets, attributes schemas have only the requested attributes
+        :return:
+        """
+        return self._get_result_schemas_cached(
+            name=name,
+            schema=schema,
+            includes=tuple(sorted(set(includes))),
+            is_list=is_list,
+            fields=normalize_sparse_fieldsets(fields),
+        )
+
     def build_schema_for_list_result(
         self,
         name: str,
@@ -1,12 +1,18 @@
 import inspect
+from dataclasses import dataclass, field
 from typing import (
     Any,
     Awaitable,
     Callable,
+    Dict,
+    Optional,
+    Set,
+    Tuple,
     TypeVar,
     Union,
 )
 
+import fastapi
 from fastapi import Request
 from fastapi.dependencies.models import Dependant
 from fastapi.dependencies.utils import (
@@ -15,10 +21,55 @@ from fastapi.dependencies.utils import (
 )
 from fastapi.exceptions import RequestValidationError
 
+# FastAPI 0.106 runs exit code of dependencies with `yield` before the response is sent,
+# so resources of such dependencies (e.g. sessions) can't be used by streamed response bodies
+DEPENDENCIES_EXIT_BEFORE_RESPONSE = tuple(map(int, fastapi.__version__.split(".")[:2])) >= (0, 106)
+
 ReturnType = TypeVar("ReturnType")
 FuncReturnType = Union[Awaitable[ReturnType], ReturnType]
 
 
+DependencyCacheKey = Tuple[Callable[..., Any], Tuple[str, ...]]
+
+
+@dataclass
+class RequestDependencyCache:
+    """
+    Dependencies solved for one request, shared by dependency helpers of the request (e.g. by atomic operations)
+
+    Only dependencies not reading the body are shared: the ones reading the body
+    (directly or through sub dependencies) validate the current operation and are solved for each helper.
+    Dependencies declared with `Depends(use_cache=False)` are solved for each helper too,
+    use it for dependencies reading `current_atomic_operation` without the body.
+    """
+
+    # FastAPI cache of sub dependencies values by (dependency call, security scopes)
+    values: Dict[DependencyCacheKey, Any] = field(default_factory=dict)
+
+
+def get_shared_dependencies_keys(dependant: Dependant) -> Set[DependencyCacheKey]:
+    """
+    Collect cache keys of sub dependencies which may be shared between dependency helpers of the request
+
+    Sub dependency is shared if it's cached, doesn't read the body and all its sub dependencies are shared.
+
+    :param dependant:
+    :return:
+    """
+    shared_keys = set()
+    for sub_dependant in dependant.dependencies:
+        sub_shared_keys = get_shared_dependencies_keys(sub_dependant)
+        shared_keys |= sub_shared_keys
+        if (
+            sub_dependant.use_cache
+            and not sub_dependant.body_params
+            and all(sub_sub_dependant.cache_key in sub_shared_keys for sub_sub_dependant in sub_dependant.dependencies)
+        ):
+            shared_keys.add(sub_dependant.cache_key)
+
+    return shared_keys
+
+
 class DependencyHelper:
     """
     DependencyHelper for resolving dependencies.
@@ -26,17 +77,30 @@ class DependencyHelper:
     Use this helper to run a func with some FastAPI Dependencies
     """
 
-    def __init__(self, request: Request):
+    def __init__(self, request: Request, dependency_cache: Optional[RequestDependencyCache] = None):
         self.request = request
+        self.dependency_cache = dependency_cache
 
-    async def solve_dependencies_and_run(self, dependant: Dependant) -> ReturnType:
+    async def get_body(self) -> Any:
+        # starlette caches the parsed body in the request
         body_data = await self.request.body() or None
-        body = body_data and (await self.request.json())
-        values, errors, *_ = await solve_dependencies(  # WPS110
+        return body_data and (await self.request.json())
+
+    async def solve_dependencies_and_run(self, dependant: Dependant) -> ReturnType:
+        body = await self.get_body()
+        cache = self.dependency_cache
+        values, errors, _, _, solved_dependencies = await solve_dependencies(  # WPS110
             request=self.request,
             dependant=dependant,
             body=body,
+            dependency_cache=dict(cache.values) if cache is not None else None,
         )
+        if cache is not None:
+            cache.values.update(
+                (key, solved_dependencies[key])
+                for key in get_shared_dependencies_keys(dependant)
+                if key in solved_dependencies
+            )
 
         if errors:
             raise RequestValidationError(errors, body=body)
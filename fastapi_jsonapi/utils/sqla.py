@@ -1,5 +1,9 @@
+from functools import lru_cache
 from typing import Type
 
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.util import AliasedClass
+
 from fastapi_jsonapi.data_typing import TypeModel
 
 
@@ -24,3 +28,28 @@ def get_related_model_cls(cls: Type[TypeModel], relation_name: str) -> Type[Type
     :return:
     """
     return getattr(cls, relation_name).property.mapper.class_
+
+
+@lru_cache(maxsize=None)
+def get_relationship_alias(
+    namespace: str,
+    root_model: Type[TypeModel],
+    relationship_path: str,
+    target_model: Type[TypeModel],
+) -> AliasedClass:
+    """
+    Get the same alias of relationship target model on each call
+
+    SQLAlchemy caches compiled statements by their structure, a fresh alias
+    on each request makes a new cache key, so the statement is compiled again.
+
+    Filtering and sorting join relationships separately, so their aliases
+    are kept in different namespaces.
+
+    :param namespace: who joins the relationship (filter, sort, ...)
+    :param root_model: the model the relationship path starts from
+    :param relationship_path: dotted relationship path, e.g. `user.bio`
+    :param target_model: related model class of the last relationship in path
+    :return:
+    """
+    return aliased(target_model)
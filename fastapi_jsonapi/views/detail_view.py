@@ -7,12 +7,13 @@ from typing import (
     Union,
 )
 
+from fastapi import Response
+
 from fastapi_jsonapi import BadRequest
 from fastapi_jsonapi.schema import (
     BaseJSONAPIItemInSchema,
     JSONAPIResultDetailSchema,
 )
-from fastapi_jsonapi.views.utils import handle_jsonapi_fields
 from fastapi_jsonapi.views.view_base import ViewBase
 
 if TYPE_CHECKING:
@@ -35,14 +36,16 @@ class DetailViewBase(ViewBase):
         self,
         object_id: Union[int, str],
         **extra_view_deps,
-    ) -> Union[JSONAPIResultDetailSchema, Dict]:
+    ) -> Union[JSONAPIResultDetailSchema, Dict, Response]:
         dl: "BaseDataLayer" = await self.get_data_layer(extra_view_deps)
 
         view_kwargs = {dl.url_id_field: object_id}
         db_object = await dl.get_object(view_kwargs=view_kwargs, qs=self.query_params)
 
-        response = self._build_detail_response(db_object)
-        return handle_jsonapi_fields(response, self.query_params, self.jsonapi)
+        if self.jsonapi.use_compiled_serializer:
+            return self._serialize_detail_response(db_object)
+
+        return self._build_detail_response(db_object)
 
     async def handle_update_resource(
         self,
@@ -51,8 +54,7 @@ class DetailViewBase(ViewBase):
         **extra_view_deps,
     ) -> Union[JSONAPIResultDetailSchema, Dict]:
         dl: "BaseDataLayer" = await self.get_data_layer(extra_view_deps)
-        response = await self.process_update_object(dl=dl, obj_id=obj_id, data_update=data_update)
-        return handle_jsonapi_fields(response, self.query_params, self.jsonapi)
+        return await self.process_update_object(dl=dl, obj_id=obj_id, data_update=data_update)
 
     async def process_update_object(
         self,
@@ -66,9 +68,7 @@ class DetailViewBase(ViewBase):
                 pointer="/data/id",
             )
         view_kwargs = {dl.url_id_field: obj_id}
-        db_object = await dl.get_object(view_kwargs=view_kwargs, qs=self.query_params)
-
-        await dl.update_object(db_object, data_update, view_kwargs)
+        db_object = await dl.get_and_update_object(data_update, view_kwargs=view_kwargs, qs=self.query_params)
 
         return self._build_detail_response(db_object)
 
@@ -86,6 +86,4 @@ class DetailViewBase(ViewBase):
         obj_id: str,
     ) -> None:
         view_kwargs = {dl.url_id_field: obj_id}
-        db_object = await dl.get_object(view_kwargs=view_kwargs, qs=self.query_params)
-
-        await dl.delete_object(db_object, view_kwargs)
+        await dl.get_and_delete_object(view_kwargs=view_kwargs, qs=self.query_params)
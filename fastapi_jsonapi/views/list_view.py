@@ -1,12 +1,14 @@
 import logging
-from typing import TYPE_CHECKING, Any, Dict, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Union
 
+from fastapi import Response
+
+from fastapi_jsonapi.data_typing import TypeModel
 from fastapi_jsonapi.schema import (
     BaseJSONAPIItemInSchema,
     JSONAPIResultDetailSchema,
     JSONAPIResultListSchema,
 )
-from fastapi_jsonapi.views.utils import handle_jsonapi_fields
 from fastapi_jsonapi.views.view_base import ViewBase
 
 if TYPE_CHECKING:
@@ -35,14 +37,30 @@ class ListViewBase(ViewBase):
     ) -> "BaseDataLayer":
         return await self.get_data_layer_for_list(extra_view_deps)
 
-    async def handle_get_resource_list(self, **extra_view_deps) -> Union[JSONAPIResultListSchema, Dict]:
+    def can_load_only_requested_fields(self) -> bool:
+        # streamed list is rendered with compiled serializer too
+        return super().can_load_only_requested_fields() or (
+            self.request.method == "GET" and self.jsonapi.stream_list_response
+        )
+
+    async def handle_get_resource_list(self, **extra_view_deps) -> Union[JSONAPIResultListSchema, Dict, Response]:
         dl: "BaseDataLayer" = await self.get_data_layer(extra_view_deps)
         query_params = self.query_params
+
+        if self.jsonapi.stream_list_response:
+            count, partitions = await dl.get_collection_stream(
+                qs=query_params,
+                yield_per=self.jsonapi.stream_yield_per,
+            )
+            return self._stream_list_response(partitions, count, self._calculate_total_pages(count))
+
         count, items_from_db = await dl.get_collection(qs=query_params)
         total_pages = self._calculate_total_pages(count)
 
-        response = self._build_list_response(items_from_db, count, total_pages)
-        return handle_jsonapi_fields(response, query_params, self.jsonapi)
+        if self.jsonapi.use_compiled_serializer:
+            return self._serialize_list_response(items_from_db, count, total_pages, dl.collection_cursors)
+
+        return self._build_list_response(items_from_db, count, total_pages, dl.collection_cursors)
 
     async def handle_post_resource_list(
         self,
@@ -50,26 +68,45 @@ class ListViewBase(ViewBase):
         **extra_view_deps,
     ) -> Union[JSONAPIResultDetailSchema, Dict]:
         dl: "BaseDataLayer" = await self.get_data_layer(extra_view_deps)
-        response = await self.process_create_object(dl=dl, data_create=data_create)
-        return handle_jsonapi_fields(response, self.query_params, self.jsonapi)
+        return await self.process_create_object(dl=dl, data_create=data_create)
 
     async def process_create_object(self, dl: "BaseDataLayer", data_create: BaseJSONAPIItemInSchema):
         created_object = await dl.create_object(data_create=data_create, view_kwargs={})
 
-        created_object_id = dl.get_object_id(created_object)
-
-        view_kwargs = {dl.url_id_field: created_object_id}
-        db_object = await dl.get_object(view_kwargs=view_kwargs, qs=self.query_params)
+        db_object = await dl.get_created_object(created_object, view_kwargs={}, qs=self.query_params)
 
         return self._build_detail_response(db_object)
 
+    async def handle_post_resource_list_bulk(
+        self,
+        data_create_list: List[BaseJSONAPIItemInSchema],
+        **extra_view_deps,
+    ) -> JSONAPIResultListSchema:
+        dl: "BaseDataLayer" = await self.get_data_layer(extra_view_deps)
+        return await self.process_create_objects(dl=dl, data_create_list=data_create_list)
+
+    async def create_objects_and_fetch(
+        self,
+        dl: "BaseDataLayer",
+        data_create_list: List[BaseJSONAPIItemInSchema],
+    ) -> List[TypeModel]:
+        created_objects = await dl.create_objects(data_create_list=data_create_list, view_kwargs={})
+
+        return await dl.get_created_objects(created_objects, view_kwargs={}, qs=self.query_params)
+
+    async def process_create_objects(
+        self,
+        dl: "BaseDataLayer",
+        data_create_list: List[BaseJSONAPIItemInSchema],
+    ) -> JSONAPIResultListSchema:
+        db_objects = await self.create_objects_and_fetch(dl=dl, data_create_list=data_create_list)
+
+        return self._build_list_response(db_objects, count=len(db_objects), total_pages=1)
+
     async def handle_delete_resource_list(self, **extra_view_deps) -> JSONAPIResultListSchema:
         dl: "BaseDataLayer" = await self.get_data_layer(extra_view_deps)
         query_params = self.query_params
-        count, items_from_db = await dl.get_collection(qs=query_params)
+        count, items_from_db = await dl.delete_collection(qs=query_params)
         total_pages = self._calculate_total_pages(count)
 
-        await dl.delete_objects(items_from_db, {})
-
-        response = self._build_list_response(items_from_db, count, total_pages)
-        return handle_jsonapi_fields(response, self.query_params, self.jsonapi)
+        return self._build_list_response(items_from_db, count, total_pages)
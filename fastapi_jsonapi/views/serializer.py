@@ -0,0 +1,338 @@
+"""
+Compiled JSON:API response serializer.
+
+Serializer is compiled once per schema, include set and sparse fieldset
+and writes JSON:API document as bytes reading attributes straight off
+ORM objects (or any objects supporting attribute access, like Core rows),
+skipping pydantic response models.
+
+Values are serialized as they are stored,
+validators of attributes schemas are not called.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+import simplejson as json
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+
+from fastapi_jsonapi.data_typing import TypeModel
+from fastapi_jsonapi.schema_base import RelationshipInfo, registry
+from fastapi_jsonapi.splitter import SPLIT_REL
+from fastapi_jsonapi.views.utils import IGNORE_ALL_FIELDS_LITERAL
+
+COMPILED_SERIALIZERS_CACHE_SIZE = 512
+
+ResourceKey = Tuple[str, str]
+SparseFieldsets = Tuple[Tuple[str, FrozenSet[str]], ...]
+GetItemId = Callable[[TypeModel], str]
+
+
+@dataclass
+class ResourceNode:
+    resource_type: str
+    # pairs of (attribute name on the object, key in the document)
+    attributes: Tuple[Tuple[str, str], ...]
+    relationships: List["RelationshipNode"] = field(default_factory=list)
+
+
+@dataclass
+class RelationshipNode:
+    name: str
+    many: bool
+    target: ResourceNode
+
+
+def _is_relationship_field(schema: Type[BaseModel], name: str) -> bool:
+    return isinstance(schema.__fields__[name].field_info.extra.get("relationship"), RelationshipInfo)
+
+
+def _compile_attributes(
+    schema: Type[BaseModel],
+    resource_type: str,
+    fields: Dict[str, FrozenSet[str]],
+) -> Tuple[Tuple[str, str], ...]:
+    requested_fields: Optional[FrozenSet[str]] = fields.get(resource_type)
+    if requested_fields is not None and IGNORE_ALL_FIELDS_LITERAL in requested_fields:
+        return ()
+
+    attributes = []
+    for name, schema_field in schema.__fields__.items():
+        if name == "id" or _is_relationship_field(schema, name):
+            continue
+        if requested_fields is not None and name not in requested_fields:
+            continue
+        attributes.append((schema_field.alias, schema_field.alias))
+
+    return tuple(attributes)
+
+
+def _compile_node(
+    schema: Type[BaseModel],
+    resource_type: str,
+    includes: Iterable[Tuple[str, ...]],
+    fields: Dict[str, FrozenSet[str]],
+) -> ResourceNode:
+    schema.update_forward_refs(**registry.schemas)
+    node = ResourceNode(
+        resource_type=resource_type,
+        attributes=_compile_attributes(schema, resource_type, fields),
+    )
+
+    # group includes by the first relationship, keep requested order
+    nested_includes: Dict[str, List[Tuple[str, ...]]] = {}
+    for include_path in includes:
+        name, *tail = include_path
+        nested_includes.setdefault(name, [])
+        if tail:
+            nested_includes[name].append(tuple(tail))
+
+    for name, nested in nested_includes.items():
+        schema_field = schema.__fields__[name]
+        relationship_info: RelationshipInfo = schema_field.field_info.extra["relationship"]
+        node.relationships.append(
+            RelationshipNode(
+                name=name,
+                many=relationship_info.many,
+                target=_compile_node(
+                    schema=schema_field.type_,
+                    resource_type=relationship_info.resource_type,
+                    includes=nested,
+                    fields=fields,
+                ),
+            ),
+        )
+
+    return node
+
+
+def _resource_object(node: ResourceNode, item: TypeModel, item_id: str) -> Dict[str, Any]:
+    return {
+        "id": item_id,
+        "type": node.resource_type,
+        "attributes": {key: getattr(item, attr_name) for attr_name, key in node.attributes},
+    }
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(
+        value,
+        default=pydantic_encoder,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+class DocumentCollector:
+    """
+    Collects primary and included resource objects
+
+    Items may be added by batches (for streaming),
+    included objects are deduplicated by type and id across all batches
+    """
+
+    def __init__(self, root: ResourceNode, has_includes: bool, get_item_id: GetItemId):
+        self.root = root
+        self.has_includes = has_includes
+        self.get_item_id = get_item_id
+        self.primary_keys: Set[ResourceKey] = set()
+        self.included: Dict[ResourceKey, Dict[str, Any]] = {}
+        self.visited: Set[Tuple[int, ResourceKey]] = set()
+
+    def add_items(self, items: Iterable[TypeModel]) -> List[Dict[str, Any]]:
+        """
+        Builds resource objects for items and walks includes for them
+
+        :param items:
+        :return: primary resource objects
+        """
+        data = []
+        # primary objects of previous batches are already sent, don't touch them
+        batch_primary: Dict[ResourceKey, Dict[str, Any]] = {}
+
+        level: List[Tuple[ResourceNode, TypeModel, Dict[str, Any]]] = []
+        for item in items:
+            item_id = self.get_item_id(item)
+            resource = _resource_object(self.root, item, item_id)
+            if self.has_includes:
+                resource["relationships"] = {}
+            data.append(resource)
+            key = (self.root.resource_type, item_id)
+            self.primary_keys.add(key)
+            batch_primary[key] = resource
+            level.append((self.root, item, resource))
+
+        # walk the include tree level by level for all items at once
+        while level:
+            next_level = []
+            for node, item, resource in level:
+                for relationship in node.relationships:
+                    related = getattr(item, relationship.name)
+                    related_items = (related or []) if relationship.many else [related]
+                    linkage = []
+                    target = relationship.target
+                    for related_item in related_items:
+                        if related_item is None:
+                            continue
+                        related_id = self.get_item_id(related_item)
+                        key = (target.resource_type, related_id)
+                        linkage.append({"id": related_id, "type": target.resource_type})
+
+                        related_resource = batch_primary.get(key) or self.included.get(key)
+                        if related_resource is None:
+                            if key in self.primary_keys:
+                                continue
+                            related_resource = _resource_object(target, related_item, related_id)
+                            self.included[key] = related_resource
+                        if (id(target), key) in self.visited:
+                            continue
+                        self.visited.add((id(target), key))
+                        if target.relationships:
+                            related_resource.setdefault("relationships", {})
+                            next_level.append((target, related_item, related_resource))
+
+                    resource.setdefault("relationships", {})[relationship.name] = {
+                        "data": linkage if relationship.many else (linkage[0] if linkage else None),
+                    }
+            level = next_level
+
+        return data
+
+    def get_included(self) -> List[Dict[str, Any]]:
+        return [resource for _, resource in sorted(self.included.items(), key=lambda pair: pair[0])]
+
+
+class CompiledSerializer:
+    """
+    Writes JSON:API documents for one schema, include set and sparse fieldset
+    """
+
+    def __init__(self, root: ResourceNode, has_includes: bool):
+        self.root = root
+        self.has_includes = has_includes
+
+    def _get_collector(self, get_item_id: GetItemId) -> DocumentCollector:
+        return DocumentCollector(root=self.root, has_includes=self.has_includes, get_item_id=get_item_id)
+
+    def _dump(
+        self,
+        data: Any,
+        collector: DocumentCollector,
+        meta: Optional[Dict[str, Any]],
+    ) -> bytes:
+        document = {
+            "data": data,
+            "jsonapi": {"version": "1.0"},
+            "meta": meta,
+        }
+        if self.has_includes:
+            document["included"] = collector.get_included()
+
+        return _dumps(document).encode("utf-8")
+
+    def serialize_list(
+        self,
+        items: List[TypeModel],
+        meta: Dict[str, Any],
+        get_item_id: GetItemId,
+    ) -> bytes:
+        collector = self._get_collector(get_item_id)
+        data = collector.add_items(items)
+        return self._dump(data, collector, meta=meta)
+
+    def serialize_detail(self, item: TypeModel, get_item_id: GetItemId) -> bytes:
+        collector = self._get_collector(get_item_id)
+        data = collector.add_items([item])
+        return self._dump(data[0], collector, meta=None)
+
+    async def iter_list(
+        self,
+        partitions: AsyncIterable[List[TypeModel]],
+        meta: Dict[str, Any],
+        get_item_id: GetItemId,
+    ) -> AsyncIterator[bytes]:
+        """
+        Writes list document by chunks
+
+        `data` items are written as soon as partition is fetched,
+        `included` and `meta` are written at the end
+
+        :param partitions: batches of items
+        :param meta: list meta
+        :param get_item_id:
+        :return:
+        """
+        collector = self._get_collector(get_item_id)
+        yield b'{"data":['
+        separator = ""
+        async for items in partitions:
+            data = collector.add_items(items)
+            if not data:
+                continue
+            yield (separator + ",".join(_dumps(resource) for resource in data)).encode("utf-8")
+            separator = ","
+
+        tail = {
+            "jsonapi": {"version": "1.0"},
+            "meta": meta,
+        }
+        if self.has_includes:
+            tail["included"] = collector.get_included()
+        # reuse dumped object without opening brace
+        yield ("]," + _dumps(tail)[1:]).encode("utf-8")
+
+
+@lru_cache(maxsize=COMPILED_SERIALIZERS_CACHE_SIZE)
+def _compile_serializer_cached(
+    schema: Type[BaseModel],
+    resource_type: str,
+    includes: Tuple[str, ...],
+    fields: SparseFieldsets,
+) -> CompiledSerializer:
+    root = _compile_node(
+        schema=schema,
+        resource_type=resource_type,
+        includes=[tuple(include.split(SPLIT_REL)) for include in includes],
+        fields=dict(fields),
+    )
+    return CompiledSerializer(root=root, has_includes=bool(includes))
+
+
+def compile_serializer(
+    schema: Type[BaseModel],
+    resource_type: str,
+    includes: Iterable[str],
+    fields: Dict[str, Iterable[str]],
+) -> CompiledSerializer:
+    """
+    Get serializer for schema, includes and sparse fieldsets
+
+    Compiled serializers are cached (LRU)
+
+    :param schema: resource schema
+    :param resource_type: resource type
+    :param includes: requested includes
+    :param fields: sparse fieldsets, resource type to requested fields
+    :return:
+    """
+    return _compile_serializer_cached(
+        schema=schema,
+        resource_type=resource_type,
+        # keep order, it's used for relationships order
+        includes=tuple(dict.fromkeys(includes)),
+        fields=tuple(sorted((resource_type, frozenset(names)) for resource_type, names in fields.items())),
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import warnings
 from collections import defaultdict
 from enum import Enum
 from functools import cache
@@ -145,6 +146,17 @@ def handle_jsonapi_fields(
     query_params: QueryStringManager,
     jsonapi: RoutersJSONAPI,
 ) -> Union[JSONAPIResponse, Dict]:
+    """
+    Exclude attributes not requested by sparse fieldsets from the response
+
+    Deprecated: views build response schemas with the requested attributes only
+    (see `SchemaBuilder.get_result_schemas`), responses don't need the second pass.
+    """
+    warnings.warn(
+        "`handle_jsonapi_fields` is deprecated, response schemas are built for sparse fieldsets",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     if not query_params.fields:
         return response
 
@@ -1,41 +1,47 @@
 import inspect
 import logging
 from collections import defaultdict
-from contextvars import ContextVar
+from dataclasses import dataclass, field
 from functools import partial
 from typing import (
     Any,
+    AsyncIterator,
+    Awaitable,
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
     Iterable,
     List,
     Optional,
+    Set,
     Tuple,
     Type,
-    Union,
 )
 
-from fastapi import Request
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel as PydanticBaseModel
-from pydantic.fields import ModelField
 from starlette.concurrency import run_in_threadpool
 
 from fastapi_jsonapi import QueryStringManager, RoutersJSONAPI
-from fastapi_jsonapi.data_layers.base import BaseDataLayer
+from fastapi_jsonapi.data_layers.base import BaseDataLayer, CollectionCursors
 from fastapi_jsonapi.data_typing import (
     TypeModel,
     TypeSchema,
 )
+from fastapi_jsonapi.request_timings import RequestPhase, RequestTimings
 from fastapi_jsonapi.schema import (
     JSONAPIObjectSchema,
+    JSONAPIResultListCursorMetaSchema,
     JSONAPIResultListMetaSchema,
     JSONAPIResultListSchema,
     get_related_schema,
 )
 from fastapi_jsonapi.schema_base import BaseModel, RelationshipInfo
-from fastapi_jsonapi.schema_builder import JSONAPIObjectSchemas
+from fastapi_jsonapi.schema_builder import JSONAPIObjectSchemas, JSONAPIResultSchemas
 from fastapi_jsonapi.splitter import SPLIT_REL
+from fastapi_jsonapi.views.serializer import CompiledSerializer, compile_serializer
 from fastapi_jsonapi.views.utils import (
     HTTPMethod,
     HTTPMethodConfig,
@@ -43,15 +49,47 @@ from fastapi_jsonapi.views.utils import (
 
 logger = logging.getLogger(__name__)
 
-previous_resource_type_ctx_var: ContextVar[str] = ContextVar("previous_resource_type_ctx_var")
-related_field_name_ctx_var: ContextVar[str] = ContextVar("related_field_name_ctx_var")
-relationships_schema_ctx_var: ContextVar[Type[BaseModel]] = ContextVar("relationships_schema_ctx_var")
-object_schema_ctx_var: ContextVar[Type[JSONAPIObjectSchema]] = ContextVar("object_schema_ctx_var")
-included_object_schema_ctx_var: ContextVar[Type[TypeSchema]] = ContextVar("included_object_schema_ctx_var")
-relationship_info_ctx_var: ContextVar[RelationshipInfo] = ContextVar("relationship_info_ctx_var")
+# `(type, id)`
+ObjectKey = Tuple[str, str]
 
-# TODO: just change state on `self`!! (refactor)
-included_objects_ctx_var: ContextVar[Dict[Tuple[str, str], TypeSchema]] = ContextVar("included_objects_ctx_var")
+
+@dataclass
+class IncludedObjects:
+    """
+    Objects collected while processing includes for all items of a response
+
+    Each object is kept once by `(type, id)` key. Relationships are collected
+    separately and attached once, after all includes are processed.
+    """
+
+    root_objects: Dict[ObjectKey, JSONAPIObjectSchema] = field(default_factory=dict)
+    included_objects: Dict[ObjectKey, JSONAPIObjectSchema] = field(default_factory=dict)
+    # key: (object schema with relationships, relationships data by field name)
+    root_relationships: Dict[ObjectKey, Tuple[Type[JSONAPIObjectSchema], Dict[str, BaseModel]]] = field(
+        default_factory=dict,
+    )
+    included_relationships: Dict[ObjectKey, Tuple[Type[JSONAPIObjectSchema], Dict[str, BaseModel]]] = field(
+        default_factory=dict,
+    )
+
+    @classmethod
+    def attach_relationships(
+        cls,
+        objects: Dict[ObjectKey, JSONAPIObjectSchema],
+        relationships: Dict[ObjectKey, Tuple[Type[JSONAPIObjectSchema], Dict[str, BaseModel]]],
+    ):
+        for key, (object_schema, object_relationships) in relationships.items():
+            # no validation here, the result schema validates the whole response
+            objects[key] = object_schema.construct(
+                **{
+                    **dict(objects[key]),
+                    "relationships": object_relationships,
+                },
+            )
+
+    def attach_all_relationships(self):
+        self.attach_relationships(self.root_objects, self.root_relationships)
+        self.attach_relationships(self.included_objects, self.included_relationships)
 
 
 class ViewBase:
@@ -66,17 +104,38 @@ class ViewBase:
         self.request: Request = request
         self.jsonapi: RoutersJSONAPI = jsonapi
         self.options: dict = options
-        self.query_params: QueryStringManager = QueryStringManager(request=request)
+        self.query_params: QueryStringManager = QueryStringManager(
+            request=request,
+            filter_limits=jsonapi.filter_limits,
+        )
+        self.timings: RequestTimings = jsonapi.create_request_timings()
+        # kwargs the last data layer was created with
+        self.data_layer_kwargs: Dict[str, Any] = {}
 
     def _get_data_layer(self, schema: Type[BaseModel], **dl_kwargs):
+        dl_kwargs.setdefault("load_only_requested_fields", self.can_load_only_requested_fields())
+        dl_kwargs.setdefault("response_cache_invalidator", self.jsonapi.invalidate_cached_responses)
+        self.data_layer_kwargs = dl_kwargs
         return self.data_layer_cls(
             request=self.request,
             schema=schema,
             model=self.jsonapi.model,
             type_=self.jsonapi.type_,
+            timings=self.timings,
             **dl_kwargs,
         )
 
+    def can_load_only_requested_fields(self) -> bool:
+        """
+        Check if attributes not requested by sparse fieldsets may be left not loaded
+
+        GET responses rendered with compiled serializer don't read them, responses rendered
+        with pydantic schemas may read them (properties, validators), so it's enabled by the router option.
+        """
+        return self.request.method == "GET" and (
+            self.jsonapi.use_compiled_serializer or self.jsonapi.load_only_requested_fields
+        )
+
     async def get_data_layer(
         self,
         extra_view_deps: Dict[str, Any],
@@ -93,7 +152,8 @@ class ViewBase:
         :param extra_view_deps:
         :return:
         """
-        dl_kwargs = await self.handle_endpoint_dependencies(extra_view_deps)
+        with self.timings.measure(RequestPhase.DEPENDENCIES):
+            dl_kwargs = await self.handle_endpoint_dependencies(extra_view_deps)
         return self._get_data_layer(
             schema=self.jsonapi.schema_detail,
             **dl_kwargs,
@@ -109,7 +169,8 @@ class ViewBase:
         :param extra_view_deps:
         :return:
         """
-        dl_kwargs = await self.handle_endpoint_dependencies(extra_view_deps)
+        with self.timings.measure(RequestPhase.DEPENDENCIES):
+            dl_kwargs = await self.handle_endpoint_dependencies(extra_view_deps)
         return self._get_data_layer(
             schema=self.jsonapi.schema_list,
             **dl_kwargs,
@@ -165,247 +226,211 @@ class ViewBase:
 
         return dl_kwargs
 
-    def _build_response(self, items_from_db: List[TypeModel], item_schema: Type[BaseModel]):
-        return self.process_includes_for_db_items(
-            includes=self.query_params.include,
-            # as list to reuse helper
-            items_from_db=items_from_db,
-            item_schema=item_schema,
+    def _build_response(
+        self,
+        items_from_db: List[TypeModel],
+        item_schema: Type[BaseModel],
+        is_list: bool,
+    ) -> Tuple[List[JSONAPIObjectSchema], JSONAPIResultSchemas, Dict[str, Any]]:
+        includes = self.query_params.include
+        fields = self.query_params.fields
+        # sparse fieldsets are applied by the schemas, excluded attributes are not read at all
+        result_schemas = self.jsonapi.schema_builder.get_result_schemas(
+            name=f"Result{self.__class__.__name__}",
+            schema=item_schema,
+            includes=includes,
+            is_list=is_list,
+            fields=fields,
         )
+        with self.timings.measure(RequestPhase.INCLUDES):
+            result_objects, _, extras = self.process_includes_for_db_items(
+                includes=includes,
+                # as list to reuse helper
+                items_from_db=items_from_db,
+                item_schema=item_schema,
+                object_schemas=result_schemas.object_schemas,
+                fields=fields,
+            )
+        return result_objects, result_schemas, extras
 
     def _build_detail_response(self, db_item: TypeModel):
-        result_objects, object_schemas, extras = self._build_response([db_item], self.jsonapi.schema_detail)
+        result_objects, result_schemas, extras = self._build_response(
+            [db_item],
+            self.jsonapi.schema_detail,
+            is_list=False,
+        )
         # is it ok to do through list?
         result_object = result_objects[0]
 
-        detail_jsonapi_schema = self.jsonapi.schema_builder.build_schema_for_detail_result(
-            name=f"Result{self.__class__.__name__}",
-            object_jsonapi_schema=object_schemas.object_jsonapi_schema,
-            includes_schemas=object_schemas.included_schemas_list,
-        )
+        with self.timings.measure(RequestPhase.SERIALIZATION):
+            return result_schemas.result_schema(data=result_object, **extras)
 
-        return detail_jsonapi_schema(data=result_object, **extras)
+    def _build_list_meta(
+        self,
+        count: int,
+        total_pages: int,
+        cursors: Optional[CollectionCursors] = None,
+    ) -> JSONAPIResultListMetaSchema:
+        if cursors is None:
+            return JSONAPIResultListMetaSchema(count=count, total_pages=total_pages)
+
+        return JSONAPIResultListCursorMetaSchema(
+            count=count,
+            total_pages=total_pages,
+            next_cursor=cursors.next,
+            prev_cursor=cursors.prev,
+        )
 
     def _build_list_response(
         self,
         items_from_db: List[TypeModel],
         count: int,
         total_pages: int,
+        cursors: Optional[CollectionCursors] = None,
     ) -> JSONAPIResultListSchema:
-        result_objects, object_schemas, extras = self._build_response(items_from_db, self.jsonapi.schema_list)
-
-        # we need to build a new schema here
-        # because we'd like to exclude some fields (relationships, includes, etc)
-        list_jsonapi_schema = self.jsonapi.schema_builder.build_schema_for_list_result(
-            name=f"Result{self.__class__.__name__}",
-            object_jsonapi_schema=object_schemas.object_jsonapi_schema,
-            includes_schemas=object_schemas.included_schemas_list,
-        )
-        return list_jsonapi_schema(
-            meta=JSONAPIResultListMetaSchema(count=count, total_pages=total_pages),
-            data=result_objects,
-            **extras,
+        result_objects, result_schemas, extras = self._build_response(
+            items_from_db,
+            self.jsonapi.schema_list,
+            is_list=True,
         )
 
-    # data preparing below:
+        # result schema excludes some fields (relationships, includes, etc)
+        # it's built for these includes and reused for the next requests
+        with self.timings.measure(RequestPhase.SERIALIZATION):
+            return result_schemas.result_schema(
+                meta=self._build_list_meta(count, total_pages, cursors),
+                data=result_objects,
+                **extras,
+            )
 
-    @classmethod
-    def get_db_item_id(cls, item_from_db: TypeModel):
+    def get_response_resource_types(self) -> Optional[FrozenSet[str]]:
         """
-        just converts to str. maybe needs another approach
+        Resource types of objects the response may contain: own type and types of requested includes
 
-        TODO: check if id is None? raise?
-        TODO: any another conversion for id to string?
-        :param item_from_db:
+        :return: resource types or `None` if any include isn't a relationship (the request is invalid)
+        """
+        resource_types = {self.jsonapi.type_}
+        for include in self.query_params.include:
+            schema = self.jsonapi.schema_detail
+            for related_field_name in include.split(SPLIT_REL):
+                if (relation_field := schema.__fields__.get(related_field_name)) is None:
+                    return None
+                relationship_info = relation_field.field_info.extra.get("relationship")
+                if not isinstance(relationship_info, RelationshipInfo):
+                    return None
+                resource_types.add(relationship_info.resource_type)
+                schema = relation_field.type_
+
+        return frozenset(resource_types)
+
+    async def handle_cached_response(
+        self,
+        build: Callable[[], Awaitable[Any]],
+        extra_view_deps: Dict[str, Any],
+        obj_id: Optional[str] = None,
+    ) -> Any:
+        """
+        Serve GET response from the router response cache, response is built and stored on cache miss
+
+        :param build: builds the response
+        :param extra_view_deps: solved view dependencies, passed to the cache key builder
+        :param obj_id: object id for detail responses
         :return:
         """
-        return str(item_from_db.id)
+        response_cache = self.jsonapi.response_cache
+        if response_cache is None:
+            return await build()
 
-    @classmethod
-    def prepare_related_object_data(
-        cls,
-        item_from_db: TypeModel,
-    ) -> Tuple[Dict[str, Union[str, int]], Optional[TypeSchema]]:
-        included_object_schema: Type[TypeSchema] = included_object_schema_ctx_var.get()
-        relationship_info: RelationshipInfo = relationship_info_ctx_var.get()
-        item_id = cls.get_db_item_id(item_from_db)
-        data_for_relationship = {"id": item_id}
-        processed_object = included_object_schema(
-            id=item_id,
-            attributes=item_from_db,
-            type=relationship_info.resource_type,
-        )
+        # invalid includes are reported by the view, error responses aren't cached
+        if (resource_types := self.get_response_resource_types()) is None:
+            return await build()
 
-        return data_for_relationship, processed_object
+        key = await response_cache.build_key(self.request, self.jsonapi.type_, extra_view_deps, obj_id)
+        if key is None:
+            return await build()
 
-    @classmethod
-    def prepare_data_for_relationship(
-        cls,
-        related_db_item: Union[List[TypeModel], TypeModel],
-    ) -> Tuple[Optional[Dict[str, Union[str, int]]], List[TypeSchema]]:
-        included_objects = []
-        if related_db_item is None:
-            return None, included_objects
-
-        data_for_relationship, processed_object = cls.prepare_related_object_data(
-            item_from_db=related_db_item,
+        return await response_cache.get_or_build_response(
+            request=self.request,
+            key=key,
+            resource_types=resource_types,
+            build=build,
         )
-        if processed_object:
-            included_objects.append(processed_object)
-        return data_for_relationship, included_objects
 
-    @classmethod
-    def update_related_object(
-        cls,
-        relationship_data: Union[Dict[str, str], List[Dict[str, str]]],
-        cache_key: Tuple[str, str],
-        related_field_name: str,
-    ):
-        relationships_schema: Type[BaseModel] = relationships_schema_ctx_var.get()
-        object_schema: Type[JSONAPIObjectSchema] = object_schema_ctx_var.get()
-        included_objects: Dict[Tuple[str, str], TypeSchema] = included_objects_ctx_var.get()
-
-        relationship_data_schema = get_related_schema(relationships_schema, related_field_name)
-        parent_included_object = included_objects.get(cache_key)
-        new_relationships = {}
-        if hasattr(parent_included_object, "relationships") and parent_included_object.relationships:
-            existing = parent_included_object.relationships or {}
-            if isinstance(existing, BaseModel):
-                existing = existing.dict()
-            new_relationships.update(existing)
-        new_relationships.update(
-            **{
-                related_field_name: relationship_data_schema(
-                    data=relationship_data,
-                ),
-            },
-        )
-        included_objects[cache_key] = object_schema.parse_obj(
-            parent_included_object,
-        ).copy(
-            update={"relationships": new_relationships},
+    def _get_compiled_serializer(self, item_schema: Type[BaseModel]) -> CompiledSerializer:
+        return compile_serializer(
+            schema=item_schema,
+            resource_type=self.jsonapi.type_,
+            includes=self.query_params.include,
+            fields=self.query_params.fields,
         )
 
-    @classmethod
-    def update_known_included(
-        cls,
-        new_included: List[TypeSchema],
-    ):
-        included_objects: Dict[Tuple[str, str], TypeSchema] = included_objects_ctx_var.get()
-
-        for included in new_included:
-            key = (included.id, included.type)
-            if key not in included_objects:
-                included_objects[key] = included
+    def _serialize_detail_response(self, db_item: TypeModel) -> Response:
+        with self.timings.measure(RequestPhase.SERIALIZATION):
+            serializer = self._get_compiled_serializer(self.jsonapi.schema_detail)
+            content = serializer.serialize_detail(db_item, get_item_id=self.get_db_item_id)
 
-    @classmethod
-    def process_single_db_item_and_prepare_includes(
-        cls,
-        parent_db_item: TypeModel,
-    ):
-        previous_resource_type: str = previous_resource_type_ctx_var.get()
-        related_field_name: str = related_field_name_ctx_var.get()
-
-        next_current_db_item = []
-        cache_key = (cls.get_db_item_id(parent_db_item), previous_resource_type)
-        current_db_item = getattr(parent_db_item, related_field_name)
-        current_is_single = False
-        if not isinstance(current_db_item, Iterable):
-            # hack to do less if/else
-            current_db_item = [current_db_item]
-            current_is_single = True
-        relationship_data_items = []
-
-        for db_item in current_db_item:
-            next_current_db_item.append(db_item)
-            data_for_relationship, new_included = cls.prepare_data_for_relationship(
-                related_db_item=db_item,
-            )
+        return Response(content=content, media_type="application/json")
 
-            cls.update_known_included(
-                new_included=new_included,
+    def _serialize_list_response(
+        self,
+        items_from_db: List[TypeModel],
+        count: int,
+        total_pages: int,
+        cursors: Optional[CollectionCursors] = None,
+    ) -> Response:
+        with self.timings.measure(RequestPhase.SERIALIZATION):
+            serializer = self._get_compiled_serializer(self.jsonapi.schema_list)
+            content = serializer.serialize_list(
+                items_from_db,
+                meta=self._build_list_meta(count, total_pages, cursors).dict(by_alias=True),
+                get_item_id=self.get_db_item_id,
             )
-            relationship_data_items.append(data_for_relationship)
 
-        if current_is_single:
-            # if initially was single, get back one dict
-            # hack to do less if/else
-            relationship_data_items = relationship_data_items[0]
+        return Response(content=content, media_type="application/json")
 
-        cls.update_related_object(
-            relationship_data=relationship_data_items,
-            cache_key=cache_key,
-            related_field_name=related_field_name,
+    def _stream_list_response(
+        self,
+        partitions: AsyncIterator[List[TypeModel]],
+        count: int,
+        total_pages: int,
+    ) -> StreamingResponse:
+        serializer = self._get_compiled_serializer(self.jsonapi.schema_list)
+        return StreamingResponse(
+            content=serializer.iter_list(
+                partitions,
+                meta=self._build_list_meta(count, total_pages).dict(by_alias=True),
+                get_item_id=self.get_db_item_id,
+            ),
+            media_type="application/json",
         )
 
-        return next_current_db_item
+    # data preparing below:
 
     @classmethod
-    def process_db_items_and_prepare_includes(
-        cls,
-        parent_db_items: List[TypeModel],
-    ):
-        next_current_db_item = []
-
-        for parent_db_item in parent_db_items:
-            new_next_items = cls.process_single_db_item_and_prepare_includes(
-                parent_db_item=parent_db_item,
-            )
-            next_current_db_item.extend(new_next_items)
-        return next_current_db_item
-
-    def process_include_with_nested(
-        self,
-        include: str,
-        current_db_item: Union[List[TypeModel], TypeModel],
-        item_as_schema: TypeSchema,
-        current_relation_schema: Type[TypeSchema],
-        included_objects: Dict[Tuple[str, str], TypeSchema],
-        requested_includes: Dict[str, Iterable[str]],
-    ) -> Tuple[Dict[str, TypeSchema], List[JSONAPIObjectSchema]]:
-        root_item_key = (item_as_schema.id, item_as_schema.type)
+    def get_db_item_id(cls, item_from_db: TypeModel):
+        """
+        just converts to str. maybe needs another approach
 
-        if root_item_key not in included_objects:
-            included_objects[root_item_key] = item_as_schema
-        previous_resource_type = item_as_schema.type
+        TODO: check if id is None? raise?
+        TODO: any another conversion for id to string?
+        :param item_from_db:
+        :return:
+        """
+        return str(item_from_db.id)
 
-        previous_related_field_name = previous_resource_type
-        for related_field_name in include.split(SPLIT_REL):
-            object_schemas = self.jsonapi.schema_builder.create_jsonapi_object_schemas(
-                schema=current_relation_schema,
-                includes=requested_includes[previous_related_field_name],
-                compute_included_schemas=True,
-            )
-            relationships_schema = object_schemas.relationships_schema
-            schemas_include = object_schemas.can_be_included_schemas
-
-            current_relation_field: ModelField = current_relation_schema.__fields__[related_field_name]
-            current_relation_schema: Type[TypeSchema] = current_relation_field.type_
-
-            relationship_info: RelationshipInfo = current_relation_field.field_info.extra["relationship"]
-            included_object_schema: Type[JSONAPIObjectSchema] = schemas_include[related_field_name]
-
-            if not isinstance(current_db_item, Iterable):
-                # xxx: less if/else
-                current_db_item = [current_db_item]
-
-            # ctx vars to skip multi-level args passing
-            relationships_schema_ctx_var.set(relationships_schema)
-            object_schema_ctx_var.set(object_schemas.object_jsonapi_schema)
-            previous_resource_type_ctx_var.set(previous_resource_type)
-            related_field_name_ctx_var.set(related_field_name)
-            relationship_info_ctx_var.set(relationship_info)
-            included_object_schema_ctx_var.set(included_object_schema)
-            included_objects_ctx_var.set(included_objects)
-
-            current_db_item = self.process_db_items_and_prepare_includes(
-                parent_db_items=current_db_item,
-            )
+    def prep_include_tree(self, includes: Iterable[str]) -> Dict[str, dict]:
+        """
+        Merge includes to the tree, so common prefixes are processed once
 
-            previous_resource_type = relationship_info.resource_type
-            previous_related_field_name = related_field_name
+        `a.b.c,a.b.d` -> `{"a": {"b": {"c": {}, "d": {}}}}`
+        """
+        include_tree: Dict[str, dict] = {}
+        for include in includes:
+            node = include_tree
+            for related_field_name in include.split(SPLIT_REL):
+                node = node.setdefault(related_field_name, {})
 
-        return included_objects.pop(root_item_key), list(included_objects.values())
+        return include_tree
 
     def prep_requested_includes(self, includes: Iterable[str]):
         requested_includes: Dict[str, set[str]] = defaultdict(set)
@@ -418,66 +443,160 @@ class ViewBase:
 
         return requested_includes
 
-    def process_db_object(
-        self,
-        includes: List[str],
-        item: TypeModel,
-        item_schema: Type[TypeSchema],
-        object_schemas: JSONAPIObjectSchemas,
+    @classmethod
+    def collect_relationship(
+        cls,
+        relationships: Dict[ObjectKey, Tuple[Type[JSONAPIObjectSchema], Dict[str, BaseModel]]],
+        key: ObjectKey,
+        object_schema: Type[JSONAPIObjectSchema],
+        related_field_name: str,
+        relationship_data: BaseModel,
     ):
-        included_objects = []
+        _, object_relationships = relationships.get(key, (object_schema, {}))
+        object_relationships[related_field_name] = relationship_data
+        relationships[key] = (object_schema, object_relationships)
 
-        item_as_schema = object_schemas.object_jsonapi_schema(
-            id=self.get_db_item_id(item),
-            attributes=object_schemas.attributes_schema.from_orm(item),
+    def process_include_tree(
+        self,
+        include_tree: Dict[str, dict],
+        parents: Dict[ObjectKey, Tuple[TypeModel, Set[ObjectKey]]],
+        parent_schema: Type[TypeSchema],
+        parent_resource_type: str,
+        parent_related_field_name: str,
+        requested_includes: Dict[str, Iterable[str]],
+        objects: IncludedObjects,
+        fields: Optional[Dict[str, Set[str]]] = None,
+    ):
+        """
+        Process one level of includes for all parents at once
+
+        :param include_tree: includes left to process from this level
+        :param parents: db items of this level by key, with keys of the root items they were reached from
+        :param parent_schema: schema of the parents
+        :param parent_resource_type: resource type of the parents
+        :param parent_related_field_name: relationship name the parents were reached by
+        :param requested_includes: requested includes by relationship name
+        :param objects: collected objects
+        :param fields: sparse fieldsets, resource type to requested fields
+        """
+        object_schemas = self.jsonapi.schema_builder.create_object_schemas_for_includes(
+            schema=parent_schema,
+            includes=requested_includes[parent_related_field_name],
+            resource_type=parent_resource_type,
+            fields=fields,
         )
-
-        cache_included_objects: Dict[Tuple[str, str], TypeSchema] = {}
-        requested_includes = self.prep_requested_includes(includes)
-
-        for include in includes:
-            item_as_schema, new_included_objects = self.process_include_with_nested(
-                include=include,
-                current_db_item=item,
-                item_as_schema=item_as_schema,
-                current_relation_schema=item_schema,
-                included_objects=cache_included_objects,
-                requested_includes=requested_includes,
-            )
-
-            included_objects.extend(new_included_objects)
-
-        return item_as_schema, included_objects
+        object_schema = object_schemas.object_jsonapi_schema
+
+        for related_field_name, nested_include_tree in include_tree.items():
+            relation_field = parent_schema.__fields__[related_field_name]
+            relationship_info: RelationshipInfo = relation_field.field_info.extra["relationship"]
+            included_object_schema = object_schemas.can_be_included_schemas[related_field_name]
+            relationship_data_schema = get_related_schema(object_schemas.relationships_schema, related_field_name)
+
+            related_items: Dict[ObjectKey, Tuple[TypeModel, Set[ObjectKey]]] = {}
+            for parent_key, (parent_db_item, root_keys) in parents.items():
+                related_db_items = getattr(parent_db_item, related_field_name)
+                is_single = not isinstance(related_db_items, Iterable)
+                if is_single:
+                    related_db_items = [related_db_items]
+
+                relationship_data_items = []
+                for related_db_item in related_db_items:
+                    if related_db_item is None:
+                        relationship_data_items.append(None)
+                        continue
+
+                    item_id = self.get_db_item_id(related_db_item)
+                    relationship_data_items.append({"id": item_id})
+                    key = (relationship_info.resource_type, item_id)
+                    if key in related_items:
+                        related_items[key][1].update(root_keys)
+                    else:
+                        related_items[key] = (related_db_item, set(root_keys))
+
+                relationship_data = relationship_data_schema(
+                    data=relationship_data_items[0] if is_single else relationship_data_items,
+                )
+                # root item reached from itself is not included, it's updated in place
+                if parent_key in root_keys:
+                    self.collect_relationship(
+                        objects.root_relationships,
+                        parent_key,
+                        object_schema,
+                        related_field_name,
+                        relationship_data,
+                    )
+                if root_keys - {parent_key}:
+                    self.collect_relationship(
+                        objects.included_relationships,
+                        parent_key,
+                        object_schema,
+                        related_field_name,
+                        relationship_data,
+                    )
+
+            for key, (related_db_item, root_keys) in related_items.items():
+                if key not in objects.included_objects and root_keys - {key}:
+                    objects.included_objects[key] = included_object_schema(
+                        id=key[1],
+                        attributes=related_db_item,
+                        type=relationship_info.resource_type,
+                    )
+
+            if nested_include_tree:
+                self.process_include_tree(
+                    include_tree=nested_include_tree,
+                    parents=related_items,
+                    parent_schema=relation_field.type_,
+                    parent_resource_type=relationship_info.resource_type,
+                    parent_related_field_name=related_field_name,
+                    requested_includes=requested_includes,
+                    objects=objects,
+                    fields=fields,
+                )
 
     def process_includes_for_db_items(
         self,
         includes: List[str],
         items_from_db: List[TypeModel],
         item_schema: Type[TypeSchema],
+        object_schemas: Optional[JSONAPIObjectSchemas] = None,
+        fields: Optional[Dict[str, Set[str]]] = None,
     ):
-        object_schemas = self.jsonapi.schema_builder.create_jsonapi_object_schemas(
-            schema=item_schema,
-            includes=includes,
-            compute_included_schemas=bool(includes),
-            use_schema_cache=False,
-        )
+        if object_schemas is None:
+            object_schemas = self.jsonapi.schema_builder.create_jsonapi_object_schemas(
+                schema=item_schema,
+                includes=includes,
+                compute_included_schemas=bool(includes),
+                use_schema_cache=False,
+                fields=fields,
+            )
 
-        result_objects = []
-        # form:
-        # `(type, id): serialized_object`
-        # helps to exclude duplicates
-        included_objects: Dict[Tuple[str, str], TypeSchema] = {}
+        objects = IncludedObjects()
+        root_keys = []
         for item in items_from_db:
-            jsonapi_object, new_included = self.process_db_object(
-                includes=includes,
-                item=item,
-                item_schema=item_schema,
-                object_schemas=object_schemas,
+            item_as_schema = object_schemas.object_jsonapi_schema(
+                id=self.get_db_item_id(item),
+                attributes=object_schemas.attributes_schema.from_orm(item),
             )
-            result_objects.append(jsonapi_object)
-            for included in new_included:
-                # update too?
-                included_objects[(included.type, included.id)] = included
+            key = (item_as_schema.type, item_as_schema.id)
+            root_keys.append(key)
+            objects.root_objects[key] = item_as_schema
+
+        if includes:
+            self.process_include_tree(
+                include_tree=self.prep_include_tree(includes),
+                parents={key: (item, {key}) for key, item in zip(root_keys, items_from_db)},
+                parent_schema=item_schema,
+                parent_resource_type=self.jsonapi.type_,
+                parent_related_field_name=self.jsonapi.type_,
+                requested_includes=self.prep_requested_includes(includes),
+                objects=objects,
+                fields=fields,
+            )
+            objects.attach_all_relationships()
+
+        result_objects = [objects.root_objects[key] for key in root_keys]
 
         extras = {}
         if includes:
@@ -488,7 +607,7 @@ class ViewBase:
                     # ignore key
                     value
                     # sort for prettiness
-                    for key, value in sorted(included_objects.items())
+                    for key, value in sorted(objects.included_objects.items())
                 ],
             )
 
@@ -0,0 +1,35 @@
+"""
+Compare two benchmark results
+
+    python -m tests.benchmarks.compare before.json after.json
+"""
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+BenchmarkKey = Tuple[str, str]
+
+
+def load_benchmarks(path: str) -> Dict[BenchmarkKey, Dict[str, Any]]:
+    results = json.loads(Path(path).read_text())
+    return {
+        (benchmark["name"], json.dumps(benchmark["params"], sort_keys=True)): benchmark
+        for benchmark in results["benchmarks"]
+    }
+
+
+def compare(before_path: str, after_path: str, metric: str = "median_ms") -> str:
+    before, after = load_benchmarks(before_path), load_benchmarks(after_path)
+    lines = [f"{'benchmark':<90} {'before':>10} {'after':>10} {'change':>8}"]
+    for key in sorted(before.keys() & after.keys()):
+        name, params = key
+        before_value, after_value = before[key][metric], after[key][metric]
+        change = (after_value - before_value) / before_value * 100 if before_value else 0.0
+        lines.append(f"{name + ' ' + params:<90} {before_value:>10.2f} {after_value:>10.2f} {change:>+7.1f}%")
+
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(compare(*sys.argv[1:]))  # noqa: T201
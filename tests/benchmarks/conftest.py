@@ -0,0 +1,69 @@
+"""
+Request path benchmarks
+
+Skipped by default, run them with::
+
+    BENCHMARKS=1 pytest tests/benchmarks
+
+Results are written as JSON to `BENCHMARK_OUTPUT` (`benchmark_results.json` by default),
+compare two runs with `python -m tests.benchmarks.compare before.json after.json`.
+"""
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from pytest import MonkeyPatch, fixture  # noqa PT013
+from pytest_asyncio import fixture as async_fixture
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import sessionmaker
+
+from tests.benchmarks.dataset import create_dataset
+from tests.benchmarks.runner import BENCHMARK_OUTPUT, BENCHMARKS_ENABLED, BenchmarkRunner, benchmark_results
+from tests.fixtures import db_connection
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+
+
+def pytest_collection_modifyitems(config, items):
+    if BENCHMARKS_ENABLED:
+        return
+
+    skip_benchmark = pytest.mark.skip(reason="set BENCHMARKS=1 to run benchmarks")
+    for item in items:
+        if BENCHMARKS_DIR in item.path.parents:
+            item.add_marker(skip_benchmark)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if benchmark_results.results:
+        benchmark_results.dump(Path(BENCHMARK_OUTPUT))
+
+
+@async_fixture(autouse=True)
+async def refresh_db():
+    """
+    Benchmarks share the dataset, it's created once per class
+    """
+    yield
+
+
+@fixture(scope="class")
+def benchmark_session_maker(async_session_plain: sessionmaker):
+    """
+    Reuse one engine for all requests (the test views create an engine on each request)
+    """
+    with MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(db_connection, "get_async_sessionmaker", lambda: async_session_plain)
+        yield async_session_plain
+
+
+@async_fixture(scope="class")
+async def benchmark_dataset(async_engine: AsyncEngine, benchmark_session_maker):
+    await create_dataset(async_engine)
+
+
+@async_fixture()
+async def benchmark(app: FastAPI, benchmark_dataset) -> BenchmarkRunner:
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield BenchmarkRunner(client=client, results=benchmark_results)
@@ -0,0 +1,56 @@
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from tests.models import Base, Computer, Post, PostComment, User, UserBio
+
+USERS_COUNT = 200
+POSTS_PER_USER = 3
+COMMENTS_PER_POST = 2
+
+
+async def create_dataset(async_engine: AsyncEngine):
+    """
+    Recreate users with bio, computer, posts and comments by other users
+    """
+    async with async_engine.begin() as connector:
+        for table in reversed(Base.metadata.sorted_tables):
+            await connector.execute(table.delete())
+
+        users = [
+            {"id": user_id, "name": f"user-{user_id}", "age": user_id % 90, "email": f"user-{user_id}@example.com"}
+            for user_id in range(1, USERS_COUNT + 1)
+        ]
+        await connector.execute(insert(User), users)
+        await connector.execute(
+            insert(UserBio),
+            [{"user_id": user["id"], "birth_city": "Moscow", "favourite_movies": "Inception"} for user in users],
+        )
+        await connector.execute(
+            insert(Computer),
+            [{"name": f"computer-{user['id']}", "user_id": user["id"]} for user in users],
+        )
+
+        posts = [
+            {
+                "id": (user["id"] - 1) * POSTS_PER_USER + post_number,
+                "title": f"post-{post_number}",
+                "body": "Lorem ipsum",
+                "user_id": user["id"],
+            }
+            for user in users
+            for post_number in range(1, POSTS_PER_USER + 1)
+        ]
+        await connector.execute(insert(Post), posts)
+        await connector.execute(
+            insert(PostComment),
+            [
+                {
+                    "text": f"comment-{comment_number}",
+                    "post_id": post["id"],
+                    # comment by the next user
+                    "author_id": post["user_id"] % USERS_COUNT + 1,
+                }
+                for post in posts
+                for comment_number in range(COMMENTS_PER_POST)
+            ],
+        )
@@ -0,0 +1,121 @@
+import json
+import platform
+import statistics
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from os import getenv
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List
+
+from httpx import AsyncClient, Response
+
+from tests.common import sqla_uri
+
+BENCHMARKS_ENABLED = getenv("BENCHMARKS", "").lower() in {"1", "true", "yes"}
+BENCHMARK_OUTPUT = getenv("BENCHMARK_OUTPUT", "benchmark_results.json")
+BENCHMARK_ROUNDS = int(getenv("BENCHMARK_ROUNDS", "50"))
+BENCHMARK_WARMUP_ROUNDS = int(getenv("BENCHMARK_WARMUP_ROUNDS", "5"))
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    params: Dict[str, Any]
+    # seconds
+    timings: List[float]
+
+    def as_dict(self) -> Dict[str, Any]:
+        timings_ms = sorted(timing * 1000 for timing in self.timings)
+        quantiles = [timings_ms[0]] * 99
+        if len(timings_ms) > 1:
+            quantiles = statistics.quantiles(timings_ms, n=100, method="inclusive")
+        return {
+            "name": self.name,
+            "params": self.params,
+            "rounds": len(timings_ms),
+            "min_ms": timings_ms[0],
+            "max_ms": timings_ms[-1],
+            "mean_ms": statistics.fmean(timings_ms),
+            "median_ms": statistics.median(timings_ms),
+            "p95_ms": quantiles[94],
+            "p99_ms": quantiles[98],
+            "stdev_ms": statistics.stdev(timings_ms) if len(timings_ms) > 1 else 0.0,
+            # requests are sent one by one
+            "requests_per_second": len(timings_ms) / sum(self.timings),
+        }
+
+
+@dataclass
+class BenchmarkResults:
+    results: List[BenchmarkResult] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "meta": {
+                "commit": get_git_commit(),
+                "created_at": datetime.now(tz=timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "database": sqla_uri().split(":", 1)[0],
+                "rounds": BENCHMARK_ROUNDS,
+                "warmup_rounds": BENCHMARK_WARMUP_ROUNDS,
+            },
+            "benchmarks": [result.as_dict() for result in self.results],
+        }
+
+    def dump(self, path: Path):
+        path.write_text(json.dumps(self.as_dict(), indent=2))
+
+
+benchmark_results = BenchmarkResults()
+
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+class BenchmarkRunner:
+    def __init__(self, client: AsyncClient, results: BenchmarkResults):
+        self.client = client
+        self.results = results
+
+    async def run(
+        self,
+        name: str,
+        send_request: Callable[[AsyncClient], Awaitable[Response]],
+        expected_status: int,
+        **params,
+    ) -> BenchmarkResult:
+        """
+        Send request sequentially and save timings
+
+        :param name: benchmark name
+        :param send_request: sends one request with the passed client
+        :param expected_status: response status, checked on each round
+        :param params: benchmark parameters to save with the result
+        :return:
+        """
+        for _ in range(BENCHMARK_WARMUP_ROUNDS):
+            response = await send_request(self.client)
+            assert response.status_code == expected_status, response.text
+
+        timings = []
+        for _ in range(BENCHMARK_ROUNDS):
+            started_at = perf_counter()
+            response = await send_request(self.client)
+            timings.append(perf_counter() - started_at)
+            assert response.status_code == expected_status, response.text
+
+        result = BenchmarkResult(name=name, params=params, timings=timings)
+        self.results.results.append(result)
+        return result
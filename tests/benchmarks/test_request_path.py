@@ -0,0 +1,164 @@
+from itertools import count
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from tests.benchmarks.dataset import USERS_COUNT
+from tests.benchmarks.runner import BenchmarkRunner
+
+pytestmark = pytest.mark.asyncio
+
+# new users on each write round, names are unique
+user_numbers = count(USERS_COUNT + 1)
+
+
+class TestGetListBenchmarks:
+    @pytest.mark.parametrize("page_size", [10, 50, 100])
+    async def test_page_size(self, benchmark: BenchmarkRunner, page_size: int):
+        async def send_request(client: AsyncClient):
+            return await client.get("/users", params={"page[size]": page_size})
+
+        await benchmark.run(
+            "get_list.page_size",
+            send_request,
+            status.HTTP_200_OK,
+            page_size=page_size,
+        )
+
+    @pytest.mark.parametrize(
+        "include",
+        [
+            "bio",
+            "posts",
+            "posts,bio,computers",
+            "posts.comments",
+            "posts.comments.author",
+        ],
+    )
+    async def test_include(self, benchmark: BenchmarkRunner, include: str):
+        async def send_request(client: AsyncClient):
+            return await client.get("/users", params={"page[size]": 50, "include": include})
+
+        await benchmark.run(
+            "get_list.include",
+            send_request,
+            status.HTTP_200_OK,
+            page_size=50,
+            include=include,
+        )
+
+    @pytest.mark.parametrize(
+        "filter_params",
+        [
+            {"filter[name]": "user-10"},
+            {"filter": '[{"name": "age", "op": "ge", "val": 30}]'},
+            {"filter": '[{"name": "posts.title", "op": "eq", "val": "post-1"}]'},
+            {
+                "filter": (
+                    '[{"or": [{"name": "age", "op": "lt", "val": 20}, {"name": "bio.birth_city", "op": "eq", '
+                    '"val": "Moscow"}]}]'
+                ),
+            },
+        ],
+    )
+    async def test_filter(self, benchmark: BenchmarkRunner, filter_params: dict):
+        async def send_request(client: AsyncClient):
+            return await client.get("/users", params={"page[size]": 50, **filter_params})
+
+        await benchmark.run(
+            "get_list.filter",
+            send_request,
+            status.HTTP_200_OK,
+            page_size=50,
+            **filter_params,
+        )
+
+    @pytest.mark.parametrize("sort", ["name", "-age,name", "bio.birth_city"])
+    async def test_sort(self, benchmark: BenchmarkRunner, sort: str):
+        async def send_request(client: AsyncClient):
+            return await client.get("/users", params={"page[size]": 50, "sort": sort})
+
+        await benchmark.run(
+            "get_list.sort",
+            send_request,
+            status.HTTP_200_OK,
+            page_size=50,
+            sort=sort,
+        )
+
+    @pytest.mark.parametrize(
+        "fields_params",
+        [
+            {"fields[user]": "name"},
+            {"fields[user]": "name,posts", "fields[post]": "title", "include": "posts"},
+        ],
+    )
+    async def test_sparse_fieldsets(self, benchmark: BenchmarkRunner, fields_params: dict):
+        async def send_request(client: AsyncClient):
+            return await client.get("/users", params={"page[size]": 50, **fields_params})
+
+        await benchmark.run(
+            "get_list.fields",
+            send_request,
+            status.HTTP_200_OK,
+            page_size=50,
+            **fields_params,
+        )
+
+
+class TestGetDetailBenchmarks:
+    @pytest.mark.parametrize("include", ["", "posts", "posts.comments.author"])
+    async def test_include(self, benchmark: BenchmarkRunner, include: str):
+        params = {"include": include} if include else {}
+
+        async def send_request(client: AsyncClient):
+            return await client.get("/users/1", params=params)
+
+        await benchmark.run(
+            "get_detail.include",
+            send_request,
+            status.HTTP_200_OK,
+            include=include,
+        )
+
+
+class TestWriteBenchmarks:
+    async def test_post(self, benchmark: BenchmarkRunner):
+        async def send_request(client: AsyncClient):
+            user_number = next(user_numbers)
+            return await client.post(
+                "/users",
+                json={"data": {"attributes": {"name": f"user-{user_number}", "age": 30}}},
+            )
+
+        await benchmark.run("post", send_request, status.HTTP_201_CREATED)
+
+    async def test_patch(self, benchmark: BenchmarkRunner):
+        async def send_request(client: AsyncClient):
+            return await client.patch(
+                "/users/1",
+                # name is required by the patch schema, it's kept and age is changed on each round
+                json={"data": {"id": "1", "attributes": {"name": "user-1", "age": next(user_numbers) % 90}}},
+            )
+
+        await benchmark.run("patch", send_request, status.HTTP_200_OK)
+
+    @pytest.mark.parametrize("batch_size", [1, 10, 50])
+    async def test_atomic_add(self, benchmark: BenchmarkRunner, batch_size: int):
+        async def send_request(client: AsyncClient):
+            operations = [
+                {
+                    "op": "add",
+                    "data": {"type": "user", "attributes": {"name": f"user-{next(user_numbers)}", "age": 30}},
+                }
+                for _ in range(batch_size)
+            ]
+            return await client.post("/operations", json={"atomic:operations": operations})
+
+        await benchmark.run(
+            "atomic.add",
+            send_request,
+            status.HTTP_200_OK,
+            batch_size=batch_size,
+        )
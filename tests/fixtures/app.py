@@ -233,6 +233,7 @@ def build_app_custom(
     class_list: Type[ListViewBase] = ListViewBaseGeneric,
     class_detail: Type[DetailViewBase] = DetailViewBaseGeneric,
     max_cache_size: int = 0,
+    **routers_kwargs,
 ) -> FastAPI:
     router: APIRouter = APIRouter()
 
@@ -248,6 +249,7 @@ def build_app_custom(
         schema_in_post=schema_in_post,
         model=model,
         max_cache_size=max_cache_size,
+        **routers_kwargs,
     )
 
     app = build_app_plain()
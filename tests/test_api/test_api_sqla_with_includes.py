@@ -411,7 +411,7 @@ class TestGetUsersList:
         }
 
         expected_len_with_cache = 6
-        expected_len_without_cache = 10
+        expected_len_without_cache = 8
 
         with patch.object(
             SchemaBuilder,
@@ -507,12 +507,6 @@ class TestGetUsersList:
                             includes=["posts"],
                             non_optional_relationships=False,
                         ),
-                        call(
-                            base_name="UserSchema",
-                            schema=UserSchema,
-                            includes=["posts"],
-                            non_optional_relationships=False,
-                        ),  # duplicate
                         call(
                             base_name="UserSchema",
                             schema=UserSchema,
@@ -531,12 +525,6 @@ class TestGetUsersList:
                             includes=[],
                             non_optional_relationships=False,
                         ),  # duplicate
-                        call(
-                            base_name="PostSchema",
-                            schema=PostSchema,
-                            includes=[],
-                            non_optional_relationships=False,
-                        ),  # duplicate
                         call(
                             base_name="PostSchema",
                             schema=PostSchema,
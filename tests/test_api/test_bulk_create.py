@@ -0,0 +1,111 @@
+from contextlib import suppress
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_jsonapi import RoutersJSONAPI
+from tests.fixtures.app import build_app_custom
+from tests.misc.utils import fake
+from tests.models import Computer, User
+from tests.schemas import UserAttributesBaseSchema, UserInSchema, UserPatchSchema, UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+BULK_RESOURCE_TYPE = "user_bulk"
+
+USERS_TO_CREATE = 3
+
+
+def build_user_attributes() -> dict:
+    return UserAttributesBaseSchema(
+        name=fake.name(),
+        age=fake.pyint(),
+        email=fake.email(),
+    ).dict()
+
+
+@pytest.fixture()
+def app_bulk(app: FastAPI) -> FastAPI:
+    # `app` registers all the other resources (for includes and sparse fieldsets)
+    with suppress(KeyError):
+        RoutersJSONAPI.all_jsonapi_routers.pop(BULK_RESOURCE_TYPE)
+
+    return build_app_custom(
+        model=User,
+        schema=UserSchema,
+        schema_in_post=UserInSchema,
+        schema_in_patch=UserPatchSchema,
+        path="/users-bulk",
+        resource_type=BULK_RESOURCE_TYPE,
+        bulk_create=True,
+    )
+
+
+class TestBulkCreate:
+    async def test_create_objects(self, app_bulk: FastAPI, async_session: AsyncSession):
+        attributes_list = [build_user_attributes() for _ in range(USERS_TO_CREATE)]
+        create_body = {"data": [{"attributes": attributes} for attributes in attributes_list]}
+
+        async with AsyncClient(app=app_bulk, base_url="http://test") as client:
+            response = await client.post("/users-bulk", json=create_body)
+        assert response.status_code == status.HTTP_201_CREATED, response.text
+
+        response_data = response.json()
+        assert response_data["meta"] == {"count": USERS_TO_CREATE, "totalPages": 1}
+        assert [item["attributes"] for item in response_data["data"]] == attributes_list
+        assert {item["type"] for item in response_data["data"]} == {BULK_RESOURCE_TYPE}
+
+        users = (await async_session.execute(select(User).order_by(User.id))).scalars().all()
+        assert [str(user.id) for user in users] == [item["id"] for item in response_data["data"]]
+        assert [user.name for user in users] == [attributes["name"] for attributes in attributes_list]
+
+    async def test_create_objects_with_relationships_and_fetch_include(
+        self,
+        app_bulk: FastAPI,
+        computer_1: Computer,
+        computer_2: Computer,
+    ):
+        computers = [computer_1, computer_2]
+        create_body = {
+            "data": [
+                {
+                    "attributes": build_user_attributes(),
+                    "relationships": {
+                        "computers": {"data": [{"type": "computer", "id": computer.id}]},
+                    },
+                }
+                for computer in computers
+            ],
+        }
+
+        async with AsyncClient(app=app_bulk, base_url="http://test") as client:
+            response = await client.post("/users-bulk", params={"include": "computers"}, json=create_body)
+        assert response.status_code == status.HTTP_201_CREATED, response.text
+
+        response_data = response.json()
+        assert [item["relationships"]["computers"]["data"] for item in response_data["data"]] == [
+            [{"type": "computer", "id": str(computer.id)}] for computer in computers
+        ]
+        assert [(item["type"], item["id"]) for item in response_data["included"]] == [
+            ("computer", str(computer.id)) for computer in computers
+        ]
+
+    async def test_create_single_object(self, app_bulk: FastAPI):
+        attributes = build_user_attributes()
+
+        async with AsyncClient(app=app_bulk, base_url="http://test") as client:
+            response = await client.post("/users-bulk", json={"data": {"attributes": attributes}})
+        assert response.status_code == status.HTTP_201_CREATED, response.text
+
+        response_data = response.json()
+        assert response_data["data"]["attributes"] == attributes
+        assert response_data["meta"] is None
+
+    async def test_bulk_create_disabled(self, app: FastAPI, client: AsyncClient):
+        create_body = {"data": [{"attributes": build_user_attributes()}]}
+
+        response = await client.post(app.url_path_for("get_user_list"), json=create_body)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY, response.text
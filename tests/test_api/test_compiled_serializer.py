@@ -0,0 +1,163 @@
+from contextlib import suppress
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+
+from fastapi_jsonapi import RoutersJSONAPI
+from tests.fixtures.app import build_app_custom
+from tests.models import Post, PostComment, User, UserBio
+from tests.schemas import UserInSchema, UserPatchSchema, UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+COMPILED_RESOURCE_TYPE = "user_compiled_serializer"
+
+
+@pytest.fixture()
+def app_compiled(app: FastAPI) -> FastAPI:
+    # `app` registers all the other resources (for includes and sparse fieldsets)
+    with suppress(KeyError):
+        RoutersJSONAPI.all_jsonapi_routers.pop(COMPILED_RESOURCE_TYPE)
+
+    return build_app_custom(
+        model=User,
+        schema=UserSchema,
+        schema_in_post=UserInSchema,
+        schema_in_patch=UserPatchSchema,
+        path="/users-compiled",
+        resource_type=COMPILED_RESOURCE_TYPE,
+        use_compiled_serializer=True,
+    )
+
+
+def compiled_params(params: dict) -> dict:
+    fields_key = "fields[user]"
+    if fields_key not in params:
+        return params
+    params = dict(params)
+    params[f"fields[{COMPILED_RESOURCE_TYPE}]"] = params.pop(fields_key)
+    return params
+
+
+def replace_primary_type(document: dict) -> dict:
+    data = document["data"]
+    for item in data if isinstance(data, list) else [data]:
+        item["type"] = "user"
+    return document
+
+
+class TestCompiledSerializer:
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},
+            {"include": "posts"},
+            {"include": "posts,bio"},
+            {"fields[user]": "name,age"},
+            {"include": "posts", "fields[post]": "title", "fields[user]": ""},
+            {"page[size]": "1", "page[number]": "2"},
+        ],
+    )
+    async def test_list_same_as_default_response(
+        self,
+        app: FastAPI,
+        app_compiled: FastAPI,
+        client: AsyncClient,
+        user_1: User,
+        user_2: User,
+        user_1_posts: list[Post],
+        user_1_bio: UserBio,
+        params: dict,
+    ):
+        expected = await client.get("/users", params=params)
+        assert expected.status_code == status.HTTP_200_OK, expected.text
+
+        async with AsyncClient(app=app_compiled, base_url="http://test") as compiled_client:
+            response = await compiled_client.get("/users-compiled", params=compiled_params(params))
+
+        assert response.status_code == status.HTTP_200_OK, response.text
+        assert response.headers["content-type"] == "application/json"
+        assert replace_primary_type(response.json()) == expected.json()
+
+    async def test_detail_same_as_default_response(
+        self,
+        app: FastAPI,
+        app_compiled: FastAPI,
+        client: AsyncClient,
+        user_1: User,
+        user_1_posts: list[Post],
+        user_1_bio: UserBio,
+    ):
+        params = {"include": "bio,posts"}
+        expected = await client.get(f"/users/{user_1.id}", params=params)
+        assert expected.status_code == status.HTTP_200_OK, expected.text
+
+        async with AsyncClient(app=app_compiled, base_url="http://test") as compiled_client:
+            response = await compiled_client.get(f"/users-compiled/{user_1.id}", params=params)
+
+        assert response.status_code == status.HTTP_200_OK, response.text
+        assert replace_primary_type(response.json()) == expected.json()
+
+    async def test_nested_includes(
+        self,
+        app_compiled: FastAPI,
+        user_1: User,
+        user_2: User,
+        user_1_posts: list[Post],
+        user_2_comment_for_one_u1_post: PostComment,
+    ):
+        comment = user_2_comment_for_one_u1_post
+        async with AsyncClient(app=app_compiled, base_url="http://test") as compiled_client:
+            response = await compiled_client.get(
+                f"/users-compiled/{user_1.id}",
+                params={
+                    "include": "posts.comments.author",
+                    "fields[user]": "name",
+                    f"fields[{COMPILED_RESOURCE_TYPE}]": "name",
+                },
+            )
+
+        assert response.status_code == status.HTTP_200_OK, response.text
+        assert response.json() == {
+            "data": {
+                "id": str(user_1.id),
+                "type": COMPILED_RESOURCE_TYPE,
+                "attributes": {"name": user_1.name},
+                "relationships": {
+                    "posts": {"data": [{"id": str(post.id), "type": "post"} for post in user_1_posts]},
+                },
+            },
+            "included": [
+                *(
+                    {
+                        "id": str(post.id),
+                        "type": "post",
+                        "attributes": {"title": post.title, "body": post.body},
+                        "relationships": {
+                            "comments": {
+                                "data": [{"id": str(comment.id), "type": "post_comment"}]
+                                if post.id == comment.post_id
+                                else [],
+                            },
+                        },
+                    }
+                    for post in sorted(user_1_posts, key=lambda post: str(post.id))
+                ),
+                {
+                    "id": str(comment.id),
+                    "type": "post_comment",
+                    "attributes": {"text": comment.text},
+                    "relationships": {
+                        "author": {"data": {"id": str(user_2.id), "type": "user"}},
+                    },
+                },
+                {
+                    "id": str(user_2.id),
+                    "type": "user",
+                    "attributes": {"name": user_2.name},
+                },
+            ],
+            "jsonapi": {"version": "1.0"},
+            "meta": None,
+        }
@@ -0,0 +1,137 @@
+from typing import List, Optional
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+from pytest_asyncio import fixture as async_fixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.fixtures.entities import build_user
+from tests.models import User
+
+pytestmark = pytest.mark.asyncio
+
+PAGE_SIZE = 2
+
+
+@async_fixture()
+async def users_with_same_ages(async_session: AsyncSession) -> List[User]:
+    users = [build_user(age=age) for age in (30, 10, 20, 10, 30)]
+    async_session.add_all(users)
+    await async_session.commit()
+
+    yield users
+
+    for user in users:
+        await async_session.delete(user)
+    await async_session.commit()
+
+
+@async_fixture()
+async def users_with_null_ages(async_session: AsyncSession) -> List[User]:
+    users = [build_user(age=age) for age in (30, None, 10, None, 20, None)]
+    async_session.add_all(users)
+    await async_session.commit()
+
+    yield users
+
+    for user in users:
+        await async_session.delete(user)
+    await async_session.commit()
+
+
+async def get_all_pages(client: AsyncClient, url: str, params: dict, direction: str) -> List[List[str]]:
+    pages = []
+    cursor: Optional[str] = ""
+    cursor_key = "nextCursor" if direction == "after" else "prevCursor"
+    while cursor is not None:
+        response = await client.get(url, params=params | {f"page[{direction}]": cursor})
+        assert response.status_code == status.HTTP_200_OK, response.text
+        pages.append([item["id"] for item in response.json()["data"]])
+        cursor = response.json()["meta"][cursor_key]
+
+    return pages
+
+
+class TestCursorPagination:
+    @pytest.mark.parametrize("sort", ["id", "-age", "age,-name", "-age,id"])
+    async def test_walk_pages(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        users_with_same_ages: List[User],
+        sort: str,
+    ):
+        url = app.url_path_for("get_user_list")
+        response = await client.get(url, params={"sort": sort})
+        assert response.status_code == status.HTTP_200_OK, response.text
+        expected_ids = [item["id"] for item in response.json()["data"]]
+
+        params = {"sort": sort, "page[size]": str(PAGE_SIZE)}
+        pages_forward = await get_all_pages(client, url, params, direction="after")
+        assert [item_id for page in pages_forward for item_id in page] == expected_ids
+        assert all(len(page) == PAGE_SIZE for page in pages_forward[:-1])
+
+        pages_backward = await get_all_pages(client, url, params, direction="before")
+        assert [item_id for page in reversed(pages_backward) for item_id in page] == expected_ids
+
+    @pytest.mark.parametrize("sort", ["age", "-age", "age,-id", "-age,-id"])
+    async def test_walk_pages_with_null_sort_values(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        users_with_null_ages: List[User],
+        sort: str,
+    ):
+        url = app.url_path_for("get_user_list")
+        response = await client.get(url, params={"sort": sort})
+        assert response.status_code == status.HTTP_200_OK, response.text
+        # NULLs are ordered by the database
+        expected_ids = [item["id"] for item in response.json()["data"]]
+
+        params = {"sort": sort, "page[size]": str(PAGE_SIZE)}
+        pages_forward = await get_all_pages(client, url, params, direction="after")
+        assert [item_id for page in pages_forward for item_id in page] == expected_ids
+
+        pages_backward = await get_all_pages(client, url, params, direction="before")
+        assert [item_id for page in reversed(pages_backward) for item_id in page] == expected_ids
+
+    async def test_meta(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        users_with_same_ages: List[User],
+    ):
+        url = app.url_path_for("get_user_list")
+        params = {"sort": "age", "page[size]": str(PAGE_SIZE)}
+
+        response = await client.get(url, params=params | {"page[after]": ""})
+        assert response.status_code == status.HTTP_200_OK, response.text
+        meta = response.json()["meta"]
+        assert meta["count"] == len(users_with_same_ages)
+        assert meta["prevCursor"] is None
+        assert meta["nextCursor"]
+
+        response = await client.get(url, params=params | {"page[after]": meta["nextCursor"]})
+        assert response.status_code == status.HTTP_200_OK, response.text
+        meta = response.json()["meta"]
+        assert meta["prevCursor"]
+        assert meta["nextCursor"]
+
+        response = await client.get(url, params=params | {"page[before]": meta["prevCursor"]})
+        assert response.status_code == status.HTTP_200_OK, response.text
+        assert [item["attributes"]["age"] for item in response.json()["data"]] == [10, 10]
+        assert response.json()["meta"]["prevCursor"] is None
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"page[after]": "not-a-cursor"},
+            {"page[after]": "WyJhIl0"},
+            {"page[after]": "", "page[before]": ""},
+        ],
+    )
+    async def test_invalid_cursor(self, app: FastAPI, client: AsyncClient, params: dict):
+        url = app.url_path_for("get_user_list")
+        response = await client.get(url, params=params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
@@ -0,0 +1,96 @@
+from typing import List
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+from starlette.requests import Request
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.views.view_base import ViewBase
+from tests.models import Post, PostComment, User
+
+
+def build_view(resource_type: str = "user") -> ViewBase:
+    request = Request({"type": "http", "query_string": b"", "headers": [], "app": FastAPI()})
+    return ViewBase(request=request, jsonapi=RoutersJSONAPI.all_jsonapi_routers[resource_type])
+
+
+class TestIncludeTree:
+    def test_common_prefixes_are_merged(self, app: FastAPI):
+        view = build_view()
+
+        assert view.prep_include_tree(["posts.comments.author", "posts.user", "posts", "bio"]) == {
+            "posts": {"comments": {"author": {}}, "user": {}},
+            "bio": {},
+        }
+
+    def test_requested_includes_by_relationship(self, app: FastAPI):
+        view = build_view()
+
+        assert view.prep_requested_includes(["posts.comments.author", "posts.user", "bio"]) == {
+            "user": {"posts", "bio"},
+            "posts": {"comments", "user"},
+            "comments": {"author"},
+        }
+
+
+class TestIncludesProcessing:
+    pytestmark = pytest.mark.asyncio
+
+    async def test_included_objects_are_not_duplicated(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        user_1: User,
+        user_2: User,
+        user_1_posts: List[Post],
+        user_2_comment_for_one_u1_post: PostComment,
+    ):
+        url = app.url_path_for("get_user_list")
+        response = await client.get(url, params={"include": "posts.comments.author,posts.user"})
+        assert response.status_code == status.HTTP_200_OK, response.text
+
+        response_data = response.json()
+        included_keys = [(item["type"], item["id"]) for item in response_data["included"]]
+        assert len(included_keys) == len(set(included_keys))
+        assert sorted(included_keys) == sorted(
+            [
+                *(("post", str(post.id)) for post in user_1_posts),
+                ("post_comment", str(user_2_comment_for_one_u1_post.id)),
+                # root item reached from another root item is included,
+                # the one reached only from itself (`posts.user`) is not
+                ("user", str(user_2.id)),
+            ],
+        )
+
+        included = {(item["type"], item["id"]): item for item in response_data["included"]}
+        comment = included["post_comment", str(user_2_comment_for_one_u1_post.id)]
+        assert comment["relationships"]["author"]["data"] == {"type": "user", "id": str(user_2.id)}
+        for post in user_1_posts:
+            assert included["post", str(post.id)]["relationships"]["user"]["data"] == {
+                "type": "user",
+                "id": str(user_1.id),
+            }
+
+    async def test_includes_order_does_not_matter(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        user_1: User,
+        user_1_posts: List[Post],
+        user_2_comment_for_one_u1_post: PostComment,
+    ):
+        url = app.url_path_for("get_user_detail", obj_id=user_1.id)
+        responses = [
+            await client.get(url, params={"include": include})
+            for include in ("posts,posts.comments", "posts.comments,posts", "posts.comments,posts,posts.comments")
+        ]
+        assert all(response.status_code == status.HTTP_200_OK for response in responses)
+
+        first, *others = (response.json() for response in responses)
+        for other in others:
+            assert other["data"] == first["data"]
+            assert sorted(other["included"], key=lambda item: (item["type"], item["id"])) == sorted(
+                first["included"],
+                key=lambda item: (item["type"], item["id"]),
+            )
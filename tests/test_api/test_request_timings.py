@@ -0,0 +1,137 @@
+from contextlib import suppress
+from typing import Dict, List
+
+import pytest
+from fastapi import FastAPI, Request, status
+from httpx import AsyncClient
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.request_timings import (
+    RequestPhase,
+    RequestTimings,
+    disabled_request_timings,
+)
+from tests.fixtures.app import build_app_custom
+from tests.misc.utils import fake
+from tests.models import Post, User
+from tests.schemas import UserInSchema, UserPatchSchema, UserSchema
+
+TIMED_RESOURCE_TYPE = "user_timed"
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    phases = {}
+    for metric in header.split(", "):
+        name, duration = metric.split(";dur=")
+        phases[name] = float(duration)
+    return phases
+
+
+@pytest.fixture()
+def collected_timings() -> List[RequestTimings]:
+    return []
+
+
+@pytest.fixture()
+def app_timed(app: FastAPI, collected_timings: List[RequestTimings]) -> FastAPI:
+    # `app` registers all the other resources (for includes and sparse fieldsets)
+    with suppress(KeyError):
+        RoutersJSONAPI.all_jsonapi_routers.pop(TIMED_RESOURCE_TYPE)
+
+    async def timings_callback(request: Request, timings: RequestTimings):
+        collected_timings.append(timings)
+
+    return build_app_custom(
+        model=User,
+        schema=UserSchema,
+        schema_in_post=UserInSchema,
+        schema_in_patch=UserPatchSchema,
+        path="/users-timed",
+        resource_type=TIMED_RESOURCE_TYPE,
+        timings_callback=timings_callback,
+        server_timing_header=True,
+    )
+
+
+class TestRequestPhases:
+    def test_disabled_timings_measure_nothing(self):
+        with disabled_request_timings.measure(RequestPhase.QUERY):
+            pass
+
+        assert disabled_request_timings.phases == {}
+
+    def test_phase_durations_are_summed_up(self):
+        timings = RequestTimings()
+        for _ in range(2):
+            with timings.measure(RequestPhase.FETCH):
+                pass
+
+        assert list(timings.phases) == [RequestPhase.FETCH]
+        assert parse_server_timing(timings.as_server_timing()).keys() == {RequestPhase.FETCH}
+
+
+class TestRequestTimingsResponses:
+    pytestmark = pytest.mark.asyncio
+
+    async def test_get_list(
+        self,
+        app_timed: FastAPI,
+        collected_timings: List[RequestTimings],
+        user_1: User,
+        user_1_posts: List[Post],
+    ):
+        async with AsyncClient(app=app_timed, base_url="http://test") as client:
+            response = await client.get(
+                "/users-timed",
+                params={"include": "posts", f"fields[{TIMED_RESOURCE_TYPE}]": "name"},
+            )
+        assert response.status_code == status.HTTP_200_OK, response.text
+
+        phases = parse_server_timing(response.headers["Server-Timing"])
+        assert phases.keys() == {
+            RequestPhase.DEPENDENCIES,
+            RequestPhase.QUERY,
+            RequestPhase.COUNT,
+            RequestPhase.FETCH,
+            RequestPhase.INCLUDES,
+            RequestPhase.SERIALIZATION,
+        }
+        assert len(collected_timings) == 1
+        assert collected_timings[0].phases.keys() == phases.keys()
+
+    async def test_get_detail(
+        self,
+        app_timed: FastAPI,
+        collected_timings: List[RequestTimings],
+        user_1: User,
+    ):
+        async with AsyncClient(app=app_timed, base_url="http://test") as client:
+            response = await client.get(f"/users-timed/{user_1.id}")
+        assert response.status_code == status.HTTP_200_OK, response.text
+
+        phases = parse_server_timing(response.headers["Server-Timing"])
+        assert {RequestPhase.DEPENDENCIES, RequestPhase.QUERY, RequestPhase.FETCH} <= phases.keys()
+        assert len(collected_timings) == 1
+
+    async def test_disabled_by_default(self, client: AsyncClient, user_1: User):
+        response = await client.get("/users")
+        assert response.status_code == status.HTTP_200_OK, response.text
+        assert "Server-Timing" not in response.headers
+
+    async def test_post_rendered_response(
+        self,
+        app_timed: FastAPI,
+        collected_timings: List[RequestTimings],
+    ):
+        name = fake.name()
+        async with AsyncClient(app=app_timed, base_url="http://test") as client:
+            response = await client.post(
+                "/users-timed",
+                json={"data": {"type": TIMED_RESOURCE_TYPE, "attributes": {"name": name}}},
+            )
+        assert response.status_code == status.HTTP_201_CREATED, response.text
+        assert response.json()["data"]["attributes"]["name"] == name
+
+        phases = parse_server_timing(response.headers["Server-Timing"])
+        assert RequestPhase.SERIALIZATION in phases
+        assert len(collected_timings) == 1
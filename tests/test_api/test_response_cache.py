@@ -0,0 +1,229 @@
+import gzip
+from contextlib import suppress
+from time import time
+from typing import List
+
+import pytest
+from fastapi import FastAPI, Request, status
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.response_cache import (
+    CachedResponse,
+    InMemoryResponseCache,
+    ResponseCacheConfig,
+    build_cache_key,
+)
+from tests.fixtures.app import build_app_custom
+from tests.misc.utils import fake
+from tests.models import Post, User
+from tests.schemas import UserInSchema, UserPatchSchema, UserSchema
+
+CACHED_RESOURCE_TYPE = "user_cached"
+
+
+@pytest.fixture()
+def response_cache_backend() -> InMemoryResponseCache:
+    return InMemoryResponseCache()
+
+
+def build_app_cached(response_cache: ResponseCacheConfig) -> FastAPI:
+    with suppress(KeyError):
+        RoutersJSONAPI.all_jsonapi_routers.pop(CACHED_RESOURCE_TYPE)
+
+    return build_app_custom(
+        model=User,
+        schema=UserSchema,
+        schema_in_post=UserInSchema,
+        schema_in_patch=UserPatchSchema,
+        path="/users-cached",
+        resource_type=CACHED_RESOURCE_TYPE,
+        response_cache=response_cache,
+    )
+
+
+@pytest.fixture()
+def app_cached(app: FastAPI, response_cache_backend: InMemoryResponseCache) -> FastAPI:
+    # `app` registers all the other resources (for includes)
+    return build_app_cached(ResponseCacheConfig(backend=response_cache_backend))
+
+
+async def rename_user_silently(async_session: AsyncSession, user: User) -> str:
+    """
+    Update user bypassing data layers, so cached responses aren't invalidated
+    """
+    new_name = fake.name()
+    await async_session.execute(update(User).where(User.id == user.id).values(name=new_name))
+    await async_session.commit()
+    return new_name
+
+
+class TestInMemoryResponseCache:
+    pytestmark = pytest.mark.asyncio
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        max_size = 2
+        backend = InMemoryResponseCache(max_size=max_size)
+        response = CachedResponse(content=b"{}", fetched_at=time())
+        await backend.set("a", response, frozenset({"user"}))
+        await backend.set("b", response, frozenset({"user"}))
+
+        assert await backend.get("a") == response
+        await backend.set("c", response, frozenset({"user"}))
+
+        assert len(backend) == max_size
+        assert await backend.get("b") is None
+
+    async def test_invalidate_by_resource_type(self):
+        backend = InMemoryResponseCache()
+        response = CachedResponse(content=b"{}", fetched_at=time())
+        await backend.set("user", response, frozenset({"user"}))
+        await backend.set("user_with_posts", response, frozenset({"user", "post"}))
+
+        await backend.invalidate(["post"])
+
+        assert await backend.get("user") == response
+        assert await backend.get("user_with_posts") is None
+
+    async def test_response_fetched_before_invalidation_is_not_stored(self):
+        backend = InMemoryResponseCache()
+        response = CachedResponse(content=b"{}", fetched_at=time())
+        await backend.invalidate(["user"])
+
+        await backend.set("user", response, frozenset({"user"}))
+
+        assert await backend.get("user") is None
+
+
+class TestBuildCacheKey:
+    def test_key_querystring_is_normalized(self):
+        key = build_cache_key("user", None, [("sort", "name"), ("include", "posts")])
+
+        assert key == build_cache_key("user", None, [("include", "posts"), ("sort", "name")])
+        assert key != build_cache_key("user", "1", [("include", "posts"), ("sort", "name")])
+        assert key != build_cache_key("user", None, [("include", "posts"), ("sort", "name")], key_part="tenant")
+
+
+class TestResponseCache:
+    pytestmark = pytest.mark.asyncio
+
+    async def test_get_detail_is_cached_until_update(
+        self,
+        app_cached: FastAPI,
+        async_session: AsyncSession,
+        user_1: User,
+    ):
+        async with AsyncClient(app=app_cached, base_url="http://test") as client:
+            url = f"/users-cached/{user_1.id}"
+            response = await client.get(url)
+            assert response.status_code == status.HTTP_200_OK, response.text
+            name = response.json()["data"]["attributes"]["name"]
+
+            new_name = await rename_user_silently(async_session, user_1)
+            response = await client.get(url)
+            assert response.json()["data"]["attributes"]["name"] == name
+
+            patch_body = {"data": {"id": str(user_1.id), "attributes": {"name": new_name}}}
+            response = await client.patch(url, json=patch_body)
+            assert response.status_code == status.HTTP_200_OK, response.text
+
+            response = await client.get(url)
+            assert response.json()["data"]["attributes"]["name"] == new_name
+
+    async def test_get_list_is_invalidated_by_included_resource_type(
+        self,
+        app_cached: FastAPI,
+        client: AsyncClient,
+        async_session: AsyncSession,
+        user_1: User,
+        user_1_posts: List[Post],
+    ):
+        post = user_1_posts[0]
+        params = {"include": "posts"}
+        async with AsyncClient(app=app_cached, base_url="http://test") as client_cached:
+            response = await client_cached.get("/users-cached", params=params)
+            assert response.status_code == status.HTTP_200_OK, response.text
+
+            new_title = fake.sentence()
+            patch_body = {"data": {"id": str(post.id), "attributes": {"title": new_title, "body": post.body}}}
+            response = await client.patch(f"/posts/{post.id}", json=patch_body)
+            assert response.status_code == status.HTTP_200_OK, response.text
+
+            response = await client_cached.get("/users-cached", params=params)
+            included_titles = {item["attributes"]["title"] for item in response.json()["included"]}
+            assert new_title in included_titles
+
+    async def test_invalidated_by_another_resource_type_of_same_model(
+        self,
+        app_cached: FastAPI,
+        client: AsyncClient,
+        user_1: User,
+    ):
+        url = f"/users-cached/{user_1.id}"
+        async with AsyncClient(app=app_cached, base_url="http://test") as client_cached:
+            response = await client_cached.get(url)
+            assert response.status_code == status.HTTP_200_OK, response.text
+
+            # both routers are registered for `User` model
+            new_name = fake.name()
+            patch_body = {"data": {"id": str(user_1.id), "attributes": {"name": new_name}}}
+            response = await client.patch(f"/users/{user_1.id}", json=patch_body)
+            assert response.status_code == status.HTTP_200_OK, response.text
+
+            response = await client_cached.get(url)
+            assert response.json()["data"]["attributes"]["name"] == new_name
+
+    async def test_key_builder_separates_entries(
+        self,
+        app: FastAPI,
+        response_cache_backend: InMemoryResponseCache,
+        user_1: User,
+    ):
+        def key_builder(request: Request, dependencies: dict):
+            return request.headers.get("X-Tenant")
+
+        app_cached = build_app_cached(ResponseCacheConfig(backend=response_cache_backend, key_builder=key_builder))
+        async with AsyncClient(app=app_cached, base_url="http://test") as client:
+            tenants = ("first", "second")
+            for tenant in (*tenants, tenants[0]):
+                response = await client.get("/users-cached", headers={"X-Tenant": tenant})
+                assert response.status_code == status.HTTP_200_OK, response.text
+
+            assert len(response_cache_backend) == len(tenants)
+
+            # no key, not cached
+            await client.get("/users-cached")
+            assert len(response_cache_backend) == len(tenants)
+
+    async def test_precompressed_response(
+        self,
+        app: FastAPI,
+        response_cache_backend: InMemoryResponseCache,
+        user_1: User,
+    ):
+        app_cached = build_app_cached(
+            ResponseCacheConfig(backend=response_cache_backend, compress=True, compress_min_size=0),
+        )
+        async with AsyncClient(app=app_cached, base_url="http://test") as client:
+            response = await client.get(f"/users-cached/{user_1.id}")
+            assert response.status_code == status.HTTP_200_OK, response.text
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert response.json()["data"]["id"] == str(user_1.id)
+
+        [(cached, _)] = response_cache_backend._entries.values()
+        assert gzip.decompress(cached.content) == response.content
+
+    @pytest.mark.parametrize("include", ["nonexistent", "name", "posts.nonexistent"])
+    async def test_invalid_include_is_not_cached(
+        self,
+        app_cached: FastAPI,
+        response_cache_backend: InMemoryResponseCache,
+        user_1: User,
+        include: str,
+    ):
+        async with AsyncClient(app=app_cached, base_url="http://test") as client:
+            response = await client.get("/users-cached", params={"include": include})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+        assert len(response_cache_backend) == 0
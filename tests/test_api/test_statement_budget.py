@@ -0,0 +1,150 @@
+from contextlib import suppress
+from typing import ClassVar, Dict, List
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.misc.sqla.generics.base import DetailViewBaseGeneric, ListViewBaseGeneric
+from fastapi_jsonapi.views.utils import HTTPMethod, HTTPMethodConfig
+from fastapi_jsonapi.views.view_base import ViewBase
+from tests.fixtures.app import build_app_custom
+from tests.fixtures.views import SessionDependency
+from tests.models import Computer, Post, User
+from tests.schemas import UserInSchema, UserPatchSchema, UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+BUDGETED_RESOURCE_TYPE = "user_budgeted"
+
+# count, page and included objects of one relationship
+LIST_STATEMENT_BUDGET = 3
+
+
+def strict_handler(view: ViewBase, dto: SessionDependency) -> Dict:
+    return {"session": dto.session, "strict_loading": True}
+
+
+def budget_handler(view: ViewBase, dto: SessionDependency) -> Dict:
+    return {"statement_budget": LIST_STATEMENT_BUDGET}
+
+
+class StrictDetailView(DetailViewBaseGeneric):
+    method_dependencies: ClassVar = {
+        HTTPMethod.ALL: HTTPMethodConfig(
+            dependencies=SessionDependency,
+            prepare_data_layer_kwargs=strict_handler,
+        ),
+    }
+
+
+class BudgetedListView(ListViewBaseGeneric):
+    method_dependencies: ClassVar = {
+        HTTPMethod.ALL: HTTPMethodConfig(
+            dependencies=SessionDependency,
+            prepare_data_layer_kwargs=strict_handler,
+        ),
+        HTTPMethod.GET: HTTPMethodConfig(
+            prepare_data_layer_kwargs=budget_handler,
+        ),
+    }
+
+
+@pytest.fixture()
+def app_budgeted(app: FastAPI) -> FastAPI:
+    # `app` registers all the other resources (for includes and sparse fieldsets)
+    with suppress(KeyError):
+        RoutersJSONAPI.all_jsonapi_routers.pop(BUDGETED_RESOURCE_TYPE)
+
+    return build_app_custom(
+        model=User,
+        schema=UserSchema,
+        schema_in_post=UserInSchema,
+        schema_in_patch=UserPatchSchema,
+        path="/users-budgeted",
+        resource_type=BUDGETED_RESOURCE_TYPE,
+        class_list=BudgetedListView,
+        class_detail=StrictDetailView,
+    )
+
+
+class TestStatementBudget:
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},
+            {"include": "posts"},
+            {"include": "posts,bio"},
+        ],
+    )
+    async def test_within_budget(
+        self,
+        app_budgeted: FastAPI,
+        client: AsyncClient,
+        user_1: User,
+        user_2: User,
+        user_1_posts: List[Post],
+        params: dict,
+    ):
+        expected = await client.get("/users", params=params)
+        assert expected.status_code == status.HTTP_200_OK, expected.text
+
+        async with AsyncClient(app=app_budgeted, base_url="http://test") as budgeted_client:
+            response = await budgeted_client.get("/users-budgeted", params=params)
+        assert response.status_code == status.HTTP_200_OK, response.text
+
+        document = response.json()
+        for item in document["data"]:
+            assert item["type"] == BUDGETED_RESOURCE_TYPE
+            item["type"] = "user"
+        assert document == expected.json()
+
+    async def test_budget_exceeded(
+        self,
+        app_budgeted: FastAPI,
+        user_1: User,
+        user_1_posts: List[Post],
+    ):
+        async with AsyncClient(app=app_budgeted, base_url="http://test") as client:
+            response = await client.get("/users-budgeted", params={"include": "posts.comments"})
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR, response.text
+        (error,) = response.json()["errors"]
+        assert error["title"] == "Statement budget exceeded"
+        assert error["detail"] == f"Statement budget {LIST_STATEMENT_BUDGET} is exceeded"
+
+
+class TestStrictLoading:
+    async def test_update_not_included_relationship(
+        self,
+        app_budgeted: FastAPI,
+        user_1: User,
+        computer_1: Computer,
+    ):
+        update_body = {
+            "data": {
+                "id": str(user_1.id),
+                "attributes": {"name": user_1.name},
+                "relationships": {
+                    "computers": {
+                        "data": [{"type": "computer", "id": str(computer_1.id)}],
+                    },
+                },
+            },
+        }
+        async with AsyncClient(app=app_budgeted, base_url="http://test") as client:
+            response = await client.patch(f"/users-budgeted/{user_1.id}", json=update_body)
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR, response.text
+        assert response.json() == {
+            "errors": [
+                {
+                    "detail": "Error of loading the 'computers' relationship. "
+                    "Please add this relationship to include query parameter explicitly.",
+                    "source": {"parameter": "include"},
+                    "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    "title": "Internal Server Error",
+                },
+            ],
+        }
@@ -0,0 +1,190 @@
+import asyncio
+import json
+from contextlib import suppress
+from typing import ClassVar, Dict, List, Type
+
+import pytest
+from fastapi import FastAPI, Request, status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.types import Message
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.data_layers import sqla_orm
+from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+from fastapi_jsonapi.querystring import QueryStringManager
+from fastapi_jsonapi.views.list_view import ListViewBase
+from fastapi_jsonapi.views.utils import HTTPMethod, HTTPMethodConfig
+from fastapi_jsonapi.views.view_base import ViewBase
+from tests.fixtures.app import build_app_custom
+from tests.fixtures.views import ListViewBaseGeneric, SessionDependency
+from tests.models import Post, User, UserBio
+from tests.schemas import UserInSchema, UserPatchSchema, UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+STREAMED_RESOURCE_TYPE = "user_streamed_list"
+
+
+def stream_session_handler(view: ViewBase, dto: SessionDependency) -> Dict:
+    return {
+        "session": dto.session,
+        "stream_session_maker": sessionmaker(bind=dto.session.bind, class_=AsyncSession, expire_on_commit=False),
+    }
+
+
+class StreamSessionListView(ListViewBaseGeneric):
+    method_dependencies: ClassVar = {
+        HTTPMethod.ALL: HTTPMethodConfig(
+            dependencies=SessionDependency,
+            prepare_data_layer_kwargs=stream_session_handler,
+        ),
+    }
+
+
+async def get_body_chunks(app: FastAPI, path: str) -> List[bytes]:
+    """
+    Call the app and collect body chunks of its response.
+
+    Test client joins the chunks, so messages sent by the app are collected directly.
+    """
+    request_received = False
+    chunks: List[bytes] = []
+
+    async def receive() -> Message:
+        nonlocal request_received
+        if not request_received:
+            request_received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # response waits for disconnect while the body is sent
+        await asyncio.Event().wait()
+
+    async def send(message: Message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == status.HTTP_200_OK
+        elif message.get("body"):
+            chunks.append(message["body"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test")],
+        "client": ("127.0.0.1", 123),
+        "server": ("test", 80),
+    }
+    await app(scope, receive, send)
+    return chunks
+
+
+def build_qs(query_string: str = "") -> QueryStringManager:
+    request = Request({"type": "http", "query_string": query_string.encode(), "headers": [], "app": FastAPI()})
+    return QueryStringManager(request)
+
+
+def build_dl(session: AsyncSession, **kwargs) -> SqlalchemyDataLayer:
+    return SqlalchemyDataLayer(request=None, schema=UserSchema, model=User, type_="user", session=session, **kwargs)
+
+
+@pytest.fixture(params=[ListViewBaseGeneric, StreamSessionListView], ids=["request_session", "stream_session"])
+def app_streamed(app: FastAPI, request: pytest.FixtureRequest) -> FastAPI:
+    class_list: Type[ListViewBase] = request.param
+    # `app` registers all the other resources (for includes and sparse fieldsets)
+    with suppress(KeyError):
+        RoutersJSONAPI.all_jsonapi_routers.pop(STREAMED_RESOURCE_TYPE)
+
+    return build_app_custom(
+        model=User,
+        schema=UserSchema,
+        schema_in_post=UserInSchema,
+        schema_in_patch=UserPatchSchema,
+        path="/users-streamed",
+        resource_type=STREAMED_RESOURCE_TYPE,
+        class_list=class_list,
+        stream_list_response=True,
+        # small partitions, so response is written by several chunks
+        stream_yield_per=1,
+    )
+
+
+class TestStreamingListResponse:
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},
+            {"include": "posts"},
+            {"include": "posts,bio"},
+            {"page[size]": "1", "page[number]": "2"},
+            {"filter[name]": "not-existing-user"},
+        ],
+    )
+    async def test_same_as_default_response(
+        self,
+        app: FastAPI,
+        app_streamed: FastAPI,
+        client: AsyncClient,
+        user_1: User,
+        user_2: User,
+        user_1_posts: list[Post],
+        user_1_bio: UserBio,
+        params: dict,
+    ):
+        expected = await client.get("/users", params=params)
+        assert expected.status_code == status.HTTP_200_OK, expected.text
+
+        async with AsyncClient(app=app_streamed, base_url="http://test") as streamed_client:
+            response = await streamed_client.get("/users-streamed", params=params)
+
+        assert response.status_code == status.HTTP_200_OK, response.text
+        assert response.headers["content-type"] == "application/json"
+
+        document = response.json()
+        for item in document["data"]:
+            assert item["type"] == STREAMED_RESOURCE_TYPE
+            item["type"] = "user"
+        assert document == expected.json()
+
+    async def test_body_is_written_by_chunks(self, app_streamed: FastAPI, user_1: User, user_2: User):
+        chunks = await get_body_chunks(app_streamed, "/users-streamed")
+
+        assert [item["id"] for item in json.loads(b"".join(chunks))["data"]] == [str(user_1.id), str(user_2.id)]
+        # opening of the document, one chunk per partition of one object, included and meta
+        assert len(chunks) == len([user_1, user_2]) + 2
+
+
+class TestCollectionStream:
+    async def test_partitions_are_read_by_stream_session(
+        self,
+        async_session_plain: sessionmaker,
+        user_1: User,
+        user_2: User,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session, stream_session_maker=async_session_plain)
+            count, partitions = await dl.get_collection_stream(build_qs(), yield_per=1)
+
+        # request session is closed before the body is sent
+        items: List[User] = [item async for partition in partitions for item in partition]
+        assert count == len(items)
+        assert [item.id for item in items] == [user_1.id, user_2.id]
+
+    async def test_page_is_fetched_beforehand_without_stream_session(
+        self,
+        async_session_plain: sessionmaker,
+        monkeypatch: pytest.MonkeyPatch,
+        user_1: User,
+        user_2: User,
+    ):
+        monkeypatch.setattr(sqla_orm, "DEPENDENCIES_EXIT_BEFORE_RESPONSE", True)
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            _, partitions = await dl.get_collection_stream(build_qs(), yield_per=1)
+
+        assert [[item.id for item in partition] async for partition in partitions] == [[user_1.id, user_2.id]]
@@ -0,0 +1,191 @@
+from contextlib import suppress
+from typing import Callable, ClassVar, Dict, List, Optional
+
+import pytest
+from fastapi import Body, Depends, FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.atomic import current_atomic_operation
+from fastapi_jsonapi.atomic.atomic_handler import AtomicViewHandler
+from fastapi_jsonapi.atomic.prepared_atomic_operation import OperationAdd, OperationBase, OperationUpdate
+from fastapi_jsonapi.atomic.schemas import OperationItemInSchema
+from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+from fastapi_jsonapi.views.utils import HTTPMethod, HTTPMethodConfig
+from fastapi_jsonapi.views.view_base import ViewBase
+from tests.fixtures.app import build_app_custom
+from tests.fixtures.views import ListViewBaseGeneric, SessionDependency
+from tests.models import Computer, User
+from tests.schemas import ComputerAttributesBaseSchema, UserAttributesBaseSchema, UserSchema
+
+AGED_RESOURCE_TYPE = "user_aged_by_lid"
+
+
+def get_age_from_operation_lid(data: Optional[dict] = Body(None, embed=True)) -> int:
+    # reads the body, so it's resolved for each operation
+    return int(current_atomic_operation.get().data.lid)
+
+
+class AgeDependency(SessionDependency):
+    lid_age: int = Depends(get_age_from_operation_lid)
+
+
+def age_handler(view: ViewBase, dto: AgeDependency) -> Dict:
+    return {"session": dto.session, "age": dto.lid_age}
+
+
+class AgeDataLayer(SqlalchemyDataLayer):
+    def __init__(self, *args, age: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.age = age
+
+    async def before_create_object(self, model_kwargs: dict, view_kwargs: dict):
+        model_kwargs["age"] = self.age
+
+
+class AgeListView(ListViewBaseGeneric):
+    data_layer_cls = AgeDataLayer
+    method_dependencies: ClassVar[Dict[HTTPMethod, HTTPMethodConfig]] = {
+        HTTPMethod.ALL: HTTPMethodConfig(
+            dependencies=AgeDependency,
+            prepare_data_layer_kwargs=age_handler,
+        ),
+    }
+
+
+def build_operation(
+    operation_cls,
+    resource_type: str,
+    lid: Optional[str] = None,
+    relationships: Optional[dict] = None,
+) -> OperationBase:
+    return operation_cls(
+        jsonapi=RoutersJSONAPI.all_jsonapi_routers[resource_type],
+        view=None,
+        ref=None,
+        data=OperationItemInSchema(type=resource_type, lid=lid, attributes={}, relationships=relationships),
+        op_type="",
+    )
+
+
+class TestGroupOperations:
+    def test_consecutive_adds_of_same_type(self, app: FastAPI):
+        operations = [
+            build_operation(OperationAdd, "user"),
+            build_operation(OperationAdd, "user"),
+            build_operation(OperationAdd, "computer"),
+            build_operation(OperationUpdate, "computer"),
+            build_operation(OperationAdd, "computer"),
+            build_operation(OperationAdd, "computer"),
+        ]
+
+        groups = AtomicViewHandler.group_operations(operations)
+
+        assert groups == [operations[:2], operations[2:3], operations[3:4], operations[4:]]
+
+    def test_reference_to_lid_of_group_starts_new_group(self, app: FastAPI):
+        operations = [
+            build_operation(OperationAdd, "user", lid="user-1"),
+            build_operation(OperationAdd, "user", lid="user-2"),
+            build_operation(
+                OperationAdd,
+                "user",
+                relationships={"computers": {"data": [{"type": "user", "lid": "user-2"}]}},
+            ),
+            build_operation(OperationAdd, "user"),
+        ]
+
+        groups = AtomicViewHandler.group_operations(operations)
+
+        assert groups == [operations[:2], operations[2:]]
+
+
+class TestAtomicBatchedAdd:
+    pytestmark = pytest.mark.asyncio
+
+    async def test_create_objects_and_resolve_local_ids(
+        self,
+        client: AsyncClient,
+        async_session: AsyncSession,
+        user_attributes_factory: Callable[[], UserAttributesBaseSchema],
+    ):
+        users_data: List[UserAttributesBaseSchema] = [user_attributes_factory() for _ in range(3)]
+        computer_data = ComputerAttributesBaseSchema(name="Commodore")
+        data_atomic_request = {
+            "atomic:operations": [
+                *(
+                    {
+                        "op": "add",
+                        "data": {
+                            "type": "user",
+                            "lid": f"user-{index}",
+                            "attributes": user_data.dict(),
+                        },
+                    }
+                    for index, user_data in enumerate(users_data)
+                ),
+                {
+                    "op": "add",
+                    "data": {
+                        "type": "computer",
+                        "attributes": computer_data.dict(),
+                        "relationships": {
+                            "user": {"data": {"type": "user", "lid": "user-1"}},
+                        },
+                    },
+                },
+            ],
+        }
+
+        response = await client.post("/operations", json=data_atomic_request)
+        assert response.status_code == status.HTTP_200_OK, response.text
+        results = response.json()["atomic:results"]
+
+        users = (await async_session.execute(select(User).order_by(User.id))).scalars().all()
+        assert [user.name for user in users] == [user_data.name for user_data in users_data]
+        assert [result["data"]["id"] for result in results[:-1]] == [str(user.id) for user in users]
+        assert [result["data"]["attributes"] for result in results[:-1]] == [
+            user_data.dict() for user_data in users_data
+        ]
+
+        computer = (await async_session.execute(select(Computer))).scalar_one()
+        assert results[-1]["data"]["id"] == str(computer.id)
+        assert computer.user_id == users[1].id
+
+    async def test_operations_are_created_with_own_data_layer_kwargs(
+        self,
+        app: FastAPI,
+        async_session: AsyncSession,
+        user_attributes_factory: Callable[[], UserAttributesBaseSchema],
+    ):
+        with suppress(KeyError):
+            RoutersJSONAPI.all_jsonapi_routers.pop(AGED_RESOURCE_TYPE)
+        app_aged = build_app_custom(
+            model=User,
+            schema=UserSchema,
+            path="/users-aged",
+            resource_type=AGED_RESOURCE_TYPE,
+            class_list=AgeListView,
+        )
+        ages = ["21", "21", "42"]
+        users_data = [user_attributes_factory() for _ in ages]
+        data_atomic_request = {
+            "atomic:operations": [
+                {
+                    "op": "add",
+                    "data": {"type": AGED_RESOURCE_TYPE, "lid": age, "attributes": user_data.dict()},
+                }
+                for age, user_data in zip(ages, users_data)
+            ],
+        }
+
+        async with AsyncClient(app=app_aged, base_url="http://test") as client:
+            response = await client.post("/operations", json=data_atomic_request)
+        assert response.status_code == status.HTTP_200_OK, response.text
+
+        users = (await async_session.execute(select(User).order_by(User.id))).scalars().all()
+        assert [user.name for user in users] == [user_data.name for user_data in users_data]
+        assert [user.age for user in users] == [int(age) for age in ages]
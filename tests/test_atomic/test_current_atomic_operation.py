@@ -7,6 +7,7 @@ from fastapi import Body, Depends, FastAPI, HTTPException, status
 from httpx import AsyncClient
 from pydantic import BaseModel
 from pytest_asyncio import fixture
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi_jsonapi.atomic import current_atomic_operation
@@ -341,6 +342,43 @@ class TestSameBodyDependencyBothForGenericsAndCurrentAtomicOperation(
         response = await client.post("/operations", json=data_atomic_request)
         self.validate_field_value_invalid_response(response, self.validator_create)
 
+    async def test_atomic_create_users_second_operation_invalid(
+        self,
+        client: AsyncClient,
+        async_session: AsyncSession,
+        resource_type: str,
+        user_attributes: UserAttributesBaseSchema,
+    ):
+        invalid_user_attributes_data = UserAttributesBaseSchema(name=fake.name()).dict()
+        invalid_user_attributes_data[self.FIELD_CUSTOM_NAME] = fake.word()
+        assert invalid_user_attributes_data[self.FIELD_CUSTOM_NAME] != self.validator_create.expected_value
+        data_atomic_request = {
+            "atomic:operations": [
+                {
+                    "op": "add",
+                    "data": self.prepare_user_create_data(
+                        user_attributes=user_attributes,
+                        resource_type=resource_type,
+                    ),
+                },
+                {
+                    "op": "add",
+                    "data": {
+                        "type": resource_type,
+                        "attributes": invalid_user_attributes_data,
+                    },
+                },
+            ],
+        }
+        response = await client.post("/operations", json=data_atomic_request)
+        # dependencies are solved for each operation, the second one is validated too
+        self.validate_field_value_invalid_response(response, self.validator_create)
+
+        users = await async_session.scalars(
+            select(User).where(User.name.in_([user_attributes.name, invalid_user_attributes_data["name"]])),
+        )
+        assert users.all() == []
+
     async def test_atomic_update_user_error_required_body_field_passed_but_invalid(
         self,
         client: AsyncClient,
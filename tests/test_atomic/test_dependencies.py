@@ -1,3 +1,4 @@
+from functools import wraps
 from typing import ClassVar, Dict
 
 import pytest
@@ -5,6 +6,7 @@ from fastapi import Depends, Query, status
 from httpx import AsyncClient
 from pytest_asyncio import fixture
 
+from fastapi_jsonapi import RoutersJSONAPI
 from fastapi_jsonapi.misc.sqla.generics.base import DetailViewBaseGeneric, ListViewBaseGeneric
 from fastapi_jsonapi.views.utils import (
     HTTPMethod,
@@ -227,3 +229,75 @@ class TestDependenciesResolver:
             data_atomic=data_atomic_request,
             expected_body=expected_response_data,
         )
+
+    async def test_dependants_are_built_on_registration(
+        self,
+        client: AsyncClient,
+        resource_type: str,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        def get_dependant(**kwargs):
+            msg = "dependencies should not be introspected for each operation"
+            raise AssertionError(msg)
+
+        monkeypatch.setattr("fastapi_jsonapi.api.get_dependant", get_dependant)
+        jsonapi = RoutersJSONAPI.all_jsonapi_routers[resource_type]
+        dependant = jsonapi.get_view_dependant(UserCustomListView, HTTPMethod.POST)
+        assert jsonapi.get_view_dependant(UserCustomListView, HTTPMethod.POST) is dependant
+
+        data_atomic_request = {
+            "atomic:operations": [
+                {
+                    "op": "add",
+                    "data": {
+                        "type": resource_type,
+                        "attributes": UserAttributesBaseSchema(name=fake.name()).dict(),
+                    },
+                },
+            ],
+        }
+        response = await client.post(
+            "/operations",
+            params={CustomDependencyForCreate.KEY: fake.word()},
+            json=data_atomic_request,
+        )
+        assert response.status_code == status.HTTP_200_OK, response.text
+
+    async def test_shared_dependencies_are_solved_once(
+        self,
+        client: AsyncClient,
+        resource_type: str,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        calls = []
+        original_init = CustomDependencyForCreate.__init__
+
+        @wraps(original_init)
+        def counted_init(self, *args, **kwargs):
+            calls.append(None)
+            original_init(self, *args, **kwargs)
+
+        monkeypatch.setattr(CustomDependencyForCreate, "__init__", counted_init)
+
+        operations_count = 3
+        data_atomic_request = {
+            "atomic:operations": [
+                {
+                    "op": "add",
+                    "data": {
+                        "type": resource_type,
+                        "attributes": UserAttributesBaseSchema(name=fake.name()).dict(),
+                    },
+                }
+                for _ in range(operations_count)
+            ],
+        }
+        response = await client.post(
+            "/operations",
+            params={CustomDependencyForCreate.KEY: fake.word()},
+            json=data_atomic_request,
+        )
+        assert response.status_code == status.HTTP_200_OK, response.text
+        assert len(response.json()["atomic:results"]) == operations_count
+        # dependency doesn't read the body, it's solved for the first operation only
+        assert len(calls) == 1
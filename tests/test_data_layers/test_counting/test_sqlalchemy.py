@@ -0,0 +1,225 @@
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from fastapi_jsonapi.data_layers.counting.sqlalchemy import (
+    CachedCount,
+    CollectionCountStrategy,
+    EstimateCount,
+    PageNotFullCount,
+    SubqueryCount,
+    WindowCount,
+)
+from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+from fastapi_jsonapi.querystring import QueryStringManager
+from tests.models import User
+from tests.schemas import UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+# collection is counted and fetched with separate statements
+COUNT_AND_FETCH_STATEMENTS_NUMBER = 2
+
+
+def build_qs(query_string: str = "") -> QueryStringManager:
+    request = Request({"type": "http", "query_string": query_string.encode(), "headers": [], "app": FastAPI()})
+    return QueryStringManager(request)
+
+
+def build_dl(
+    session: AsyncSession,
+    count_strategy: Optional[CollectionCountStrategy] = None,
+    **kwargs,
+) -> SqlalchemyDataLayer:
+    return SqlalchemyDataLayer(
+        request=None,
+        schema=UserSchema,
+        model=User,
+        session=session,
+        count_strategy=count_strategy,
+        **kwargs,
+    )
+
+
+@contextmanager
+def count_statements(async_engine: AsyncEngine, connections: Optional[list] = None) -> Iterator[List[str]]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+        if connections is not None:
+            connections.append(conn.connection.dbapi_connection)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestCountStrategies:
+    @pytest.mark.parametrize(
+        "count_strategy",
+        [
+            SubqueryCount(),
+            WindowCount(),
+            PageNotFullCount(),
+            EstimateCount(),
+            CachedCount(),
+            PageNotFullCount(strategy=WindowCount()),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "query_string",
+        [
+            "",
+            "page[size]=2",
+            "page[size]=2&page[number]=2",
+            "page[size]=2&page[number]=5",
+            "page[size]=3",
+            "sort=-name&page[size]=1",
+            "filter[name]=not-existing-user",
+        ],
+    )
+    async def test_same_count(
+        self,
+        async_session: AsyncSession,
+        user_1: User,
+        user_2: User,
+        user_3: User,
+        count_strategy: CollectionCountStrategy,
+        query_string: str,
+    ):
+        expected_count, expected_collection = await build_dl(async_session).get_collection(build_qs(query_string))
+
+        dl = build_dl(async_session, count_strategy)
+        objects_count, collection = await dl.get_collection(build_qs(query_string))
+
+        assert objects_count == expected_count
+        assert collection == expected_collection
+
+    @pytest.mark.parametrize(
+        ("count_strategy", "query_string", "statements_number"),
+        [
+            (SubqueryCount(), "page[size]=2", 2),
+            (WindowCount(), "page[size]=2", 1),
+            # empty page out of range is counted with subquery
+            (WindowCount(), "page[size]=2&page[number]=3", 2),
+            (PageNotFullCount(), "page[size]=2", 2),
+            (PageNotFullCount(), "page[size]=2&page[number]=2", 1),
+            (PageNotFullCount(), "page[size]=10", 1),
+            (SubqueryCount(), "page[size]=2&page[count]=false", 1),
+        ],
+    )
+    async def test_statements_number(
+        self,
+        async_engine: AsyncEngine,
+        async_session: AsyncSession,
+        user_1: User,
+        user_2: User,
+        user_3: User,
+        count_strategy: CollectionCountStrategy,
+        query_string: str,
+        statements_number: int,
+    ):
+        dl = build_dl(async_session, count_strategy)
+        with count_statements(async_engine) as statements:
+            await dl.get_collection(build_qs(query_string))
+
+        assert len(statements) == statements_number
+
+    async def test_count_opt_out(
+        self,
+        async_session: AsyncSession,
+        user_1: User,
+    ):
+        dl = build_dl(async_session)
+        objects_count, collection = await dl.get_collection(build_qs("page[count]=false"))
+
+        assert objects_count == dl.default_collection_count
+        assert collection == [user_1]
+
+    async def test_cached_count(
+        self,
+        async_engine: AsyncEngine,
+        async_session: AsyncSession,
+        user_1: User,
+        user_2: User,
+    ):
+        count_strategy = CachedCount(ttl=60)
+
+        objects_count, _ = await build_dl(async_session, count_strategy).get_collection(build_qs("sort=name"))
+        assert objects_count == len((user_1, user_2))
+
+        with count_statements(async_engine) as statements:
+            # sorting doesn't matter
+            objects_count, _ = await build_dl(async_session, count_strategy).get_collection(build_qs("sort=-name"))
+        assert objects_count == len((user_1, user_2))
+        assert len(statements) == 1
+
+        with count_statements(async_engine) as statements:
+            objects_count, _ = await build_dl(async_session, count_strategy).get_collection(
+                build_qs(f"filter[name]={user_1.name}"),
+            )
+        assert objects_count == 1
+        assert len(statements) == COUNT_AND_FETCH_STATEMENTS_NUMBER
+
+    async def test_cached_count_expires(
+        self,
+        async_engine: AsyncEngine,
+        async_session: AsyncSession,
+        user_1: User,
+    ):
+        count_strategy = CachedCount(ttl=0)
+        await build_dl(async_session, count_strategy).get_collection(build_qs())
+
+        with count_statements(async_engine) as statements:
+            await build_dl(async_session, count_strategy).get_collection(build_qs())
+        assert len(statements) == COUNT_AND_FETCH_STATEMENTS_NUMBER
+
+
+class TestConcurrentCount:
+    @pytest.mark.parametrize("is_atomic", [False, True])
+    async def test_count_with_another_session(
+        self,
+        async_engine: AsyncEngine,
+        async_session: AsyncSession,
+        async_session_plain: sessionmaker,
+        user_1: User,
+        user_2: User,
+        is_atomic: bool,
+    ):
+        dl = build_dl(async_session, count_session_maker=async_session_plain)
+        dl.is_atomic = is_atomic
+
+        connections = []
+        with count_statements(async_engine, connections) as statements:
+            objects_count, collection = await dl.get_collection(build_qs("page[size]=1&sort=name"))
+
+        assert objects_count == len((user_1, user_2))
+        assert collection == [min(user_1, user_2, key=lambda user: user.name)]
+        assert len(statements) == COUNT_AND_FETCH_STATEMENTS_NUMBER
+        # atomic operations are counted on the same session
+        assert (len(set(connections)) == 1) is is_atomic
+
+    async def test_deferred_count_is_sequential(
+        self,
+        async_engine: AsyncEngine,
+        async_session: AsyncSession,
+        async_session_plain: sessionmaker,
+        user_1: User,
+    ):
+        dl = build_dl(async_session, WindowCount(), count_session_maker=async_session_plain)
+
+        with count_statements(async_engine) as statements:
+            objects_count, collection = await dl.get_collection(build_qs())
+
+        assert objects_count == 1
+        assert collection == [user_1]
+        assert len(statements) == 1
@@ -0,0 +1,166 @@
+from contextlib import suppress
+from typing import List, Optional
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+from fastapi_jsonapi.schema import BaseJSONAPIItemInSchema
+from tests.fixtures.app import build_app_custom
+from tests.misc.utils import fake
+from tests.models import Computer, User
+from tests.schemas import UserInSchemaAllowIdOnPost, UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+USERS_TO_CREATE = 3
+CLIENT_ID_RESOURCE_TYPE = "user_with_client_id"
+# far from ids generated by the database sequence
+CLIENT_ID_MIN_VALUE = 10**6
+
+
+class UserDataLayerWithHook(SqlalchemyDataLayer):
+    async def before_create_object(self, model_kwargs: dict, view_kwargs: dict):
+        model_kwargs.update(name=model_kwargs["name"].upper())
+
+
+def build_dl(session: AsyncSession, dl_cls=SqlalchemyDataLayer) -> SqlalchemyDataLayer:
+    return dl_cls(
+        request=None,
+        schema=UserSchema,
+        model=User,
+        type_="user",
+        session=session,
+        count_statements=True,
+    )
+
+
+def build_user_data(
+    relationships: Optional[dict] = None,
+    id_value: Optional[int] = None,
+) -> BaseJSONAPIItemInSchema:
+    resource_type = "user" if id_value is None else CLIENT_ID_RESOURCE_TYPE
+    data_schema = RoutersJSONAPI.all_jsonapi_routers[resource_type].schema_in_post
+    return data_schema.parse_obj(
+        {
+            "data": {
+                "type": resource_type,
+                "id": None if id_value is None else str(id_value),
+                "attributes": {"name": fake.name(), "age": fake.pyint(), "email": fake.email()},
+                "relationships": relationships,
+            },
+        },
+    ).data
+
+
+@pytest.fixture()
+def client_ids() -> List[int]:
+    # not ordered, so rows of VALUES aren't sorted by primary key
+    ids = fake.random_sample(range(CLIENT_ID_MIN_VALUE, CLIENT_ID_MIN_VALUE * 2), length=USERS_TO_CREATE)
+    with suppress(KeyError):
+        RoutersJSONAPI.all_jsonapi_routers.pop(CLIENT_ID_RESOURCE_TYPE)
+    build_app_custom(
+        model=User,
+        schema=UserSchema,
+        schema_in_post=UserInSchemaAllowIdOnPost,
+        resource_type=CLIENT_ID_RESOURCE_TYPE,
+    )
+    return ids
+
+
+async def delete_users(session: AsyncSession, users: List[User]) -> None:
+    await session.execute(delete(User).where(User.id.in_([user.id for user in users])))
+    await session.commit()
+
+
+class TestCanInsertWithReturning:
+    @pytest.fixture(autouse=True)
+    def _require_insert_returning(self, async_session: AsyncSession):
+        if not build_dl(async_session).supports_returning("insert"):
+            pytest.skip("database doesn't support INSERT ... RETURNING")
+
+    async def test_attributes_only(
+        self,
+        app: FastAPI,
+        async_session: AsyncSession,
+        computer_1: Computer,
+        client_ids: List[int],
+    ):
+        dl = build_dl(async_session)
+        first_id, second_id, *_ = client_ids
+
+        assert dl.can_insert_with_returning([build_user_data(id_value=first_id), build_user_data(id_value=second_id)])
+        assert not dl.can_insert_with_returning(
+            [
+                build_user_data(id_value=first_id),
+                build_user_data(
+                    {"computers": {"data": [{"type": "computer", "id": computer_1.id}]}},
+                    id_value=second_id,
+                ),
+            ],
+        )
+
+    async def test_primary_key_generated_by_database(self, app: FastAPI, async_session: AsyncSession):
+        dl = build_dl(async_session)
+
+        # returned rows can't be matched to objects
+        assert not dl.can_insert_with_returning([build_user_data(), build_user_data()])
+
+    async def test_overridden_hook(self, app: FastAPI, async_session: AsyncSession):
+        dl = build_dl(async_session, UserDataLayerWithHook)
+
+        assert not dl.can_insert_with_returning([build_user_data()])
+
+
+class TestCreateObjects:
+    async def test_objects_are_created_in_order(self, app: FastAPI, async_session_plain: sessionmaker):
+        users_data = [build_user_data() for _ in range(USERS_TO_CREATE)]
+        async with async_session_plain() as session:
+            users = await build_dl(session).create_objects(users_data, view_kwargs={})
+
+            assert [user.name for user in users] == [user_data.attributes.name for user_data in users_data]
+            assert all(user.id is not None for user in users)
+
+            await delete_users(session, users)
+
+    async def test_hook_is_applied(self, app: FastAPI, async_session_plain: sessionmaker):
+        users_data = [build_user_data() for _ in range(USERS_TO_CREATE)]
+        async with async_session_plain() as session:
+            users = await build_dl(session, UserDataLayerWithHook).create_objects(users_data, view_kwargs={})
+
+            assert [user.name for user in users] == [user_data.attributes.name.upper() for user_data in users_data]
+
+            await delete_users(session, users)
+
+
+class TestInsertWithReturning:
+    @pytest.fixture(autouse=True)
+    def _require_insert_returning(self, async_session: AsyncSession):
+        if not build_dl(async_session).supports_returning("insert"):
+            pytest.skip("database doesn't support INSERT ... RETURNING")
+
+    async def test_objects_are_inserted_with_single_statement(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        client_ids: List[int],
+    ):
+        users_data = [build_user_data(id_value=id_value) for id_value in client_ids]
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            users = await dl.create_objects(users_data, view_kwargs={})
+
+            inserts = [statement for statement in dl.statement_counter.statements if statement.startswith("INSERT")]
+            assert len(inserts) == 1
+            assert [user.id for user in users] == client_ids
+            assert [user.email for user in users] == [user_data.attributes.email for user_data in users_data]
+
+        async with async_session_plain() as session:
+            assert [(await session.get(User, user.id)).name for user in users] == [
+                user_data.attributes.name for user_data in users_data
+            ]
+            await delete_users(session, users)
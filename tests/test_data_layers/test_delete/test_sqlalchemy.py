@@ -0,0 +1,149 @@
+from json import dumps
+from typing import List
+from urllib.parse import urlencode
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from fastapi_jsonapi.data_layers import sqla_orm
+from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+from fastapi_jsonapi.exceptions import ObjectNotFound
+from fastapi_jsonapi.querystring import QueryStringManager
+from tests.misc.utils import fake
+from tests.models import User
+from tests.schemas import UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+
+def build_qs(params: dict) -> QueryStringManager:
+    request = Request({"type": "http", "query_string": urlencode(params).encode(), "headers": [], "app": FastAPI()})
+    return QueryStringManager(request)
+
+
+def build_dl(session: AsyncSession) -> SqlalchemyDataLayer:
+    return SqlalchemyDataLayer(
+        request=None,
+        schema=UserSchema,
+        model=User,
+        type_="user",
+        session=session,
+        count_statements=True,
+    )
+
+
+def count_deletes(dl: SqlalchemyDataLayer) -> int:
+    return sum(statement.lstrip().upper().startswith("DELETE") for statement in dl.statement_counter.statements)
+
+
+async def create_users(session: AsyncSession, count: int) -> List[User]:
+    users = [User(name=fake.name()) for _ in range(count)]
+    session.add_all(users)
+    await session.commit()
+    return users
+
+
+class TestDeleteObject:
+    async def test_delete_with_single_statement(self, async_session_plain: sessionmaker):
+        async with async_session_plain() as session:
+            [user] = await create_users(session, 1)
+            dl = build_dl(session)
+
+            await dl.get_and_delete_object(view_kwargs={"id": str(user.id)})
+
+            assert dl.statement_counter.count == 1
+            assert count_deletes(dl) == 1
+            assert (await session.execute(select(User.id))).all() == []
+
+    async def test_object_not_found(self, async_session_plain: sessionmaker):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+
+            with pytest.raises(ObjectNotFound):
+                await dl.get_and_delete_object(view_kwargs={"id": "1"})
+
+
+class TestDeletedColumnsToReturn:
+    async def test_all_columns_by_default(self, app: FastAPI, async_session: AsyncSession):
+        dl = build_dl(async_session)
+
+        assert dl.get_deleted_columns_to_return(build_qs({})) == tuple(User.__table__.columns)
+        # not requested attributes may be read by the schema
+        assert dl.get_deleted_columns_to_return(build_qs({"fields[user]": "name"})) == tuple(User.__table__.columns)
+
+    async def test_only_keys_when_no_attributes_requested(self, app: FastAPI, async_session: AsyncSession):
+        dl = build_dl(async_session)
+
+        assert dl.get_deleted_columns_to_return(build_qs({"fields[user]": ""})) == (User.id,)
+
+    async def test_requested_columns_when_load_only_allowed(self, app: FastAPI, async_session: AsyncSession):
+        dl = build_dl(async_session)
+        dl.load_only_requested_fields = True
+
+        assert dl.get_deleted_columns_to_return(build_qs({"fields[user]": "name"})) == (User.name, User.id)
+
+
+class TestDeleteCollection:
+    @pytest.fixture(autouse=True)
+    def _require_delete_returning(self, async_session: AsyncSession):
+        if not build_dl(async_session).supports_returning("delete"):
+            pytest.skip("database doesn't support DELETE ... RETURNING")
+
+    async def test_filtered_collection_is_deleted_by_chunks(
+        self,
+        async_session_plain: sessionmaker,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(sqla_orm, "DELETE_COLLECTION_CHUNK_SIZE", 2)
+        async with async_session_plain() as session:
+            users = await create_users(session, 4)
+            users_to_delete, user_to_keep = users[:-1], users[-1]
+            dl = build_dl(session)
+            qs = build_qs(
+                {
+                    "filter": dumps([{"name": "id", "op": "ne", "val": user_to_keep.id}]),
+                    "page[size]": "0",
+                },
+            )
+
+            count, deleted_users = await dl.delete_collection(qs)
+
+            assert count == len(users_to_delete)
+            assert [user.id for user in deleted_users] == [user.id for user in users_to_delete]
+            assert [user.name for user in deleted_users] == [user.name for user in users_to_delete]
+            # selects are not executed except for the count
+            assert count_deletes(dl) == len(dl.statement_counter.statements) - 1
+            assert (await session.execute(select(User.id))).scalars().all() == [user_to_keep.id]
+
+            await dl.delete_objects([user_to_keep], {})
+
+    async def test_page_is_deleted(self, async_session_plain: sessionmaker):
+        async with async_session_plain() as session:
+            users = await create_users(session, 3)
+            dl = build_dl(session)
+
+            count, deleted_users = await dl.delete_collection(build_qs({"page[size]": "1", "page[number]": "2"}))
+
+            assert count == len(users)
+            assert deleted_users == [users[1]]
+            assert count_deletes(dl) == 1
+            assert (await session.execute(select(User.id))).scalars().all() == [users[0].id, users[2].id]
+
+            await dl.delete_objects([users[0], users[2]], {})
+
+    async def test_only_keys_are_returned(self, app: FastAPI, async_session_plain: sessionmaker):
+        async with async_session_plain() as session:
+            users = await create_users(session, 2)
+            user_ids = [user.id for user in users]
+            session.expunge_all()
+            dl = build_dl(session)
+
+            _, deleted_users = await dl.delete_collection(build_qs({"fields[user]": "", "page[size]": "0"}))
+
+            assert [user.id for user in deleted_users] == user_ids
+            assert all("name" in inspect(user).unloaded for user in deleted_users)
+            assert (await session.execute(select(User.id))).all() == []
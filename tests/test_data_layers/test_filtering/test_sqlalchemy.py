@@ -1,14 +1,22 @@
 from typing import Any
 from unittest.mock import MagicMock, Mock
 
+import pytest
 from fastapi import status
 from pydantic import BaseModel
 from pytest import raises  # noqa PT013
 
 from fastapi_jsonapi.data_layers.filtering.sqlalchemy import (
     build_filter_expression,
+    build_filter_expressions,
+    create_filters_and_joins,
+    gather_relationship_paths,
+    get_filter_shape,
+    prepare_relationships_info,
 )
 from fastapi_jsonapi.exceptions import InvalidType
+from tests.models import UserBio
+from tests.schemas import UserBioSchema
 
 
 class TestFilteringFuncs:
@@ -70,3 +78,60 @@ class TestFilteringFuncs:
             "status_code": status.HTTP_409_CONFLICT,
             "title": "Invalid type.",
         }
+
+    def test_filter_shape_does_not_depend_on_values(self):
+        def make_filter(name: str, age: int) -> list:
+            return [
+                {"name": "name", "op": "eq", "val": name},
+                {"or": [{"name": "age", "op": "gt", "val": age}, {"not": {"name": "age", "op": "eq", "val": None}}]},
+            ]
+
+        first_values, second_values = [], []
+        first_shape = get_filter_shape({"and": make_filter("John", 10)}, first_values)
+        second_shape = get_filter_shape({"and": make_filter("Sam", 20)}, second_values)
+
+        expected_shape = (
+            "and",
+            (
+                ("field", "name", "eq"),
+                ("or", (("field", "age", "gt"), ("not", ("field", "age", "eq")))),
+            ),
+        )
+        assert first_shape == second_shape == expected_shape
+        assert first_values == ["John", 10, None]
+        assert second_values == ["Sam", 20, None]
+
+    def test_relationship_joins_use_the_same_alias(self):
+        joins = [
+            create_filters_and_joins(
+                filter_info=[{"name": "user.name", "op": "eq", "val": name}],
+                model=UserBio,
+                schema=UserBioSchema,
+            )[1]
+            for name in ("John", "Sam")
+        ]
+
+        assert len(joins[0]) == len(joins[1]) == 1
+        assert joins[0][0][0] is joins[1][0][0]
+
+    def test_deprecated_helpers_build_the_same_filters(self):
+        filter_info = [
+            {"name": "birth_city", "op": "eq", "val": "Moscow"},
+            {"not": {"name": "user.name", "op": "eq", "val": "John"}},
+        ]
+        expressions, joins = create_filters_and_joins(filter_info=filter_info, model=UserBio, schema=UserBioSchema)
+
+        with pytest.deprecated_call():
+            assert gather_relationship_paths(filter_info) == {"user"}
+        with pytest.deprecated_call():
+            relationships_info = prepare_relationships_info(UserBio, UserBioSchema, filter_info)
+        with pytest.deprecated_call():
+            deprecated_expressions = build_filter_expressions(
+                filter_item={"and": filter_info},
+                target_schema=UserBioSchema,
+                target_model=UserBio,
+                relationships_info=relationships_info,
+            )
+
+        assert [(info.aliased_model, info.join_column) for info in relationships_info.values()] == joins
+        assert str(deprecated_expressions) == str(expressions)
@@ -0,0 +1,194 @@
+from typing import List, Optional, Type
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import Select
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+from fastapi_jsonapi.data_typing import TypeModel
+from fastapi_jsonapi.exceptions import RelatedObjectNotFound
+from fastapi_jsonapi.schema import BaseJSONAPIItemInSchema
+from tests.misc.utils import fake
+from tests.models import Computer, User, Workplace
+from tests.schemas import UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+
+class ScopedRelatedObjectsDataLayer(SqlalchemyDataLayer):
+    """Computers are linked only if they have no owner"""
+
+    def get_related_model_query_base(self, related_model: Type[TypeModel]) -> Select:
+        stmt = super().get_related_model_query_base(related_model)
+        if related_model is Computer:
+            stmt = stmt.where(Computer.user_id.is_(None))
+        return stmt
+
+
+class RelatedObjectsListHookDataLayer(SqlalchemyDataLayer):
+    async def get_related_objects_list(
+        self,
+        related_model: Type[TypeModel],
+        related_id_field: str,
+        ids: List[str],
+    ) -> List[TypeModel]:
+        self.related_objects_list_calls.append(ids)
+        return await super().get_related_objects_list(related_model, related_id_field, ids)
+
+
+def build_dl(
+    session: AsyncSession,
+    trust_related_ids: bool = False,
+    dl_cls: Type[SqlalchemyDataLayer] = SqlalchemyDataLayer,
+) -> SqlalchemyDataLayer:
+    return dl_cls(
+        request=None,
+        schema=UserSchema,
+        model=User,
+        type_="user",
+        session=session,
+        count_statements=True,
+        trust_related_ids=trust_related_ids,
+    )
+
+
+def build_user_data(computer_ids: List[int], workplace_id: Optional[int] = None) -> BaseJSONAPIItemInSchema:
+    relationships = {"computers": {"data": [{"type": "computer", "id": str(id_value)} for id_value in computer_ids]}}
+    if workplace_id is not None:
+        relationships["workplace"] = {"data": {"type": "workplace", "id": str(workplace_id)}}
+
+    data_schema = RoutersJSONAPI.all_jsonapi_routers["user"].schema_in_post
+    return data_schema.parse_obj(
+        {"data": {"type": "user", "attributes": {"name": fake.name()}, "relationships": relationships}},
+    ).data
+
+
+class TestApplyRelationships:
+    async def test_related_objects_are_loaded_with_query_per_model(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        computer_1: Computer,
+        computer_2: Computer,
+        workplace_1: Workplace,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            users_data = [
+                build_user_data([computer_1.id], workplace_1.id),
+                build_user_data([computer_2.id, computer_2.id]),
+            ]
+
+            related_objects = await dl.load_related_objects(dl.collect_related_ids(users_data))
+            assert dl.statement_counter.count == len({Computer, Workplace})
+
+            users = [User() for _ in users_data]
+            for user, user_data in zip(users, users_data):
+                await dl.apply_relationships(user, user_data, action_trigger="create", related_objects=related_objects)
+
+            assert dl.statement_counter.count == len({Computer, Workplace})
+            assert [[computer.id for computer in user.computers] for user in users] == [
+                [computer_1.id],
+                [computer_2.id],
+            ]
+            assert users[0].workplace.id == workplace_1.id
+
+            await session.rollback()
+
+    async def test_objects_in_session_are_not_queried(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        computer_1: Computer,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            computer = await session.get(Computer, computer_1.id)
+            dl.statement_counter.statements.clear()
+
+            user = User()
+            await dl.apply_relationships(user, build_user_data([computer_1.id]), action_trigger="create")
+
+            assert dl.statement_counter.statements == []
+            assert user.computers == [computer]
+
+            await session.rollback()
+
+    async def test_trusted_ids_are_linked_without_loading(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        computer_1: Computer,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session, trust_related_ids=True)
+
+            user = User(name=fake.name())
+            await dl.apply_relationships(user, build_user_data([computer_1.id]), action_trigger="create")
+            assert dl.statement_counter.statements == []
+
+            session.add(user)
+            await session.flush()
+            assert (await session.get(Computer, computer_1.id)).user_id == user.id
+
+            await session.rollback()
+
+    async def test_related_object_not_found(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        computer_1: Computer,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+
+            with pytest.raises(RelatedObjectNotFound):
+                await dl.apply_relationships(
+                    User(),
+                    build_user_data([computer_1.id, computer_1.id + 1]),
+                    action_trigger="create",
+                )
+
+    async def test_overridden_related_objects_hook_is_used(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        computer_1: Computer,
+        computer_2: Computer,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session, dl_cls=RelatedObjectsListHookDataLayer)
+            dl.related_objects_list_calls = []
+            users_data = [build_user_data([computer_1.id]), build_user_data([computer_2.id])]
+
+            assert not dl.can_load_related_objects_at_once()
+            users = await dl.create_objects(users_data, view_kwargs={})
+
+            assert dl.related_objects_list_calls == [[str(computer_1.id)], [str(computer_2.id)]]
+            assert [[computer.id for computer in user.computers] for user in users] == [
+                [computer_1.id],
+                [computer_2.id],
+            ]
+
+            await session.rollback()
+
+    async def test_scoped_query_is_used_for_objects_in_session(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        user_1: User,
+        computer_1: Computer,
+    ):
+        async with async_session_plain() as session:
+            owned_computer = await session.get(Computer, computer_1.id)
+            owned_computer.user_id = user_1.id
+            await session.flush()
+            dl = build_dl(session, dl_cls=ScopedRelatedObjectsDataLayer)
+
+            with pytest.raises(RelatedObjectNotFound):
+                await dl.apply_relationships(User(), build_user_data([computer_1.id]), action_trigger="create")
+
+            await session.rollback()
@@ -0,0 +1,135 @@
+from contextlib import suppress
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+from fastapi_jsonapi.querystring import QueryStringManager
+from fastapi_jsonapi.views.list_view import ListViewBase
+from fastapi_jsonapi.views.utils import handle_jsonapi_fields
+from tests.fixtures.app import build_app_custom
+from tests.models import Post, User
+from tests.schemas import UserSchema
+
+
+def build_qs(query_string: str = "") -> QueryStringManager:
+    request = Request({"type": "http", "query_string": query_string.encode(), "headers": [], "app": FastAPI()})
+    return QueryStringManager(request)
+
+
+def build_dl(session: AsyncSession, load_only_requested_fields: bool = True) -> SqlalchemyDataLayer:
+    return SqlalchemyDataLayer(
+        request=None,
+        schema=UserSchema,
+        model=User,
+        type_="user",
+        session=session,
+        load_only_requested_fields=load_only_requested_fields,
+    )
+
+
+def get_unloaded_columns(obj) -> set:
+    state = inspect(obj)
+    return set(state.unloaded) & set(state.mapper.column_attrs.keys())
+
+
+class TestLoadOnlyRequestedFields:
+    pytestmark = pytest.mark.asyncio
+
+    async def test_collection(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        user_1: User,
+        user_1_posts: List[Post],
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            _, (user,) = await dl.get_collection(build_qs("include=posts&fields[user]=name&fields[post]=title"))
+
+            assert {"name", "id"}.isdisjoint(get_unloaded_columns(user))
+            assert {"age", "email"} <= get_unloaded_columns(user)
+            for post in user.posts:
+                # foreign key is loaded too
+                assert {"title", "id", "user_id"}.isdisjoint(get_unloaded_columns(post))
+                assert "body" in get_unloaded_columns(post)
+
+    async def test_object(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        user_1: User,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            user = await dl.get_object({"id": user_1.id}, build_qs("fields[user]="))
+
+            assert "id" not in get_unloaded_columns(user)
+            assert {"name", "age", "email"} <= get_unloaded_columns(user)
+
+    async def test_cursor_pagination_keyset_is_loaded(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        user_1: User,
+        user_2: User,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            _, users = await dl.get_collection(build_qs("fields[user]=name&sort=age&page[size]=1&page[after]="))
+
+            (user,) = users
+            assert "age" not in get_unloaded_columns(user)
+            assert dl.collection_cursors.next is not None
+
+    async def test_not_requested_by_default(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        user_1: User,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session, load_only_requested_fields=False)
+            _, (user,) = await dl.get_collection(build_qs("fields[user]=name"))
+
+            assert not get_unloaded_columns(user)
+
+
+def build_list_view(load_only_requested_fields: bool, **routers_kwargs) -> ListViewBase:
+    resource_type = "user_load_only"
+    with suppress(KeyError):
+        RoutersJSONAPI.all_jsonapi_routers.pop(resource_type)
+
+    app = build_app_custom(
+        model=User,
+        schema=UserSchema,
+        resource_type=resource_type,
+        load_only_requested_fields=load_only_requested_fields,
+        **routers_kwargs,
+    )
+    request = Request({"type": "http", "method": "GET", "query_string": b"", "headers": [], "app": app})
+    return app.jsonapi_routers.list_view_resource(request=request, jsonapi=app.jsonapi_routers)
+
+
+class TestLoadOnlyRequestedFieldsOption:
+    def test_disabled_for_pydantic_responses_by_default(self, app: FastAPI):
+        assert not build_list_view(load_only_requested_fields=False).can_load_only_requested_fields()
+        assert build_list_view(load_only_requested_fields=True).can_load_only_requested_fields()
+
+    def test_enabled_for_compiled_serializer(self, app: FastAPI):
+        view = build_list_view(load_only_requested_fields=False, use_compiled_serializer=True)
+
+        assert view.can_load_only_requested_fields()
+
+    def test_handle_jsonapi_fields_is_deprecated(self, app: FastAPI):
+        view = build_list_view(load_only_requested_fields=False)
+        response = object()
+
+        with pytest.deprecated_call():
+            assert handle_jsonapi_fields(response, view.query_params, view.jsonapi) is response
@@ -0,0 +1,137 @@
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+from fastapi_jsonapi.exceptions import StatementBudgetExceeded
+from fastapi_jsonapi.querystring import QueryStringManager
+from tests.models import Post, User
+from tests.schemas import UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+# count, page and included objects of one relationship
+COLLECTION_WITH_INCLUDE_STATEMENTS = 3
+
+
+@pytest.fixture(autouse=True)
+def _register_routers(app: FastAPI):
+    """
+    Schemas forward references used by includes are resolved when routers are registered
+    """
+
+
+def build_qs(query_string: str = "") -> QueryStringManager:
+    request = Request({"type": "http", "query_string": query_string.encode(), "headers": [], "app": FastAPI()})
+    return QueryStringManager(request)
+
+
+def build_dl(session: AsyncSession, **kwargs) -> SqlalchemyDataLayer:
+    return SqlalchemyDataLayer(
+        request=None,
+        schema=UserSchema,
+        model=User,
+        session=session,
+        **kwargs,
+    )
+
+
+@contextmanager
+def engine_statements(async_engine: AsyncEngine) -> Iterator[List[str]]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestStatementCounter:
+    @pytest.mark.parametrize(
+        "query_string",
+        [
+            "",
+            "include=posts",
+            "include=posts.comments,bio",
+            "page[size]=1&sort=-name",
+        ],
+    )
+    async def test_same_as_executed_by_engine(
+        self,
+        async_engine: AsyncEngine,
+        async_session_plain: sessionmaker,
+        user_1: User,
+        user_2: User,
+        user_1_posts: List[Post],
+        query_string: str,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session, count_statements=True)
+            with engine_statements(async_engine) as statements:
+                await dl.get_collection(build_qs(query_string))
+
+        assert dl.statement_counter.statements == statements
+
+    async def test_flush_statements_are_counted(
+        self,
+        async_engine: AsyncEngine,
+        async_session_plain: sessionmaker,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session, count_statements=True)
+            with engine_statements(async_engine) as statements:
+                user = User(name="John")
+                session.add(user)
+                await dl.save()
+
+            assert statements
+            assert dl.statement_counter.statements == statements
+
+            await session.delete(user)
+            await session.commit()
+
+    async def test_budget_exceeded(
+        self,
+        async_session_plain: sessionmaker,
+        user_1: User,
+        user_1_posts: List[Post],
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session, statement_budget=COLLECTION_WITH_INCLUDE_STATEMENTS)
+            await dl.get_collection(build_qs("include=posts"))
+
+            dl = build_dl(session, statement_budget=COLLECTION_WITH_INCLUDE_STATEMENTS)
+            with pytest.raises(StatementBudgetExceeded):
+                await dl.get_collection(build_qs("include=posts.comments"))
+
+        assert dl.statement_counter.count == COLLECTION_WITH_INCLUDE_STATEMENTS
+
+
+class TestStrictLoading:
+    async def test_not_included_relationships_raise(
+        self,
+        async_session_plain: sessionmaker,
+        user_1: User,
+        user_1_posts: List[Post],
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session, strict_loading=True)
+            _, users = await dl.get_collection(build_qs("include=posts"))
+
+            (user,) = users
+            assert len(user.posts) == len(user_1_posts)
+            with pytest.raises(InvalidRequestError):
+                user.bio
+            with pytest.raises(InvalidRequestError):
+                user.posts[0].comments
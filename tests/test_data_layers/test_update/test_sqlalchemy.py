@@ -0,0 +1,133 @@
+from typing import Optional
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+from fastapi_jsonapi.exceptions import ObjectNotFound
+from fastapi_jsonapi.querystring import QueryStringManager
+from fastapi_jsonapi.schema import BaseJSONAPIItemInSchema
+from tests.misc.utils import fake
+from tests.models import User
+from tests.schemas import UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+
+class UserDataLayerWithHook(SqlalchemyDataLayer):
+    async def before_update_object(self, obj: User, model_kwargs: dict, view_kwargs: dict):
+        model_kwargs.update(name=model_kwargs["name"].upper())
+
+
+def build_qs(query_string: str = "") -> QueryStringManager:
+    request = Request({"type": "http", "query_string": query_string.encode(), "headers": [], "app": FastAPI()})
+    return QueryStringManager(request)
+
+
+def build_dl(session: AsyncSession, dl_cls=SqlalchemyDataLayer) -> SqlalchemyDataLayer:
+    return dl_cls(
+        request=None,
+        schema=UserSchema,
+        model=User,
+        type_="user",
+        session=session,
+        count_statements=True,
+    )
+
+
+def build_user_data(user_id: int, attributes: dict, relationships: Optional[dict] = None) -> BaseJSONAPIItemInSchema:
+    data_schema = RoutersJSONAPI.all_jsonapi_routers["user"].schema_in_patch_data
+    return data_schema.parse_obj(
+        {
+            "id": str(user_id),
+            "type": "user",
+            "attributes": attributes,
+            "relationships": relationships,
+        },
+    )
+
+
+class TestCanUpdateWithReturning:
+    @pytest.fixture(autouse=True)
+    def _require_update_returning(self, async_session: AsyncSession):
+        if not build_dl(async_session).supports_returning("update"):
+            pytest.skip("database doesn't support UPDATE ... RETURNING")
+
+    async def test_attributes_only(self, app: FastAPI, async_session: AsyncSession):
+        dl = build_dl(async_session)
+
+        assert dl.can_update_with_returning(build_user_data(1, {"name": fake.name()}), build_qs())
+        assert not dl.can_update_with_returning(build_user_data(1, {"name": fake.name()}), build_qs("include=posts"))
+        assert not dl.can_update_with_returning(
+            build_user_data(1, {"name": fake.name()}, {"computers": {"data": []}}),
+            build_qs(),
+        )
+
+    async def test_overridden_hook(self, app: FastAPI, async_session: AsyncSession):
+        dl = build_dl(async_session, UserDataLayerWithHook)
+
+        assert not dl.can_update_with_returning(build_user_data(1, {"name": fake.name()}), build_qs())
+
+
+class TestUpdateWithReturning:
+    @pytest.fixture(autouse=True)
+    def _require_update_returning(self, async_session: AsyncSession):
+        if not build_dl(async_session).supports_returning("update"):
+            pytest.skip("database doesn't support UPDATE ... RETURNING")
+
+    async def test_update_with_single_statement(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        user_1: User,
+    ):
+        new_name = fake.name()
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            user = await dl.get_and_update_object(
+                build_user_data(user_1.id, {"name": new_name}),
+                view_kwargs={"id": str(user_1.id)},
+                qs=build_qs(),
+            )
+
+            assert dl.statement_counter.count == 1
+            assert user.id == user_1.id
+            assert user.name == new_name
+            assert user.email == user_1.email
+
+        async with async_session_plain() as session:
+            assert (await session.get(User, user_1.id)).name == new_name
+
+    async def test_unchanged_object_is_not_written(
+        self,
+        app: FastAPI,
+        async_session_plain: sessionmaker,
+        user_1: User,
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            user = await dl.get_and_update_object(
+                build_user_data(user_1.id, {"name": user_1.name}),
+                view_kwargs={"id": str(user_1.id)},
+                qs=build_qs(),
+            )
+
+            assert user.id == user_1.id
+            assert user.name == user_1.name
+            # update doesn't match unchanged row, object is retrieved
+            assert dl.statement_counter.statements[-1].lstrip().upper().startswith("SELECT")
+
+    async def test_object_not_found(self, app: FastAPI, async_session_plain: sessionmaker, user_1: User):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+
+            with pytest.raises(ObjectNotFound):
+                await dl.get_and_update_object(
+                    build_user_data(user_1.id + 1, {"name": fake.name()}),
+                    view_kwargs={"id": str(user_1.id + 1)},
+                    qs=build_qs(),
+                )
@@ -0,0 +1,120 @@
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from fastapi_jsonapi import RoutersJSONAPI
+from fastapi_jsonapi.data_layers.sqla_orm import SqlalchemyDataLayer
+from fastapi_jsonapi.querystring import QueryStringManager
+from fastapi_jsonapi.schema import BaseJSONAPIItemInSchema
+from tests.models import Post, User
+from tests.schemas import UserSchema
+
+pytestmark = pytest.mark.asyncio
+
+
+def build_qs(query_string: str = "") -> QueryStringManager:
+    request = Request({"type": "http", "query_string": query_string.encode(), "headers": [], "app": FastAPI()})
+    return QueryStringManager(request)
+
+
+def build_dl(session: AsyncSession, reuse_written_objects: bool = True) -> SqlalchemyDataLayer:
+    return SqlalchemyDataLayer(
+        request=None,
+        schema=UserSchema,
+        model=User,
+        type_="user",
+        session=session,
+        count_statements=True,
+        reuse_written_objects=reuse_written_objects,
+    )
+
+
+async def create_users(dl: SqlalchemyDataLayer, names: List[str]) -> List[User]:
+    users = [User(name=name) for name in names]
+    dl.session.add_all(users)
+    await dl.save()
+    return users
+
+
+def build_user_update_data(user_id: int, attributes: dict) -> BaseJSONAPIItemInSchema:
+    data_schema = RoutersJSONAPI.all_jsonapi_routers["user"].schema_in_patch_data
+    return data_schema.parse_obj({"id": str(user_id), "type": "user", "attributes": attributes})
+
+
+def last_statement_kind(dl: SqlalchemyDataLayer) -> str:
+    return dl.statement_counter.statements[-1].lstrip().split(maxsplit=1)[0].upper()
+
+
+def count_selects(dl: SqlalchemyDataLayer) -> int:
+    return sum(statement.lstrip().upper().startswith("SELECT") for statement in dl.statement_counter.statements)
+
+
+class TestReuseWrittenObjects:
+    async def test_created_objects_are_not_retrieved(self, async_session_plain: sessionmaker):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            users = await create_users(dl, ["John", "Sam"])
+
+            assert await dl.get_created_object(users[0], view_kwargs={}, qs=build_qs()) is users[0]
+            assert await dl.get_created_objects(users, view_kwargs={}, qs=build_qs()) == users
+            assert count_selects(dl) == 0
+
+            await dl.delete_objects(users, {})
+
+    async def test_expired_attributes_are_loaded_at_once(self, async_session_plain: sessionmaker):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            users = await create_users(dl, ["John", "Sam"])
+            for user in users:
+                session.expire(user, ["name"])
+
+            assert await dl.get_created_objects(users, view_kwargs={}, qs=build_qs()) == users
+            assert count_selects(dl) == 1
+            assert [user.__dict__["name"] for user in users] == ["John", "Sam"]
+
+            await dl.delete_objects(users, {})
+
+    async def test_created_object_is_retrieved_for_include(
+        self,
+        async_session_plain: sessionmaker,
+        user_1: User,
+        user_1_posts: List[Post],
+    ):
+        async with async_session_plain() as session:
+            dl = build_dl(session)
+            user = await session.get(User, user_1.id)
+            dl.statement_counter.statements.clear()
+
+            assert await dl.get_created_object(user, view_kwargs={}, qs=build_qs("include=posts")) is user
+            assert count_selects(dl) > 0
+            assert len(user.__dict__["posts"]) == len(user_1_posts)
+
+    async def test_no_select_after_write_with_expire_on_commit(self, app: FastAPI, async_engine: AsyncEngine):
+        session_maker = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=True)
+        async with session_maker() as session:
+            dl = build_dl(session)
+            users = await create_users(dl, ["John", "Sam"])
+            assert await dl.get_created_objects(users, view_kwargs={}, qs=build_qs()) == users
+            assert last_statement_kind(dl) == "INSERT"
+
+            user = users[0]
+            await dl.update_object(user, build_user_update_data(user.id, {"name": "Jane"}), view_kwargs={})
+            assert last_statement_kind(dl) == "UPDATE"
+            assert user.__dict__["name"] == "Jane"
+            assert session.sync_session.expire_on_commit
+
+            await dl.delete_objects(users, {})
+
+    async def test_disabled_by_default(self, async_session_plain: sessionmaker):
+        async with async_session_plain() as session:
+            dl = build_dl(session, reuse_written_objects=False)
+            users = await create_users(dl, ["John"])
+
+            assert await dl.get_created_objects(users, view_kwargs={}, qs=build_qs()) == users
+            assert count_selects(dl) == 1
+
+            await dl.delete_objects(users, {})
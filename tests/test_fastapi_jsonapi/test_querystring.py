@@ -1,4 +1,5 @@
 import json
+from typing import Optional
 from unittest.mock import MagicMock
 
 import pytest
@@ -7,6 +8,7 @@ from starlette.datastructures import QueryParams
 
 from fastapi_jsonapi.exceptions import InvalidFilters
 from fastapi_jsonapi.exceptions.json_api import BadRequest
+from fastapi_jsonapi.filter_limits import FilterLimits
 from fastapi_jsonapi.querystring import QueryStringManager
 
 
@@ -90,3 +92,93 @@ def test_filters__errors():
             },
         ],
     }
+
+
+def build_manager(query_params: list, filter_limits: Optional[FilterLimits] = None) -> QueryStringManager:
+    request = MagicMock()
+    request.app.config = {}
+    request.query_params = QueryParams(query_params)
+    return QueryStringManager(request, filter_limits=filter_limits)
+
+
+def test_parsed_querystring_is_cached():
+    query_params = [("filter[name]", "John"), ("page[size]", "10"), ("include", "posts"), ("fields[user]", "name")]
+    manager_1, manager_2 = build_manager(query_params), build_manager(query_params)
+
+    assert manager_1.parsed is manager_2.parsed
+    assert manager_1.filters == manager_2.filters == [{"name": "name", "op": "eq", "val": "John"}]
+    assert manager_1.include == ["posts"]
+
+    # cached values are not shared
+    manager_1.filters.append({})
+    manager_1.pagination.size = 1
+    assert manager_2.filters == [{"name": "name", "op": "eq", "val": "John"}]
+    assert manager_2.pagination.size == int(dict(query_params)["page[size]"])
+
+
+def test_modified_filters_are_not_shared():
+    filters = [{"or": [{"name": "name", "op": "eq", "val": "John"}, {"name": "id", "op": "in", "val": [1]}]}]
+    query_params = [("filter", json.dumps(filters)), ("filter[age]", "1")]
+    expected_filters = [*filters, {"name": "age", "op": "eq", "val": "1"}]
+
+    manager = build_manager(query_params)
+    modified_filters = manager.filters
+    # e.g. scoping added by a `before_get_collection` hook
+    modified_filters[0]["or"].append({"name": "tenant_id", "op": "eq", "val": 1})
+    modified_filters[0]["or"][1]["val"].append(2)
+    modified_filters[1]["val"] = "2"
+
+    assert manager.filters == expected_filters
+    assert build_manager(query_params).filters == expected_filters
+
+
+def test_malformed_item_key_fails_only_used_parameter():
+    manager = build_manager([("page", "1"), ("include", "posts")])
+
+    assert manager.include == ["posts"]
+    with pytest.raises(BadRequest):
+        manager.pagination
+
+
+@pytest.mark.parametrize(
+    ("filters", "filter_limits"),
+    [
+        (
+            [{"name": "name", "op": "eq", "val": "John"}, {"name": "age", "op": "eq", "val": 1}],
+            FilterLimits(max_nodes=1),
+        ),
+        (
+            [{"not": {"or": [{"name": "name", "op": "eq", "val": "John"}]}}],
+            FilterLimits(max_depth=2),
+        ),
+        (
+            [{"name": "id", "op": "in", "val": [1, 2]}],
+            FilterLimits(max_list_length=1),
+        ),
+        (
+            [{"name": "posts.comments.text", "op": "eq", "val": "text"}],
+            FilterLimits(max_relationship_joins=1),
+        ),
+    ],
+)
+def test_filters__limits_exceeded(filters: list, filter_limits: FilterLimits):
+    manager = build_manager([("filter", json.dumps(filters))], filter_limits=filter_limits)
+
+    with pytest.raises(InvalidFilters) as exc_info:
+        manager.filters
+
+    assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_filters__within_limits():
+    filters = [
+        {"or": [{"name": "posts.title", "op": "eq", "val": "title"}, {"name": "id", "op": "in", "val": [1]}]},
+    ]
+    filter_limits = FilterLimits(max_nodes=3, max_depth=2, max_list_length=1, max_relationship_joins=1)
+    manager = build_manager([("filter", json.dumps(filters)), ("filter[name]", "John")], filter_limits=filter_limits)
+
+    with pytest.raises(InvalidFilters):
+        manager.filters
+
+    manager = build_manager([("filter", json.dumps(filters))], filter_limits=filter_limits)
+    assert manager.filters == filters
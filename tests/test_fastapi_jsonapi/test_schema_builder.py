@@ -0,0 +1,138 @@
+from typing import Set, Type
+
+from fastapi_jsonapi.schema import JSONAPIObjectSchema, JSONAPIResultDetailSchema, JSONAPIResultListSchema
+from fastapi_jsonapi.schema_builder import SchemaBuilder
+from tests.schemas import UserSchema
+
+
+class TestResultSchemasCache:
+    def test_same_includes_reuse_schemas(self):
+        builder = SchemaBuilder(resource_type="user", max_cache_size=16)
+
+        result_schemas = builder.get_result_schemas(
+            name="ResultUserList",
+            schema=UserSchema,
+            includes=["posts", "bio"],
+            is_list=True,
+        )
+        assert issubclass(result_schemas.result_schema, JSONAPIResultListSchema)
+        assert set(result_schemas.object_schemas.can_be_included_schemas) == {"posts", "bio"}
+
+        # includes are normalized, order and duplicates don't matter
+        assert result_schemas is builder.get_result_schemas(
+            name="ResultUserList",
+            schema=UserSchema,
+            includes=["bio", "posts", "bio"],
+            is_list=True,
+        )
+
+        detail_result_schemas = builder.get_result_schemas(
+            name="ResultUserDetail",
+            schema=UserSchema,
+            includes=["posts", "bio"],
+            is_list=False,
+        )
+        assert detail_result_schemas is not result_schemas
+        assert issubclass(detail_result_schemas.result_schema, JSONAPIResultDetailSchema)
+
+    def test_cache_is_bounded(self):
+        builder = SchemaBuilder(resource_type="user", max_cache_size=1)
+
+        posts_schemas = builder.get_result_schemas(name="Result", schema=UserSchema, includes=["posts"], is_list=True)
+        builder.get_result_schemas(name="Result", schema=UserSchema, includes=["bio"], is_list=True)
+
+        rebuilt_schemas = builder.get_result_schemas(
+            name="Result",
+            schema=UserSchema,
+            includes=["posts"],
+            is_list=True,
+        )
+        assert rebuilt_schemas is not posts_schemas
+
+    def test_no_cache_by_default(self):
+        builder = SchemaBuilder(resource_type="user")
+
+        assert builder.get_result_schemas(
+            name="Result",
+            schema=UserSchema,
+            includes=[],
+            is_list=False,
+        ) is not builder.get_result_schemas(
+            name="Result",
+            schema=UserSchema,
+            includes=[],
+            is_list=False,
+        )
+
+
+def get_attribute_names(object_schema: Type[JSONAPIObjectSchema]) -> Set[str]:
+    return set(object_schema.__fields__["attributes"].type_.__fields__)
+
+
+class TestSparseFieldsetsSchemas:
+    def test_only_requested_attributes(self):
+        builder = SchemaBuilder(resource_type="user")
+
+        result_schemas = builder.get_result_schemas(
+            name="Result",
+            schema=UserSchema,
+            includes=["posts", "bio"],
+            is_list=True,
+            fields={"user": {"name", "posts"}, "post": {"title"}},
+        )
+
+        object_schemas = result_schemas.object_schemas
+        assert set(object_schemas.attributes_schema.__fields__) == {"name"}
+        assert get_attribute_names(object_schemas.object_jsonapi_schema) == {"name"}
+        assert get_attribute_names(object_schemas.can_be_included_schemas["posts"]) == {"title"}
+        # fieldset isn't requested for this type
+        assert get_attribute_names(object_schemas.can_be_included_schemas["bio"]) == {
+            "birth_city",
+            "favourite_movies",
+            "keys_to_ids_list",
+        }
+
+    def test_ignore_all_fields(self):
+        builder = SchemaBuilder(resource_type="user")
+
+        object_schemas = builder.create_jsonapi_object_schemas(schema=UserSchema, fields={"user": {""}})
+
+        assert object_schemas.attributes_schema.__fields__ == {}
+
+    def test_same_fieldset_reuses_schemas(self):
+        builder = SchemaBuilder(resource_type="user", max_cache_size=16)
+
+        result_schemas = builder.get_result_schemas(
+            name="Result",
+            schema=UserSchema,
+            includes=["posts"],
+            is_list=True,
+            fields={"user": ["name", "age"]},
+        )
+
+        # fieldsets are normalized, order and duplicates don't matter
+        assert result_schemas is builder.get_result_schemas(
+            name="Result",
+            schema=UserSchema,
+            includes=["posts"],
+            is_list=True,
+            fields={"user": ["age", "name", "age"]},
+        )
+        assert result_schemas is not builder.get_result_schemas(
+            name="Result",
+            schema=UserSchema,
+            includes=["posts"],
+            is_list=True,
+            fields={"user": ["name"]},
+        )
+        assert builder.create_object_schemas_for_includes(
+            schema=UserSchema,
+            includes=["posts"],
+            resource_type="user",
+            fields={"user": {"name"}},
+        ) is builder.create_object_schemas_for_includes(
+            schema=UserSchema,
+            includes=["posts"],
+            resource_type="user",
+            fields={"user": {"name"}},
+        )
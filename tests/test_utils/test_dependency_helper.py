@@ -4,11 +4,12 @@ from unittest.mock import AsyncMock
 
 import pytest
 from fastapi import (
+    Body,
     Depends,
     Request,
 )
 
-from fastapi_jsonapi.utils.dependency_helper import DependencyHelper
+from fastapi_jsonapi.utils.dependency_helper import DependencyHelper, RequestDependencyCache
 
 pytestmark = pytest.mark.asyncio
 
@@ -57,3 +58,37 @@ class TestDependencyHelper:
         assert d2 is data_2
         assert d3 is data_3
         assert h_value == header_value
+
+    async def test_dependencies_not_reading_body_are_shared(self):
+        shared_calls = []
+        body_calls = []
+
+        def shared_dependency():
+            shared_calls.append(None)
+            return len(shared_calls)
+
+        def body_dependency(data: dict = Body(embed=True)):
+            body_calls.append(data)
+            return len(body_calls)
+
+        def some_function(shared=Depends(shared_dependency), body_dep=Depends(body_dependency)):
+            return shared, body_dep
+
+        request = Request(
+            {
+                "type": "http",
+                "path": "/foo/bar",
+                "headers": [],
+                "query_string": "",
+                "fastapi_astack": AsyncMock(),
+            },
+        )
+        request._body = b'{"data": {}}'
+
+        dependency_cache = RequestDependencyCache()
+        runs_count = 3
+        results = [await DependencyHelper(request, dependency_cache).run(some_function) for _ in range(runs_count)]
+
+        # dependencies reading the body may depend on the current atomic operation, they aren't shared
+        assert results == [(1, run_number) for run_number in range(1, runs_count + 1)]
+        assert len(shared_calls) == 1